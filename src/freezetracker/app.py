@@ -31,26 +31,51 @@ import configparser
 import io
 import json
 import logging
+import os
 import pathlib
-import statistics  # noqa # requires 3.10 or later (GitHub Pages may be 3.9)
-import timeit  # noqa used for profiling during development
+import threading
+import zipfile
 from datetime import datetime
+from functools import partial
 from typing import Union
 
 # Third-party imports
-import holoviews as hv
-import hvplot.pandas  # noqa
+# Chart libraries (holoviews, hvplot, matplotlib) and requests are
+# imported inside the functions that use them, so importing this module stays fast.
+# See bench_import_time.py.
+import numpy as np
 import pandas as pd
 import panel as pn
-import requests
-from bokeh.models.formatters import FuncTickFormatter  # noqa
-from holoviews import opts
-from matplotlib.colors import LinearSegmentedColormap
-from sklearn.linear_model import LinearRegression
 
-# Configure Panel for bokeh and matplotlib charts
-hv.extension("bokeh", "matplotlib")
-pn.extension(sizing_mode="stretch_width")
+# Local imports
+# These modules need only numpy and pandas at import; data_load.py imports requests
+# where it is used. Modules that import requests (current_conditions) are imported
+# where they are used.
+# script_5_make_wasm_app.py vendors every freezetracker module into the WASM build.
+from freezetracker import data_load
+from freezetracker.common_content import (
+    default_city_list,
+    default_winter_list,
+    get_data_processed_path_from_code_folder,
+    get_days_after_Jul_1_from_date_string,
+    max_winter_start_year,
+    min_winter_start_year,
+)
+from freezetracker.daily_cube import open_daily_cube, read_cube_index
+from freezetracker.data_cache import get_data_cache, get_data_cache_stats
+from freezetracker.data_load import get_data_processed_url, get_http_session, is_pyodide
+from freezetracker.data_schema import apply_file_schema, apply_table_schema, enforce_table_schema
+from freezetracker.frost_join import join_frost_depths
+from freezetracker.nowcast import NowcastModel, nowcast_frost_depths, nowcast_model_file_name
+from freezetracker.regression import fit_lines, get_line_endpoints
+from freezetracker.season_calendar import get_days_after_Jul_1, get_winter_names
+from freezetracker.shared_feeds import get_shared_feed
+from freezetracker.shared_tables import get_shared_table, get_shared_tables, get_source_version
+from freezetracker.stations import get_frost_counties
+from freezetracker.timing import get_stage_timings_summary, timed, timed_span
+
+# Chart backends to register with holoviews, e.g. FREEZE_TRACKER_CHART_BACKENDS=bokeh,matplotlib
+default_chart_backends = ["bokeh"]
 
 # WASM - differnt behavior in app.py vs app.js (GitHub Pages WASM)
 
@@ -67,6 +92,9 @@ def get_logger(logger_name, filemode='w', log_file="app.log", log_level=logging.
     """Configure a common logger for the application"""
     logger = logging.getLogger(logger_name)
     logger.setLevel(log_level)
+    if logger.handlers:
+        # Already configured (panel serve runs this file once per session)
+        return logger
 
     # Prevent logs from being passed to the handlers of higher-level loggers
     logger.propagate = False
@@ -91,13 +119,12 @@ def get_logger(logger_name, filemode='w', log_file="app.log", log_level=logging.
     return logger
 
 
-logger = get_logger("app")
+# Handlers are added by configure_app(), so importing this module does not open app.log
+logger = logging.getLogger("app")
 
 
 # COMMON CONTENT
-
-min_winter_start_year = 2010
-max_winter_start_year = 2022  # 2022-2023 is the most recent winter
+# Winter lists and path helpers come from common_content.py; chart limits are kept here.
 
 min_season_day = 0
 max_season_day = 365
@@ -116,22 +143,6 @@ default_chart_height_px = 600
 
 today_color = "purple"
 incident_color = "orange"
-default_city_list = ["ELY", "ORR"]
-default_winter_list = [
-    "2010-2011",
-    "2011-2012",
-    "2012-2013",
-    "2013-2014",
-    "2014-2015",
-    "2015-2016",
-    "2016-2017",
-    "2017-2018",
-    "2018-2019",
-    "2019-2020",
-    "2020-2021",
-    "2021-2022",
-    "2022-2023",
-]
 
 
 def create_pane_empty_chart():
@@ -143,54 +154,27 @@ def create_pane_empty_chart():
     )
 
 
-def calculate_winter_start_year(date_str) -> int:
-    """Calculate the winter start year based on the date
-    Winter is defined as July 1 to June 30.
-    If July or later, then the winter start year is the current year.
-    Jan-Jun, then the winter start year is the previous year.
-    @returns the winter start year as an int"""
-    date = pd.to_datetime(date_str)
-    if date.month >= 7:
-        return date.year
-    else:
-        return date.year - 1
-
-
-def get_data_processed_path_from_code_folder(fname):
-    pkg_path = pathlib.Path.cwd()
-    src_path = pkg_path.parent
-    root_path = src_path.parent
-    data_path = root_path.joinpath("data")
-    processed_data_path = data_path.joinpath("2_processed")
-    processed_file_path = processed_data_path.joinpath(fname)
-    return processed_file_path
-
-
-def get_days_after_Jul_1_from_date_string(date_string):
-    """Return the number of days after July 1 for the given date string
-    @param date_string: a date string that can be parsed by pd.to_datetime
-    @return: the number of days after July 1"""
-    date = pd.to_datetime(date_string)
-    if date.month >= 7:
-        start_year = date.year
-    else:
-        start_year = date.year - 1
-    today_days_after_Jul_1 = (date - datetime(start_year, 7, 1)).days
-    return today_days_after_Jul_1
-
-
 # DATA LOAD CONFIG
 
 
+@timed("load")
 def read_config(is_wasm) -> Union[configparser.ConfigParser, None]:
     """Read the configuration file"""
+    import requests
+
     github_repo = "freeze-tracker"
     fname = "config.ini"
     username = "denisecase"
     from_github = is_wasm
     if from_github:
+        # Set before the try, so the handlers can name it even if the bundle read fails
+        url = f"https://raw.githubusercontent.com/{username}/{github_repo}/main/{fname}"
         try:
-            url = f"https://raw.githubusercontent.com/{username}/{github_repo}/main/{fname}"
+            content = read_bundle_file(fname)
+            if content is not None:
+                config = configparser.ConfigParser()
+                config.read_string(content.decode("utf-8"))
+                return config
             response = requests.get(url)
             response.raise_for_status()
             content = response.text
@@ -218,38 +202,222 @@ def read_config(is_wasm) -> Union[configparser.ConfigParser, None]:
 
 # DATA LOAD
 
+# Files are read and cached by data_load.py; in WASM, tables in the data bundle
+# (see DATA LOAD BUNDLE below) are served from memory first.
 
-def read_data_processed_csv_to_df(is_WASM, fname):
-    github_repo = "freeze-tracker"
-    data_subfolder = "2_processed"
-    username = "denisecase"
-    from_github = is_WASM
-    if from_github:
+
+@timed("load")
+def read_data_processed_csv_to_df(is_WASM, fname, base_url=None):
+    if is_WASM and base_url is None:
+        df = read_bundle_table(fname)
+        if df is not None:
+            return df
+    return data_load.read_data_processed_csv_to_df(is_WASM, fname, base_url)
+
+
+@timed("load")
+def read_data_processed_csvs_to_dfs(is_WASM, fnames, base_url=None, max_workers=8) -> dict:
+    """Read many processed CSV files in one call (see data_load.read_data_processed_csvs_to_dfs)
+    @param fnames: list of file names in data/2_processed
+    @return: dict of file name to data frame (None if the file could not be read)"""
+    dfs = {}
+    if is_WASM and base_url is None:
+        for fname in fnames:
+            df = read_bundle_table(fname)
+            if df is not None:
+                dfs[fname] = df
+
+    remote_fnames = [fname for fname in fnames if fname not in dfs]
+    if remote_fnames:
+        dfs.update(
+            data_load.read_data_processed_csvs_to_dfs(is_WASM, remote_fnames, base_url, max_workers)
+        )
+    return {fname: dfs[fname] for fname in fnames}
+
+
+# DATA LOAD BUNDLE
+# In WASM, one fetch of data_bundle.zip (see script_4_make_bundle.py) replaces
+# the per-file round trips. Tables are served from memory; missing ones fall back to files.
+
+data_bundle_name = "data_bundle.zip"
+
+
+def fetch_data_bundle(base_url=None):
+    """Fetch the bundle and return (index, members), or False if it is not available"""
+    url = get_data_processed_url(data_bundle_name, base_url)
+    try:
+        response = get_http_session().get(url)
+        response.raise_for_status()
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            members = {name: archive.read(name) for name in archive.namelist()}
+        index = json.loads(members["index.json"])
+        logger.info(f"Loaded data bundle version {index['version']} from {url}")
+        return index, members
+    except Exception as e:
+        logger.warning(f"Data bundle not available ({e}), reading files one at a time")
+        return False
+
+
+@timed("load")
+def get_data_bundle():
+    """Return (index, members) for the data bundle, fetched once per process, or None"""
+    lock = pn.state.cache.setdefault("freezetracker_data_bundle_lock", threading.Lock())
+    with lock:
+        bundle = pn.state.cache.get("freezetracker_data_bundle")
+        if bundle is None:
+            bundle = fetch_data_bundle()
+            pn.state.cache["freezetracker_data_bundle"] = bundle
+    return bundle or None
+
+
+def read_bundle_file(fname):
+    """Return the bytes of a non-table file (e.g. config.ini) from the bundle, or None"""
+    bundle = get_data_bundle()
+    if bundle is None:
+        return None
+    index, members = bundle
+    member = index["files"].get(fname)
+    return members[member] if member else None
+
+
+def read_bundle_table(fname, columns=None, filters=None):
+    """Return a table from the bundle, or None if the bundle does not have it
+    @param fname: a table name (frost_depth.csv, daily_temps_store) or a per-winter CSV alias"""
+    bundle = get_data_bundle()
+    if bundle is None:
+        return None
+    index, members = bundle
+    alias = index["aliases"].get(fname)
+    if alias is not None:
+        alias_filters = [tuple(f) for f in alias["filters"]] + (filters or [])
+        df = read_bundle_table(alias["table"], filters=alias_filters)
+        return df[columns or alias["columns"]]
+
+    table = index["tables"].get(fname)
+    if table is None:
+        return None
+    if columns is not None or filters is not None:
+        data = io.BytesIO(members[table["member"]])
+        df = pd.read_parquet(data, engine="pyarrow", columns=columns, filters=filters)
+        return apply_file_schema(df, fname)
+
+    cache = get_data_cache()
+    key = ("bundle", fname)
+    df = cache.get(key, index["version"])
+    if df is not None:
+        return df
+    df = pd.read_parquet(io.BytesIO(members[table["member"]]), engine="pyarrow")
+    return cache.put(key, index["version"], apply_file_schema(df, fname))
+
+
+# DATA LOAD STORES
+# Parquet datasets partitioned by CITY and Winter (see script_3_make_store.py).
+# When a store is not available (e.g. WASM), it is assembled from the per-winter CSV files.
+
+processed_store_sources = {
+    "daily_temps": ("daily_temps_{winter}_{city}.csv", ["ELY", "ORR"]),
+}
+
+store_filter_ops = {
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "in": lambda s, v: s.isin(v),
+    "not in": lambda s, v: ~s.isin(v),
+}
+
+
+def filter_df(df, filters):
+    """Apply pyarrow-style filters, e.g. [("CITY", "==", "ORR")], to a data frame"""
+    for column, op, value in filters or []:
+        df = df[store_filter_ops[op](df[column], value)]
+    return df
+
+
+def get_filter_values(filters, column, default_values):
+    """Return the values a filter allows for a partition column, or the defaults"""
+    for filter_column, op, value in filters or []:
+        if filter_column == column and op == "==":
+            return [value]
+        if filter_column == column and op == "in":
+            return list(value)
+    return default_values
+
+
+def read_store_from_csv_files(is_wasm, store_name, filters=None):
+    """Assemble a store from the per-winter CSV files, reading only the partitions needed"""
+    if store_name == "cold_loading_vs_frost_depth":
+        # Built from the daily_temps store and the frost readings, not from its own files
+        return filter_df(prepare_cold_loading_vs_frost_depth(is_wasm), filters)
+    file_pattern, store_cities = processed_store_sources[store_name]
+    cities = get_filter_values(filters, "CITY", store_cities)
+    winters = get_filter_values(filters, "Winter", default_winter_list)
+    partitions = {
+        file_pattern.format(winter=winter, city=city.lower()): (city, winter)
+        for city in cities
+        for winter in winters
+    }
+    dfs_by_fname = read_data_processed_csvs_to_dfs(is_wasm, list(partitions))
+    dfs = []
+    for fname, (city, winter) in partitions.items():
+        df = dfs_by_fname[fname]
+        if df is None:
+            continue
+        df["CITY"] = city
+        df["Winter"] = winter
+        df["DATE"] = pd.to_datetime(df["DATE"])
+        df["Days"] = (df["DATE"] - pd.Timestamp(year=int(winter[:4]), month=7, day=1)).dt.days
+        dfs.append(df)
+    if not dfs:
+        return None
+    df = apply_table_schema(pd.concat(dfs, ignore_index=True), store_name)
+    return filter_df(df, filters)
+
+
+@timed("load")
+def read_data_processed_store_to_df(is_wasm, store_name, columns=None, filters=None):
+    """Read rows and columns from a processed data store in one call
+    @param store_name: 'daily_temps' or 'cold_loading_vs_frost_depth'
+    @param columns: list of columns to read, or None for all
+    @param filters: pyarrow-style filters, e.g. [("CITY", "==", "ORR"), ("Winter", "in", [...])]
+    @return: data frame with the data, or None if not available"""
+    store_path = get_data_processed_path_from_code_folder(f"{store_name}_store")
+    if not is_wasm and store_path.exists():
         try:
-            url = f"https://raw.githubusercontent.com/{username}/{github_repo}/main/data/{data_subfolder}/{fname}"
-            response = requests.get(url)
-            response.raise_for_status()
-            return pd.read_csv(io.StringIO(response.text))
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP Error reading from {url}: {e}")
+            df = pd.read_parquet(store_path, engine="pyarrow", columns=columns, filters=filters)
+            return apply_table_schema(df, store_name)
         except Exception as e:
-            logger.error(f"Error reading from {url}: {e}")
-    else:
+            logger.error(f"Error reading store {store_path}: {e}")
+    if is_wasm:
         try:
-            full_path = get_data_processed_path_from_code_folder(fname)
-            df = pd.read_csv(full_path)
-            return df
-        except FileNotFoundError:
-            logger.error(f"Error: Data file not found at {full_path}")
+            df = read_bundle_table(f"{store_name}_store", columns=columns, filters=filters)
+            if df is not None:
+                return df
         except Exception as e:
-            logger.error(f"Error reading data file: {e}")
+            logger.error(f"Error reading store {store_name} from the data bundle: {e}")
+
+    df = read_store_from_csv_files(is_wasm, store_name, filters)
+    if df is None or columns is None:
+        return df
+    return df[columns]
 
 
 # CHART COLD LOADING
 
+city_colors = {"ELY": "black", "ORR": "grey"}
+default_city_color = "black"
+
+
 def get_city_color(city):
-    city_colors = {"ELY": "black", "ORR": "grey"}
-    return city_colors.get(city.upper(), "black")
+    return city_colors.get(city.upper(), default_city_color)
+
+
+def get_city_colors(cities: pd.Series) -> pd.Series:
+    """Return the chart color of each city in a column (upper case codes)"""
+    return cities.astype(str).map(city_colors).fillna(default_city_color)
 
 
 def get_note_for_winter(name):
@@ -280,59 +448,70 @@ def get_all_incident_days():
     return incident_days
 
 
+@timed("load")
 def read_df_cold_hot_loading_from_winter_and_city(is_wasm, yearString, cityString):
     """Read a file that starts with daily_temps_ into a data frame
     @ param yearString: string with the year range, e.g. '2019-2020'
     @ param cityString: string with the city name, e.g. 'ELY'
     @ return: data frame with the data"""
+    df = read_data_processed_csv_to_df(is_wasm, get_daily_temps_file_name(yearString, cityString))
+    return prepare_df_cold_hot_loading(df, yearString, cityString)
+
+
+def get_daily_temps_file_name(yearString, cityString):
     fn_start = "daily_temps"
-    fname = fn_start + "_" + yearString + "_" + cityString.lower() + ".csv"
-    df = read_data_processed_csv_to_df(is_wasm, fname)
+    return fn_start + "_" + yearString + "_" + cityString.lower() + ".csv"
+
+
+@timed("transform")
+def prepare_df_cold_hot_loading(df, yearString, cityString):
+    """Add the winter, city, and date columns to a daily_temps_ data frame"""
     df["NAME"] = yearString
     df["CITY"] = cityString
     df["DATE"] = pd.to_datetime(df["DATE"])
-    df["Days"] = (
-        df["DATE"] - pd.to_datetime(df["IYEAR"].astype(str) + "-07-01", format="%Y-%m-%d")
-    ).dt.days
+    df["Days"] = (df["DATE"] - pd.Timestamp(year=int(yearString[:4]), month=7, day=1)).dt.days
     df["CITY_UPPER"] = df["CITY"].str.upper()
-    df["CITY_COLOR"] = df["CITY_UPPER"].apply(get_city_color)
-    return df
+    df["CITY_COLOR"] = get_city_colors(df["CITY_UPPER"])
+    return apply_table_schema(df, "daily_temps")
 
 
-def get_chart_overlays_vline_per_month(y_position=0.0):
-    """Add month overlays to a chart"""
-    month_starts = [0, 31, 61, 92, 122, 153, 183, 214, 245, 275, 306, 336]
-    month_names = [
-        "Jul",
-        "Aug",
-        "Sep",
-        "Oct",
-        "Nov",
-        "Dec",
-        "Jan",
-        "Feb",
-        "Mar",
-        "Apr",
-        "May",
-        "Jun",
-    ]
+# ANNOTATION LAYERS
+# Month lines, incident lines, caution and danger zones, and the frost depth guide lines
+# are the same on every chart. Each layer is one vectorized element (VLines, HLines,
+# HSpans, Labels), built once per process by pn.state.as_cached (keyed by the layer and
+# its parameters) and shared by every chart and session.
 
-    month_overlays = []
+month_starts = [0, 31, 61, 92, 122, 153, 183, 214, 245, 275, 306, 336]
+month_names = ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec", "Jan", "Feb", "Mar", "Apr", "May", "Jun"]
 
-    for i, month_start in enumerate(month_starts):
-        month_line = hv.VLine(month_start).opts(line_color="gray", line_width=1)
-        x_position = month_start + 15
-        text = month_names[i]
-        month_text = hv.Text(x_position, y_position, text).opts(
-            text_font_size="8pt", align="center"
-        )
-        month_overlays.append(month_line * month_text)
 
-    return month_overlays
+def get_annotation_layer(name, build, **params):
+    """Return the process-wide layer built by build(**params).
+    Charts get a clone, so options set on a chart never change the shared layer."""
+    return pn.state.as_cached(f"freezetracker_layer_{name}", build, **params).clone()
+
+
+def build_month_layer(y_position):
+    import holoviews as hv
+
+    lines = hv.VLines(month_starts).opts(color="gray", line_width=1)
+    labels = hv.Labels(
+        {"x": [start + 15 for start in month_starts], "y": [y_position] * 12, "text": month_names},
+        kdims=["x", "y"],
+        vdims=["text"],
+    ).opts(text_font_size="8pt", text_align="center")
+    return lines * labels
+
+
+def get_chart_overlay_months(y_position=0.0):
+    """Month start lines with the month names (2 glyphs for all 12 months)"""
+    return get_annotation_layer("months", build_month_layer, y_position=y_position)
 
 
 def add_to_chart_vline_today(chart):
     """Add a vertical line for today to a chart"""
+    import holoviews as hv
+
     now = datetime.now()
     today_days_after_Jul_1 = get_days_after_Jul_1_from_date_string(now)
     today_line = hv.VLine(today_days_after_Jul_1).opts(line_color=today_color, line_width=2)
@@ -340,66 +519,51 @@ def add_to_chart_vline_today(chart):
     return chart
 
 
+def build_incident_layer(winter_name):
+    import holoviews as hv
+
+    if winter_name is None:
+        incident_days = get_all_incident_days()
+    else:
+        incident_days = get_incident_days_given_winter(winter_name)
+    return hv.VLines(incident_days).opts(color=incident_color, line_width=2)
+
+
 def add_to_chart_vlines_all_incidents(chart):
     """Add vertical lines to indicate incident days to a chart"""
-    incident_days = get_all_incident_days()
-    incident_vlines = [
-        hv.VLine(day).opts(line_color=incident_color, line_width=2) for day in incident_days
-    ]
-    chart = chart * hv.Overlay(incident_vlines)
-    return chart
+    return chart * get_annotation_layer("incidents", build_incident_layer, winter_name=None)
 
 
 def add_to_chart_vlines_incidents_by_winter(chart, winter_name):
     """Add vertical lines to indicate incident days to the winter chart"""
-    incident_days = get_incident_days_given_winter(winter_name)
-    incident_vlines = [
-        hv.VLine(day).opts(line_color=incident_color, line_width=2) for day in incident_days
-    ]
-    chart = chart * hv.Overlay(incident_vlines)
-    return chart
-
-
-def add_to_chart_hzones_caution_danger(chart):
-    """Add horizontal areas for caution and danger zones to a chart"""
+    return chart * get_annotation_layer("incidents", build_incident_layer, winter_name=winter_name)
 
-    caution_level = max_cold_loading - 300
-    danger_level = max_cold_loading - 100
-
-    try:
-        caution_area = hv.Area(
-            [
-                (min_season_day, caution_level),
-                (max_season_day, caution_level),
-                (max_season_day, danger_level),
-                (min_season_day, danger_level),
-            ],
-            vdims="y",
-            name="Caution Zone",
-        ).opts(fill_color="yellow", alpha=0.3)
 
-    except Exception as e:
-        logger.error(f"Error occurred while creating caution area: {e}")
-        raise ValueError("Failed to create caution area on CDD chart.")
+def build_caution_danger_layer(max_loading):
+    import holoviews as hv
 
-    try:
-        danger_area = hv.Area(
-            [
-                (min_season_day, danger_level),
-                (max_season_day, danger_level),
-                (max_season_day, max_cold_loading),
-                (min_season_day, max_cold_loading),
-            ],
-            vdims="y",
-            name="Danger Zone",
-        ).opts(fill_color="red", alpha=0.3)
-    except Exception as e:
-        logger.error(f"Error occurred while creating danger area: {e}")
-        raise ValueError("Failed to create danger area on CDD chart.")
+    caution_level = max_loading - 300
+    danger_level = max_loading - 100
+    zones = pd.DataFrame(
+        {
+            "y0": [caution_level, danger_level],
+            "y1": [danger_level, max_loading],
+            "zone": ["Caution Zone", "Danger Zone"],
+            "color": ["yellow", "red"],
+        }
+    )
+    return hv.HSpans(zones, kdims=["y0", "y1"], vdims=["zone", "color"]).opts(
+        color="color", alpha=0.3, line_alpha=0
+    )
 
 
+def add_to_chart_hzones_caution_danger(chart):
+    """Add horizontal areas for caution and danger zones to a chart"""
     try:
-        chart = chart * caution_area * danger_area
+        zones = get_annotation_layer(
+            "caution_danger", build_caution_danger_layer, max_loading=max_cold_loading
+        )
+        chart = chart * zones
     except Exception as e:
         logger.error(f"Error adding caution and danger areas to CDD: {e}")
         raise ValueError("Failed to create danger area on CDD chart.")
@@ -407,8 +571,16 @@ def add_to_chart_hzones_caution_danger(chart):
     return chart
 
 
+@timed("chart")
 def create_chart_cold_loading(is_wasm):
     """Create a cold loading chart and a hot loading chart for each winter"""
+    # Fetch every winter and city in one batch (concurrently in WASM)
+    fnames = [
+        get_daily_temps_file_name(winter, city)
+        for winter in default_winter_list
+        for city in default_city_list
+    ]
+    dfs_by_fname = read_data_processed_csvs_to_dfs(is_wasm, fnames)
 
     charts = []
     for startYear in range(min_winter_start_year, max_winter_start_year + 1):
@@ -416,7 +588,8 @@ def create_chart_cold_loading(is_wasm):
         winter_df_list = []
         for city in default_city_list:
             try:
-                df_temp = read_df_cold_hot_loading_from_winter_and_city(is_wasm, winter, city)
+                df_temp = dfs_by_fname[get_daily_temps_file_name(winter, city)]
+                df_temp = prepare_df_cold_hot_loading(df_temp, winter, city)
                 df_temp["CITY"] = city
                 winter_df_list.append(df_temp)
             except Exception as e:
@@ -429,8 +602,7 @@ def create_chart_cold_loading(is_wasm):
         df = pd.concat(winter_df_list)
 
         note = get_note_for_winter(winter)
-        month_overlays = get_chart_overlays_vline_per_month()
-        month_overlay = hv.Overlay(month_overlays)
+        month_overlay = get_chart_overlay_months()
 
         try: 
             figCold, figHot = create_cold_hot_loading_hvplot_charts(df, winter, note)
@@ -473,6 +645,7 @@ def create_chart_cold_loading(is_wasm):
 
 def create_cold_hot_loading_hvplot_charts(df, name, note):
     """Create and return hvPlot line charts for cumulative cold and hot degree days"""
+    import hvplot.pandas  # noqa
 
     try:
         figCold = df.hvplot.line(
@@ -516,95 +689,45 @@ def create_cold_hot_loading_hvplot_charts(df, name, note):
 
 
 # CHART COLD LOADING VS FROST DEPTHS (ONE PER WINTER)
+# Every station and winter is joined with the frost probe readings in one pass, with the depth
+# interpolated between readings at most frost_depth_max_gap_days apart (frost_join.py).
+# script_3_make_store.py writes the result as a store; without one, it is built here.
+# Readings are joined only to the station in their county (frost_county in stations.py).
+# The scatters and best-fit lines use the measured days (DEPTH_MEASURED); the interpolated
+# days are drawn as a separate line only when FREEZE_TRACKER_INTERPOLATED_DEPTHS=1.
 
 
-def prepare_chart_cold_loading_vs_frost_depth_data_files_one_per_winter(is_wasm):
-    frost_df = read_data_processed_csv_to_df(is_wasm, "frost_stlouis_out.csv")
-    # County,Date,THAW_DEPTH_in,FROST_DEPTH_in,Winter,days_after_Jul_1
-    dfs = {}
+def is_interpolated_depth_layer() -> bool:
+    return os.environ.get("FREEZE_TRACKER_INTERPOLATED_DEPTHS", "0") == "1"
 
-    for startYear in range(min_winter_start_year, max_winter_start_year + 1):
-        yearly_dfs = []
-        city = "ORR"
-        winter = f"{startYear}-{startYear+1}"
-        df_temp = read_df_cold_hot_loading_from_winter_and_city(is_wasm, winter, city)
-        df_temp["CITY"] = city
-        df_temp["Winter"] = winter
-        yearly_dfs.append(df_temp)
-        dfs[winter] = pd.concat(yearly_dfs)
-
-    for name in default_winter_list:
-        single_winter_df = dfs[name]
-
-        # Ensure the 'DATE' column has a consistent data type
-        single_winter_df["DATE"] = pd.to_datetime(single_winter_df["DATE"])
-
-        # Reset index to start from July 1
-        single_winter_df["Days"] = (
-            single_winter_df["DATE"]
-            - pd.to_datetime(single_winter_df["IYEAR"].astype(str) + "-07-01", format="%Y-%m-%d")
-        ).dt.days
-
-        # Force city to upper case
-        single_winter_df["CITY_UPPER"] = single_winter_df["CITY"].str.upper()
-
-        single_winter_df["days_after_Jul_1"] = single_winter_df["Days"]
-
-        # Join the frost_df and single_winter_df on the 'Winter' and 'days_after_Jul_1' columns
-        # Keep all records from the single_winter_df
-        combined_df = single_winter_df.merge(
-            frost_df,
-            left_on=["Winter", "days_after_Jul_1"],
-            right_on=["Winter", "days_after_Jul_1"],
-            how="left",
-        )
 
-        # Filter combined_df to only include rows between July 1 and June 30
-        # combined_df = combined_df[(combined_df["DATE"] >= f"{name[:4]}-07-01") & (combined_df["DATE"] <= f"{name[-4:]}-06-30")]
-
-        # Write the combined_df to a CSV file (one per winter) into the processed data folder
-        output_file = f"cold_loading_vs_frost_depth_{name}_orr.csv"
-        cols = [
-            "CITY",
-            "County",
-            "Winter",
-            "days_after_Jul_1",
-            "IYEAR",
-            "IMONTH",
-            "IDAY",
-            "DATE",
-            "AVG_DAILY_TEMP_F",
-            "HOT_F",
-            "CUMM_HOT_F",
-            "COLD_F",
-            "CUMM_COLD_F",
-            "THAW_DEPTH_in",
-            "FROST_DEPTH_in",
-        ]
-
-        combined_df[cols].to_csv(get_data_processed_path_from_code_folder(output_file), index=False)
-
-
-# Call it once to get the data files
-# prepare_chart_cold_loading_vs_frost_depth_data_files_one_per_winter(False, default_winter_list)
-
-
-def read_cold_loading_vs_frost_depth_from_winter_and_city(is_wasm, winterString, cityString):
-    """Read a file like 'cold_loading_vs_frost_depth_2010-2011_orr' into a data frame
-    @ param yearString: string with the year range, e.g. '2019-2020'
-    @ param cityString: string with the city name, e.g. 'ORR'
-    @ return: data frame with the data"""
-    fn_start = "cold_loading_vs_frost_depth"
-    fname = fn_start + "_" + winterString + "_" + cityString.lower() + ".csv"
-    df = read_data_processed_csv_to_df(is_wasm, fname)
-    df["CITY"] = cityString
-    df["CITY_UPPER"] = df["CITY"].str.upper()
-    df["CITY_COLOR"] = df["CITY_UPPER"].apply(get_city_color)
+@timed("transform")
+def prepare_cold_loading_vs_frost_depth(is_wasm):
+    """Join the daily_temps store (all stations and winters) with frost_stlouis_out.csv"""
+    daily_df = read_data_processed_store_to_df(is_wasm, "daily_temps")
+    frost_df = read_data_processed_csv_to_df(is_wasm, "frost_stlouis_out.csv")
+    df = join_frost_depths(daily_df, frost_df, get_frost_counties())
+    return enforce_table_schema(df, "cold_loading_vs_frost_depth")
+
+
+def load_cold_loading_vs_frost_depth_table(is_wasm, city):
+    """One city's days with a frost depth for every winter (measured or interpolated,
+    see DEPTH_MEASURED), with the chart color"""
+    df = read_data_processed_store_to_df(
+        is_wasm,
+        "cold_loading_vs_frost_depth",
+        columns=["Winter", "CITY", "Days", "CUMM_COLD_F", "FROST_DEPTH_in", "DEPTH_MEASURED"],
+        filters=[("CITY", "==", city)],
+    )
+    df = df.dropna(subset=["CUMM_COLD_F", "FROST_DEPTH_in"])
+    df["CITY_COLOR"] = get_city_colors(df["CITY"].str.upper())
     return df
 
 
 def create_chart_basic_cold_loading_vs_frost_depth(df, title_string):
     """Create an hvPlot scatter chart of frost depth vs cumulative cold degree days"""
+    import hvplot.pandas  # noqa
+
     chart = df.hvplot.scatter(
         y="FROST_DEPTH_in",
         x="CUMM_COLD_F",
@@ -620,36 +743,33 @@ def create_chart_basic_cold_loading_vs_frost_depth(df, title_string):
     return chart
 
 
-def add_to_chart_best_fit_line_loading_vs_frost(chart, df, winter, title_string):
-    """Add a best-fit line to the chart"""
-    # Remove rows with NaN values from the dataframe
-    df = df.dropna()
+# BEST-FIT LINES
+# Slope, intercept, R², and residual spread for every group (station and winter) in one
+# grouped least-squares pass, from sums of centered products (regression.py).
+# Each line is drawn from its two endpoints.
 
-    # Prepare the data for linear regression
-    X = df["CUMM_COLD_F"].values.reshape(-1, 1)
-    y = df["FROST_DEPTH_in"].values
 
-    if len(X) <= 1:
+def add_to_chart_best_fit_line_loading_vs_frost(chart, fit, winter, title_string):
+    """Add a best-fit line (one row of fit_lines, or None) to the chart"""
+    import holoviews as hv
+
+    if fit is None or not np.isfinite(fit["slope"]):
         logger.warning(f"Not enough samples to fit linear regression for winter {winter}")
         return chart
 
-    # Calculate slope and intercept using LinearRegression
+    slope, intercept, r2 = fit["slope"], fit["intercept"], fit["r2"]
     try:
-        model = LinearRegression().fit(X, y)
-        slope, intercept = model.coef_[0], model.intercept_
-
-        # Create the best-fit line using the slope and intercept
-        xmin = min_cold_loading
-        xmax = max_cold_loading
-        best_fit_line = hv.Curve([(x, slope * x + intercept) for x in range(xmin, xmax)]).opts(
-            color="blue", alpha=0.5
-        )
+        # Create the best-fit line from its endpoints
+        points = get_line_endpoints(fit, min_cold_loading, max_cold_loading)
+        best_fit_line = hv.Curve(points).opts(color="blue", alpha=0.5)
 
         # Add the best-fit line to the chart
         chart = chart * best_fit_line
 
         # Add the equation to the chart title
-        chart = chart.opts(title=f"{title_string} [y = {slope:.2f}x + {intercept:.2f}]")
+        chart = chart.opts(
+            title=f"{title_string} [y = {slope:.2f}x + {intercept:.2f}, R² = {r2:.2f}]"
+        )
 
     except Exception as e:
         logger.error(f"Error occurred while creating best-fit line for winter {winter}: {e}")
@@ -657,29 +777,45 @@ def add_to_chart_best_fit_line_loading_vs_frost(chart, df, winter, title_string)
     return chart
 
 
+def build_frost_foot_layer(min_depth_in, max_depth_in):
+    import holoviews as hv
+
+    return hv.HLines(list(range(min_depth_in, max_depth_in, 12))).opts(color="gray", alpha=0.2)
+
+
+def add_to_chart_interpolated_depths(chart, df):
+    """Add the interpolated days of one winter (DEPTH_MEASURED False) as a faint line"""
+    import holoviews as hv
+
+    days = df.sort_values("Days")
+    line = hv.Curve(days, "CUMM_COLD_F", "FROST_DEPTH_in", label="interpolated")
+    return chart * line.opts(color="gray", alpha=0.4, line_dash="dotted")
+
+
 def add_to_chart_hcurves_per_ft_frost(chart):
     """Add horizontal lines for every 12 inches (1 foot) of frost depth to a chart"""
-    logger.debug(f"CALLING XY add_to_chart_hcurves_per_ft_frost")
-
-    ymin = min_frost_depth_in
-    ymax = max_frost_depth_in
-    x_range = (min_cold_loading, max_cold_loading)
-    # create a list of horizontal frost lines (curves) at 12 inch intervals
-    # using a list comprehension to generate a list of hv.Curve objects
-    frost_lines = [
-        hv.Curve([(x_range[0], i), (x_range[1], i)]).opts(color="gray", alpha=0.2)
-        for i in range(ymin, ymax, 12)
-    ]
-    chart = chart * hv.Overlay(frost_lines)
-    return chart
+    frost_lines = get_annotation_layer(
+        "frost_feet",
+        build_frost_foot_layer,
+        min_depth_in=min_frost_depth_in,
+        max_depth_in=max_frost_depth_in,
+    )
+    return chart * frost_lines
 
 
 def add_to_chart_y_tick_formatter_per_ft_of_frost(scatter_chart):
     """Add custom y-axis tick formatter to the chart"""
+    from holoviews import opts
 
     # Set y_range explicitly to ensure that tick marks and lines appear at 1 ft (12 in) intervals
     scatter_chart = scatter_chart.opts(ylim=(12, 96))
 
+    try:
+        from bokeh.models.formatters import FuncTickFormatter
+    except ImportError:
+        # Renamed in bokeh 3
+        from bokeh.models.formatters import CustomJSTickFormatter as FuncTickFormatter
+
     # Create a custom tick formatter for the y-axis
     y_tick_formatter = FuncTickFormatter(
         code="""
@@ -693,17 +829,31 @@ def add_to_chart_y_tick_formatter_per_ft_of_frost(scatter_chart):
     return scatter_chart
 
 
+@timed("chart")
 def create_chart_cold_loading_vs_frost_depth(is_wasm):
     """Create a scatter chart each winter of cold loading chart vs frost depth"""
 
+    city = "ORR"
+    try:
+        all_winters_df = get_shared_table(
+            is_wasm,
+            "cold_loading_vs_frost_depth_orr",
+            ["cold_loading_vs_frost_depth_store", "daily_temps_store", freeze_thaw_file_name_out],
+            lambda: load_cold_loading_vs_frost_depth_table(is_wasm, city),
+        )
+    except Exception as e:
+        logger.error(f"Error occurred while reading input data: {e}")
+        return create_pane_empty_chart()
+
+    # Probe readings only: interpolated days would outnumber them and weight the fits
+    measured_df = all_winters_df[all_winters_df["DEPTH_MEASURED"]]
+    fits = fit_lines(measured_df, "CUMM_COLD_F", "FROST_DEPTH_in", "Winter")
+
     charts = []
     for startYear in range(min_winter_start_year, max_winter_start_year + 1):
         winter = f"{startYear}-{startYear+1}"
-        city = "ORR"
-        try:
-            df = read_cold_loading_vs_frost_depth_from_winter_and_city(is_wasm, winter, city)
-        except Exception as e:
-            logger.error(f"Error occurred while reading input data: {e}")
+        df = measured_df[measured_df["Winter"] == winter]
+        if df.empty:
             continue
 
         note = ""
@@ -716,6 +866,11 @@ def create_chart_cold_loading_vs_frost_depth(is_wasm):
 
         xyChart = create_chart_basic_cold_loading_vs_frost_depth(df, XY_title)
 
+        if is_interpolated_depth_layer():
+            xyChart = add_to_chart_interpolated_depths(
+                xyChart, all_winters_df[all_winters_df["Winter"] == winter]
+            )
+
         try:
             xyChart = add_to_chart_hcurves_per_ft_frost(xyChart)
         except Exception as e:
@@ -724,7 +879,8 @@ def create_chart_cold_loading_vs_frost_depth(is_wasm):
             )
 
         try:
-            xyChart = add_to_chart_best_fit_line_loading_vs_frost(xyChart, df, winter, XY_title)
+            fit = fits.loc[winter] if winter in fits.index else None
+            xyChart = add_to_chart_best_fit_line_loading_vs_frost(xyChart, fit, winter, XY_title)
         except Exception as e:
             logger.error(f"Error XY charts while creating best-fit line for winter {winter}: {e}")
 
@@ -748,7 +904,10 @@ def create_chart_cold_loading_vs_frost_depth(is_wasm):
 # CHART ELY AGGREGATE
 
 
-def plot_cumulative_data(names, cumulative_types):
+def plot_cumulative_data(combined_df_ely, names, cumulative_types):
+    import holoviews as hv
+    import hvplot.pandas  # noqa
+
     # Check if the provided cumulative types are valid
     valid_cumulative_types = ["CUMM_COLD_F", "CUMM_HOT_F"]
     if not set(cumulative_types).issubset(valid_cumulative_types):
@@ -782,32 +941,36 @@ def plot_cumulative_data(names, cumulative_types):
     return pn.pane.HoloViews(fig, sizing_mode="stretch_both")
 
 
-def create_chart_ely_aggregate(is_wasm):
-
-    dfs = []
-    global combined_df_ely
+# Locally the Ely winters are sliced from the daily cube (daily_cube.py, not in the WASM
+# bundle), with the day of the season as INDEX; otherwise they come from the daily_temps store.
+ely_aggregate_sources = [
+    "daily_temps_store",
+    "daily_cube/CUMM_COLD_F.npy",
+    "daily_cube/CUMM_HOT_F.npy",
+]
 
-    # Loop over years and cities
-    for startYear in range(min_winter_start_year, max_winter_start_year + 1):
-        for city in ["ELY"]:
-            dfs.append(read_df_cold_hot_loading_from_winter_and_city(is_wasm, f"{startYear}-{startYear+1}", city))
 
-    # Concatenate all dataframes into one
-    combined_df_ely = pd.concat(dfs)
+def load_ely_aggregate_table(is_wasm):
+    """All Ely winters in one call"""
+    index = None if is_wasm else read_cube_index()
+    if index is not None and "ELY" in index["stations"]:
+        df = open_daily_cube().to_df(["CUMM_COLD_F", "CUMM_HOT_F"], "ELY")
+        return df[df["NAME"].isin(default_winter_list)].reset_index(drop=True)
+    return read_data_processed_store_to_df(
+        is_wasm,
+        "daily_temps",
+        columns=["Winter", "INDEX", "DATE", "Days", "CUMM_COLD_F", "CUMM_HOT_F"],
+        filters=[("CITY", "==", "ELY")],
+    ).rename(columns={"Winter": "NAME"})
 
-    # Ensure the 'DATE' column has a consistent data type
-    combined_df_ely["DATE"] = pd.to_datetime(combined_df_ely["DATE"])
 
-    # Reset index to start from July 1
-    combined_df_ely["Days"] = (
-        combined_df_ely["DATE"]
-        - pd.to_datetime(combined_df_ely["IYEAR"].astype(str) + "-07-01", format="%Y-%m-%d")
-    ).dt.days
+@timed("chart")
+def create_chart_ely_aggregate(is_wasm):
+    import hvplot.pandas  # noqa
 
-    # Call the new function with the desired names and cumulative_type
-    names_to_show = default_winter_list
-    cumulative_types = ["CUMM_COLD_F", "CUMM_HOT_F"]
-    plot_cumulative_data(names_to_show, cumulative_types)
+    combined_df_ely = get_shared_table(
+        is_wasm, "ely_aggregate", ely_aggregate_sources, lambda: load_ely_aggregate_table(is_wasm)
+    )
 
     figCold = combined_df_ely.hvplot.line(
         x="INDEX",
@@ -847,48 +1010,96 @@ freeze_thaw_file_name = "frost_stlouis.csv"
 freeze_thaw_file_name_out = "frost_stlouis_out.csv"
 
 
+@timed("transform")
 def prepare_freeze_thaw_chart_points():
-    """Prepare the freeze and thaw chart points and save them to a CSV file."""
+    """Prepare the freeze and thaw chart points and save them to a CSV file.
+    Run once, locally, after the freeze and thaw input file changes."""
     is_wasm = False  # only run this locally
     df = read_data_processed_csv_to_df(is_wasm, freeze_thaw_file_name)
-    df = prepare_df_freeze_thaw(df)
+    df = enforce_table_schema(prepare_df_freeze_thaw(df), "frost_stlouis_out")
     df.to_csv(get_data_processed_path_from_code_folder(freeze_thaw_file_name_out), index=False)
     logger.info(f"Saved file {freeze_thaw_file_name_out}")
 
 
+@timed("transform")
 def prepare_df_freeze_thaw(df):
     """Starts with County,Date,THAW_DEPTH_in,FROST_DEPTH_in,SECONDARY_FROST_DEPTH_in"""
     df = df.drop(columns=["SECONDARY_FROST_DEPTH_in"])
     df["Date"] = pd.to_datetime(df["Date"], format="%Y/%m/%d")
 
-    # Add a column for the winter season, e.g. 2010-2011
-    start_year = df["Date"].apply(lambda x: calculate_winter_start_year(x))
-    end_year = start_year + 1
-    df["Winter"] = start_year.astype(str) + "-" + end_year.astype(str)
-
-    # Add a column for the days after July 1 of the current winter season
-    df["days_after_Jul_1"] = (
-        df["Date"]
-        - df["Date"].apply(lambda x: x.replace(year=calculate_winter_start_year(x), month=7, day=1))
-    ).dt.days
+    # Add columns for the winter season, e.g. 2010-2011, and the days after its July 1
+    df["Winter"] = get_winter_names(df["Date"])
+    df["days_after_Jul_1"] = get_days_after_Jul_1(df["Date"])
 
     df = df.dropna(subset=["THAW_DEPTH_in", "FROST_DEPTH_in"], how="all")
     return df
 
 
-# Run once to create the CSV file
-# prepare_freeze_thaw_chart_points()
+# Modeled frost depth (STEFAN_DEPTH_in, see frost_model.py) for the frost probe's station,
+# drawn over each winter's readings unless FREEZE_TRACKER_STEFAN_OVERLAY=0
+stefan_depth_city = "ORR"
 
 
-def create_chart_freeze_thaw(is_wasm):
-    """Create charts of freeze and thaw lines"""
+def is_stefan_overlay() -> bool:
+    return os.environ.get("FREEZE_TRACKER_STEFAN_OVERLAY", "1") != "0"
+
+
+def load_stefan_depth_table(is_wasm, city):
+    """One city's modeled frost depth per winter and day (None if the store has none)"""
+    df = read_data_processed_store_to_df(
+        is_wasm,
+        "daily_temps",
+        columns=["Winter", "Days", "STEFAN_DEPTH_in"],
+        filters=[("CITY", "==", city)],
+    )
+    if df is None or "STEFAN_DEPTH_in" not in df.columns:
+        return None
+    return df.sort_values(by=["Winter", "Days"], kind="stable")
+
+
+def get_stefan_depths_by_winter(is_wasm) -> dict:
+    """Winter -> modeled frost depth rows for the overlay (empty if it is off or missing)"""
+    if not is_stefan_overlay():
+        return {}
+    try:
+        df = get_shared_table(
+            is_wasm,
+            f"stefan_depth_{stefan_depth_city.lower()}",
+            ["daily_temps_store"],
+            lambda: load_stefan_depth_table(is_wasm, stefan_depth_city),
+        )
+    except Exception as e:
+        logger.error(f"Error reading modeled frost depths: {e}")
+        return {}
+    if df is None:
+        return {}
+    return {str(winter): winter_df for winter, winter_df in df.groupby("Winter", observed=True)}
 
+
+def load_freeze_thaw_table(is_wasm):
+    """Frost and thaw readings, sorted by day within each winter"""
     df = read_data_processed_csv_to_df(is_wasm, freeze_thaw_file_name_out)
-    grouped_df = df.groupby("Winter")
+    return df.sort_values(by=["Winter", "days_after_Jul_1"], kind="stable")
+
+
+@timed("chart")
+def create_chart_freeze_thaw(is_wasm):
+    """Create charts of freeze and thaw lines"""
+    import holoviews as hv
+    import hvplot.pandas  # noqa
+    from holoviews import opts
+
+    df = get_shared_table(
+        is_wasm,
+        "freeze_thaw",
+        [freeze_thaw_file_name_out],
+        lambda: load_freeze_thaw_table(is_wasm),
+    )
+    grouped_df = df.groupby("Winter", observed=True)
+    stefan_by_winter = get_stefan_depths_by_winter(is_wasm)
     charts = []
 
     for winter, winter_df in grouped_df:
-        winter_df = winter_df.sort_values(by=["days_after_Jul_1"])
         last_data_point_date = winter_df["Date"].max()
         max_depth_in = winter_df["FROST_DEPTH_in"].max()
 
@@ -911,14 +1122,20 @@ def create_chart_freeze_thaw(is_wasm):
             # label="Thaw depth, in",
         )  # .opts(responsive=True)
 
-        month_overlays = get_chart_overlays_vline_per_month()
-        month_overlay = hv.Overlay(month_overlays)
+        month_overlay = get_chart_overlay_months()
 
         # Create a holoviews chart using overlay operator, *
         combined_chart = (freeze_line * thaw_line) * month_overlay
 
-        # From string 2010-04-06 get just the string month and day
-        short_last_date = last_data_point_date[5:10]
+        stefan_df = stefan_by_winter.get(str(winter))
+        if stefan_df is not None:
+            stefan_line = hv.Curve(
+                stefan_df, "Days", "STEFAN_DEPTH_in", label="Modeled frost depth"
+            ).opts(color="green", line_dash="dashed", line_width=2)
+            combined_chart = combined_chart * stefan_line
+
+        # From date 2010-04-06 get just the string month and day
+        short_last_date = last_data_point_date.strftime("%m-%d")
         combined_chart = combined_chart.opts(
             title=f"Frost, Thaw Depth Trends ({winter}, Last Data Point: {short_last_date})",
             width=default_chart_width_px,
@@ -948,27 +1165,42 @@ def create_chart_freeze_thaw(is_wasm):
 
 
 def create_custom_colormap_frost_max_depth():
+    from matplotlib.colors import LinearSegmentedColormap
+
     colors = ["green", "yellow", "red"]
     cmap = LinearSegmentedColormap.from_list("custom_cmap", colors)
     return cmap
 
 
-def create_chart_frost_max_depth(is_wasm):
-    """Create a chart of the max frost depth"""
+depth_file_name = "frost_depth.csv"
 
-    depth_file_name = "frost_depth.csv"
+
+def load_frost_max_depth_table(is_wasm):
     df = read_data_processed_csv_to_df(is_wasm, depth_file_name)
     if df is None:
-        logger.error("Error: df for max frost depth is None")
         return None
-
-    cmap = create_custom_colormap_frost_max_depth()
     # Normalize the 'Max_Frost_Depth_in' column to a range of 0-1 for color mapping
     normalized_depth = (df["Max_Frost_Depth_in"] - df["Max_Frost_Depth_in"].min()) / (
         df["Max_Frost_Depth_in"].max() - df["Max_Frost_Depth_in"].min()
     )
-    # Convert the normalized depth values to a DataFrame
     df["Normalized_Depth"] = normalized_depth
+    return df
+
+
+@timed("chart")
+def create_chart_frost_max_depth(is_wasm):
+    """Create a chart of the max frost depth"""
+    import holoviews as hv
+    import hvplot.pandas  # noqa
+
+    df = get_shared_table(
+        is_wasm, "frost_max_depth", [depth_file_name], lambda: load_frost_max_depth_table(is_wasm)
+    )
+    if df is None:
+        logger.error("Error: df for max frost depth is None")
+        return None
+
+    cmap = create_custom_colormap_frost_max_depth()
     avg_depth = df["Max_Frost_Depth_in"].mean()
 
     # Create the bokeh bar chart with the custom colors and rotated x-axis labels and a text label above each bar
@@ -1006,6 +1238,7 @@ def create_chart_frost_max_depth(is_wasm):
 # CHART FROST SPAN
 
 
+@timed("transform")
 def prepare_df_frost_span(df):
     df["Frost_Start"] = pd.to_datetime(df["Frost_Start"], format="%Y/%m/%d")
     df["Frost_End"] = pd.to_datetime(df["Frost_End"], format="%Y/%m/%d")
@@ -1014,43 +1247,53 @@ def prepare_df_frost_span(df):
         df["Duration_days"].max() - df["Duration_days"].min()
     )
     df["Normalized_Duration"] = normalized_duration
-    df["days_after_Jul_1"] = (
-        df["Frost_Start"] - df["Frost_Start"].apply(lambda x: x.replace(month=7, day=1))
-    ).dt.days
-    start_year = df["Frost_Start"].dt.year
-    end_year = start_year + 1
-    df["Winter"] = start_year.astype(str) + "-" + end_year.astype(str)
+    df["days_after_Jul_1"] = get_days_after_Jul_1(df["Frost_Start"])
+    df["Winter"] = get_winter_names(df["Frost_Start"])
+    # Numeric rows (oldest winter at 0) so the shared VLines layers can overlay the spans
+    winters = sorted(df["Winter"].unique())
+    df["Winter_Position"] = pd.Categorical(df["Winter"], categories=winters).codes
     df["line_color"] = df["Normalized_Duration"]
     return df
 
 
 def create_custom_colormap_frost_span():
+    from matplotlib.colors import LinearSegmentedColormap
+
     colors = ["green", "yellow", "red"]
     cmap = LinearSegmentedColormap.from_list("custom_cmap", colors)
     return cmap
 
 
+span_file_name = "frost_span.csv"
+
+
+@timed("chart")
 def create_chart_frost_span(is_wasm):
     """Create a chart of the frost span"""
+    import holoviews as hv
 
-    span_file_name = "frost_span.csv"
-    df = read_data_processed_csv_to_df(is_wasm, span_file_name)
-    df = prepare_df_frost_span(df)
+    df = get_shared_table(
+        is_wasm,
+        "frost_span",
+        [span_file_name],
+        lambda: prepare_df_frost_span(read_data_processed_csv_to_df(is_wasm, span_file_name)),
+    )
     cmap = create_custom_colormap_frost_span()
 
-    segments = create_hv_segments(df)
-    chart = hv.Overlay(segments)
+    chart = create_hv_segments(df) * create_hv_span_labels(df)
 
     chart = add_to_chart_vline_today(chart)
     chart = add_to_chart_vlines_all_incidents(chart)
 
-    month_overlays = get_chart_overlays_vline_per_month()
-    month_overlay = hv.Overlay(month_overlays)
+    month_overlay = get_chart_overlay_months(y_position=-1.0)
     chart = chart * month_overlay
 
+    winter_ticks = df.drop_duplicates("Winter")[["Winter_Position", "Winter"]]
     chart = chart.opts(hv.opts.Segments(color="line_color", cmap=cmap, line_width=10))
     chart = chart.redim.label(x="Days After July 1", y="Winter").opts(
-        width=default_chart_width_px, height=default_chart_height_px
+        width=default_chart_width_px,
+        height=default_chart_height_px,
+        yticks=list(winter_ticks.itertuples(index=False, name=None)),
     )
     chart = chart.redim.range(x=(90, max_season_day))
     chart = chart.opts(title="Frost Span (Orr, MN)")
@@ -1061,46 +1304,58 @@ def create_chart_frost_span(is_wasm):
     return column
 
 
+def get_span_day_labels(dates: pd.Series) -> pd.Series:
+    """Return labels like 'Nov 5' for a datetime column"""
+    return dates.dt.strftime("%b ") + dates.dt.day.astype(str)
+
+
 def create_hv_segments(df):
-    hv_segments = []
-    for idx, row in df.iterrows():
-        start_text, end_text = create_text_overlays(row)
-        segment_data = [
-            {
-                "x0": row["days_after_Jul_1"],
-                "x1": row["days_after_Jul_1"] + row["Duration_days"],
-                "y0": row["Winter"],
-                "y1": row["Winter"],
-                "line_color": row["line_color"],
-                "start_date": row["Frost_Start"].strftime("%Y-%m-%d"),
-                "end_date": row["Frost_End"].strftime("%Y-%m-%d"),
-            }
-        ]
-        segment = hv.Segments(
-            segment_data,
-            kdims=["x0", "y0", "x1", "y1"],
-            vdims=["line_color", "start_date", "end_date"],
-        )
-        hv_segments.append(segment * start_text * end_text)
-    return hv_segments
+    """One Segments element holding every span (a single glyph renderer in bokeh)"""
+    import holoviews as hv
+
+    segment_df = pd.DataFrame(
+        {
+            "x0": df["days_after_Jul_1"],
+            "y0": df["Winter_Position"],
+            "x1": df["days_after_Jul_1"] + df["Duration_days"],
+            "y1": df["Winter_Position"],
+            "line_color": df["line_color"],
+            "Winter": df["Winter"],
+            "start_date": df["Frost_Start"].dt.strftime("%Y-%m-%d"),
+            "end_date": df["Frost_End"].dt.strftime("%Y-%m-%d"),
+        }
+    )
+    return hv.Segments(
+        segment_df,
+        kdims=["x0", "y0", "x1", "y1"],
+        vdims=["line_color", "Winter", "start_date", "end_date"],
+    )
+
 
+def create_hv_span_labels(df):
+    """One Labels element with the start date left of each span and the end date right of it"""
+    import holoviews as hv
 
-def create_text_overlays(row):
-    start_text = hv.Text(
-        row["days_after_Jul_1"],
-        row["Winter"],
-        "{:%b %#d}  ".format(row["Frost_Start"]),
-        halign="right",
-        fontsize=8,
+    start_df = pd.DataFrame(
+        {
+            "x": df["days_after_Jul_1"],
+            "y": df["Winter_Position"],
+            "text": get_span_day_labels(df["Frost_Start"]) + "  ",
+            "align": "right",
+        }
     )
-    end_text = hv.Text(
-        row["days_after_Jul_1"] + row["Duration_days"],
-        row["Winter"],
-        "  {:%b %#d}".format(row["Frost_End"]),
-        halign="left",
-        fontsize=8,
+    end_df = pd.DataFrame(
+        {
+            "x": df["days_after_Jul_1"] + df["Duration_days"],
+            "y": df["Winter_Position"],
+            "text": "  " + get_span_day_labels(df["Frost_End"]),
+            "align": "left",
+        }
+    )
+    labels_df = pd.concat([start_df, end_df], ignore_index=True)
+    return hv.Labels(labels_df, kdims=["x", "y"], vdims=["text", "align"]).opts(
+        text_align="align", text_font_size="8pt", text_color="black"
     )
-    return start_text, end_text
 
 
 # APP =======================================================
@@ -1169,51 +1424,231 @@ def create_row_all_incidents():
     return pn.Row(incidents_column)
 
 
-# CALL API OPEN WEATHER
+# ADMIN PANE (hidden unless the page is opened with ?admin=1)
 
 
-def get_current_temperature(is_wasm, city):
-    city_lat_long = {"ELY": {"lat": 47.9, "lon": -91.86}, "ORR": {"lat": 48.05, "lon": -92.83}}
+def is_admin_session() -> bool:
+    """Return True when the page URL has ?admin=1"""
+    values = (pn.state.session_args or {}).get("admin", [b""])
+    return values[0] in (b"1", b"true")
 
-    lat = city_lat_long[city]["lat"]
-    lon = city_lat_long[city]["lon"]
 
-    config = read_config(is_wasm)
-    config_section = "api"
-    config_key = "OPEN_WEATHER_MAP_API_KEY"
-    api_key = config.get(config_section, config_key)
-    url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=imperial"
-    logger.debug(f"Requesting temperature for {city}")
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = json.loads(response.text)
-        temperature = data["main"]["temp"]
-        return temperature
-    else:
-        logger.error(f"Error getting temperature for {city}")
-        logger.error(f"Error get_current_temperature ended for {city}")
-        return None
+def create_pane_admin_timings():
+    """Per-stage latency summary (p50/p95 across sessions) with refresh and JSON download"""
+    table = pn.pane.DataFrame(pd.DataFrame(get_stage_timings_summary()), index=False)
+
+    def refresh(event=None):
+        table.object = pd.DataFrame(get_stage_timings_summary())
+
+    refresh_button = pn.widgets.Button(name="Refresh", button_type="primary", width=100)
+    refresh_button.on_click(refresh)
+    download = pn.widgets.FileDownload(
+        callback=lambda: io.StringIO(json.dumps(get_stage_timings_summary(), indent=2)),
+        filename="stage_timings.json",
+        width=200,
+    )
+    return pn.Column(
+        pn.pane.Markdown("## Stage Timings (ms)"),
+        pn.Row(refresh_button, download),
+        table,
+    )
+
+
+# SHARED FEEDS
+# Values that change while the page is open (current temperatures, the frost nowcast) are
+# refreshed by one scheduled task per process and pushed to every session that watches
+# them (shared_feeds.py), instead of each session polling on its own callback.
+
+
+def watch_shared_feed(feed, show):
+    """Call show(value) in this session each time the feed publishes a new value"""
+    watcher = feed.param.watch(lambda event: show(event.new), "value")
+    doc = pn.state.curdoc
+    if doc is not None and doc.session_context is not None:
+        doc.on_session_destroyed(lambda session_context: feed.param.unwatch(watcher))
+
+
+# CURRENT CONDITIONS (OpenWeatherMap)
+# One process-wide service fetches every station at once (with timeouts) and caches the
+# temperatures for a TTL; sessions never wait on the network (current_conditions.py).
+# One feed publishes the cached temperatures to every session.
+
+# How often the process-wide feed publishes the cached temperatures
+current_conditions_check_seconds = 10
+
+
+def get_current_conditions_service(is_wasm):
+    """Return the process-wide service (config.ini is read once, by the first session).
+    FREEZE_TRACKER_WEATHER_URL points it at another endpoint, e.g. a local stub server."""
+    from freezetracker import current_conditions
+
+    return current_conditions.get_current_conditions_service(
+        is_wasm,
+        base_url=os.environ.get("FREEZE_TRACKER_WEATHER_URL"),
+        config_reader=read_config,
+        session=get_http_session(),
+    )
+
+
+def get_current_temperatures_feed(is_wasm):
+    """Return the process-wide feed of cached temperatures, started by the first session"""
+    service = get_current_conditions_service(is_wasm)
+    feed = get_shared_feed("current_temperatures")
+    feed.update(service.url, lambda: service.get_temperatures)
+    feed.start(current_conditions_check_seconds)
+    return feed
+
+
+def format_current_temperature(code, temperature) -> str:
+    value = "--" if temperature is None else f"{temperature:.1f}"
+    return f"## {code.title()}: {value} F"
 
 
 def create_row_current_temps():
-    wasm = is_WASM()
-    is_dev = False
-    ely_current_temp = 0.0 if is_dev else get_current_temperature(wasm, "ELY")
-    orr_current_temp = 0.0 if is_dev else get_current_temperature(wasm, "ORR")
-    ely_temp_pane = pn.pane.Markdown(f"## Ely: {ely_current_temp:.1f} F")
-    orr_temp_pane = pn.pane.Markdown(f"## Orr: {orr_current_temp:.1f} F")
-    row = pn.Row(
-        ely_temp_pane,
-        orr_temp_pane,
+    """Current temperatures from the shared feed (updated when it publishes new ones)"""
+    feed = get_current_temperatures_feed(is_WASM())
+    panes = {
+        code: pn.pane.Markdown(format_current_temperature(code, temperature))
+        for code, temperature in (feed.value or {}).items()
+    }
+
+    def show(temperatures):
+        for code, temperature in temperatures.items():
+            if code in panes:
+                panes[code].object = format_current_temperature(code, temperature)
+
+    watch_shared_feed(feed, show)
+    return pn.Row(*panes.values())
+
+
+# FROST NOWCAST
+# Today's frost depth per station from its cumulative cold loading: a line per station
+# fit to the frost probe readings of every winter, kept as sufficient statistics so new
+# readings are added one at a time, and predicted for every station in one array operation
+# (nowcast.py). script_3_make_store.py saves the fit as frost_nowcast_model.json;
+# without it, the fit is made here from the cold_loading_vs_frost_depth store.
+# The model is read (or trained) once per process and data version, after the page is
+# sent, and one feed re-predicts for the current date for every session.
+
+# How often the process-wide feed re-predicts (so the nowcast follows the calendar day)
+frost_nowcast_refresh_seconds = 600
+
+frost_nowcast_file_names = [
+    "daily_temps_store",
+    "cold_loading_vs_frost_depth_store",
+    nowcast_model_file_name,
+]
+
+
+@timed("load")
+def read_frost_nowcast_model(is_wasm):
+    """Return the saved NowcastModel (bundle or GitHub in WASM, local file otherwise), or None"""
+    try:
+        if is_wasm:
+            content = read_bundle_file(nowcast_model_file_name)
+            if content is None:
+                response = get_http_session().get(get_data_processed_url(nowcast_model_file_name))
+                response.raise_for_status()
+                content = response.content
+        else:
+            path = get_data_processed_path_from_code_folder(nowcast_model_file_name)
+            if not path.exists():
+                return None
+            content = path.read_bytes()
+        return NowcastModel.from_dict(json.loads(content))
+    except Exception as e:
+        logger.error(f"Error reading {nowcast_model_file_name}: {e}")
+        return None
+
+
+@timed("transform")
+def make_frost_nowcast_read(is_wasm):
+    """Return read() for the frost nowcast feed: the saved fit plus any newer probe
+    readings, predicted for the current date each time it is called (None without data)"""
+    frost_df = read_data_processed_store_to_df(
+        is_wasm,
+        "cold_loading_vs_frost_depth",
+        columns=["CITY", "DATE", "CUMM_COLD_F", "FROST_DEPTH_in", "DEPTH_MEASURED"],
     )
-    return row
+    model = read_frost_nowcast_model(is_wasm)
+    if model is None:
+        if frost_df is None:
+            return None
+        model = NowcastModel.train(frost_df)
+    elif frost_df is not None:
+        model.add_measured_days(frost_df)
+    daily_df = read_data_processed_store_to_df(
+        is_wasm, "daily_temps", columns=["CITY", "DATE", "CUMM_COLD_F"]
+    )
+    if daily_df is None:
+        return None
+    # only importable code and plain data: the feed outlives this session's app module
+    return partial(nowcast_frost_depths, model, daily_df)
+
+
+def get_frost_nowcast_feed(is_wasm):
+    """Return the process-wide nowcast feed, made again when the data changes and
+    started by the first session"""
+    feed = get_shared_feed("frost_nowcast")
+    version = get_source_version(is_wasm, frost_nowcast_file_names)
+    feed.update(version, lambda: make_frost_nowcast_read(is_wasm))
+    feed.start(frost_nowcast_refresh_seconds)
+    return feed
+
+
+def format_frost_nowcast(df) -> str:
+    """Depth per station for today; stations whose data ends earlier show its as-of day,
+    and stations with no data yet this winter show only their last depth, marked as such"""
+    if df is None or df.empty:
+        return "## Frost Depth\nNot available"
+    lines = ["## Frost Depth", f"{df['NOWCAST_DATE'].iloc[0]:%b %d, %Y}"]
+    for row in df.itertuples():
+        if np.isnan(row.FROST_DEPTH_in):
+            continue
+        if not row.CURRENT_WINTER:
+            lines.append(f"### {row.CITY.title()}: no data this winter")
+            lines.append(f"Last: {row.FROST_DEPTH_in:.0f} in on {row.DATE:%b %d, %Y}")
+            continue
+        lines.append(f"### {row.CITY.title()}: {row.FROST_DEPTH_in:.0f} in")
+        band = f"{row.FROST_DEPTH_LOW_in:.0f}-{row.FROST_DEPTH_HIGH_in:.0f} in"
+        if row.DATE < row.NOWCAST_DATE:
+            band += f" (as of {row.DATE:%b %d, %Y})"
+        lines.append(band)
+    return "\n\n".join(lines)
+
+
+def create_pane_frost_nowcast():
+    """Frost depth nowcast from the shared feed; the model is loaded after the page is sent"""
+    wasm = is_WASM()
+    feed = get_shared_feed("frost_nowcast")
+    if feed.value is None:
+        pane = pn.pane.Markdown("## Frost Depth\nLoading...")
+    else:
+        pane = pn.pane.Markdown(format_frost_nowcast(feed.value))
+    watch_shared_feed(feed, lambda df: setattr(pane, "object", format_frost_nowcast(df)))
+
+    def load():
+        try:
+            with timed_span("page", "section frost nowcast"):
+                pane.object = format_frost_nowcast(get_frost_nowcast_feed(wasm).value)
+        except Exception as e:
+            logger.error(f"Error loading the frost nowcast: {e}")
+            pane.object = "## Frost Depth\nNot available"
+
+    if is_deferred_loading():
+        pn.state.onload(load, threaded=pn.config.nthreads is not None)
+    else:
+        load()
+    return pane
 
 
+@timed("page")
 def create_template_sidebar():
     logger.info("CALLED create_template_sidebar()")
 
     today_pane = create_pane_showing_today()
     current_temps_row = create_row_current_temps()
+    frost_nowcast_pane = create_pane_frost_nowcast()
     incidents_row = create_row_all_incidents()
     open_frost_thaw_url_pane = create_pane_open_url_frost_thaw()
     open_probabilities_url_pane = create_pane_open_url_probabilities()
@@ -1222,6 +1657,7 @@ def create_template_sidebar():
     sidebar_column = pn.Column(
         today_pane,
         current_temps_row,
+        frost_nowcast_pane,
         incidents_row,
         open_frost_thaw_url_pane,
         open_probabilities_url_pane,
@@ -1233,16 +1669,67 @@ def create_template_sidebar():
     return sidebar_column
 
 
+# DEFERRED SECTIONS
+# The page shell and the cheap charts are sent first. Heavy sections are sent as loading
+# placeholders and built once the browser connects (pn.state.onload), on panel's thread
+# pool so the server's event loop stays free for other sessions.
+
+# Threads for deferred sections (panel serve --num-threads or PANEL_NUM_THREADS override this)
+default_num_threads = 4
+
+
+def is_deferred_loading() -> bool:
+    """True in a served session, unless FREEZE_TRACKER_DEFER_SECTIONS=0 (build up front)"""
+    if os.environ.get("FREEZE_TRACKER_DEFER_SECTIONS", "1") == "0":
+        return False
+    doc = pn.state.curdoc
+    return doc is not None and doc.session_context is not None
+
+
+def create_deferred_section(title, build, min_height=default_chart_height_px):
+    """Return a placeholder that build() fills after the session loads (or build() itself
+    when there is no session to defer to, e.g. python app.py or the benchmarks)
+    @param title: shown while loading, and names the timing span"""
+    if not is_deferred_loading():
+        return build()
+
+    placeholder = pn.pane.Markdown(f"Loading {title}...")
+    section = pn.Column(placeholder, loading=True, min_height=min_height)
+
+    def load():
+        try:
+            with timed_span("page", f"section {title}"):
+                content = build()
+            section.objects = [content]
+        except Exception as e:
+            logger.error(f"Error building {title}: {e}")
+            section.objects = [pn.pane.Markdown(f"Could not load {title}.")]
+        finally:
+            section.loading = False
+            section.min_height = None
+
+    pn.state.onload(load, threaded=pn.config.nthreads is not None)
+    return section
+
+
+@timed("page")
 def create_template_main():
     logger.info("CALLED create_template_main")
 
     wasm = is_WASM()
     depth_panel = create_chart_frost_max_depth(wasm)
     span_panel = create_chart_frost_span(wasm)
-    freeze_thaw_charts_gridbox = create_chart_freeze_thaw(wasm)
-    ely_aggregate_row = create_chart_ely_aggregate(wasm)
+    freeze_thaw_charts_gridbox = create_deferred_section(
+        "freeze and thaw charts", lambda: create_chart_freeze_thaw(wasm)
+    )
+    ely_aggregate_row = create_deferred_section(
+        "Ely aggregate chart", lambda: create_chart_ely_aggregate(wasm)
+    )
     # loading_charts_gridbox = create_chart_cold_loading(wasm)
-    loading_vs_frost_charts_gridbox = create_chart_cold_loading_vs_frost_depth(wasm)
+    loading_vs_frost_charts_gridbox = create_deferred_section(
+        "cold loading vs frost depth charts",
+        lambda: create_chart_cold_loading_vs_frost_depth(wasm),
+    )
 
     top_row = pn.Row(depth_panel, span_panel)
 
@@ -1256,6 +1743,7 @@ def create_template_main():
     return main_column
 
 
+@timed("page")
 def create_dashboard():
     """Create a Panel dashboard."""
     logger.info("CALLED create_dashboard()")
@@ -1263,6 +1751,8 @@ def create_dashboard():
     title_string = "Freeze Tracker Dashboard"
     template_sidebar = create_template_sidebar()
     template_main = create_template_main()
+    if is_admin_session():
+        template_main.append(create_pane_admin_timings())
     header_extension_pane = create_pane_github_icon()
 
     panel_dashboard_template = pn.template.FastListTemplate(
@@ -1272,12 +1762,35 @@ def create_dashboard():
         header=header_extension_pane,  # will be added to default header
     )
 
+    logger.info(f"Data cache stats: {get_data_cache_stats()}")
+    logger.info(f"Shared tables: {get_shared_tables().stats()}")
+    logger.info(f"Stage timings: {get_stage_timings_summary()[:5]}")
     return panel_dashboard_template
 
 
+def get_chart_backends() -> list:
+    """Return the holoviews backends to load: bokeh, plus any requested in the environment"""
+    requested = os.environ.get("FREEZE_TRACKER_CHART_BACKENDS", "")
+    backends = default_chart_backends + [b.strip() for b in requested.split(",") if b.strip()]
+    return list(dict.fromkeys(backends))
+
+
+def configure_app(chart_backends=None):
+    """Set up logging and load the chart and Panel extensions (deferred until the app runs)"""
+    import holoviews as hv
+
+    get_logger("app")
+    hv.extension(*(chart_backends or get_chart_backends()))
+    pn.extension(sizing_mode="stretch_width")
+    if pn.config.nthreads is None and is_deferred_loading() and not is_pyodide():
+        # Once per process: later sessions see the pool already set
+        pn.config.nthreads = default_num_threads
+
+
 def main():
     """Main function. Creates a Panel dashboard,
     sets up periodic updates, and flags the dashboard as servable"""
+    configure_app()
     logger.info("CALLED main()")
 
     dashboard = create_dashboard()
@@ -1286,4 +1799,7 @@ def main():
     dashboard.servable()
 
 
-main()
+# Run under panel serve (module name bokeh_app_...), python app.py, and pyodide (__main__),
+# but not on a plain import (e.g. bench_import_time.py)
+if __name__ == "__main__" or __name__.startswith("bokeh"):
+    main()
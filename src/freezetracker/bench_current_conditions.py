@@ -0,0 +1,136 @@
+"""
+Compare per-session current temperature lookups with the shared CurrentConditionsService.
+
+A local HTTP server stands in for api.openweathermap.org. It answers
+/data/2.5/weather?lat=..&lon=.. with {"main": {"temp": ...}} after an injected delay,
+and never answers for stations listed with --hang (to exercise the request timeout).
+
+    serial      what each new session used to do: one blocking request per station
+    cold        first get_temperatures() on an empty cache (returns at once, all None)
+    refresh     one concurrent refresh of every station (bounded by the timeout)
+    warm        get_temperatures() from the cache, as every later session does
+
+In the src/freezetracker folder, run:
+
+    python bench_current_conditions.py
+    python bench_current_conditions.py --latency-ms 300 --stations 10 --hang S03
+
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from freezetracker.current_conditions import CurrentConditionsService
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Answer OpenWeatherMap-style requests with a made-up temperature after a delay"""
+
+    protocol_version = "HTTP/1.1"
+    latency_s = 0.0
+    hang_lats = set()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        lat = float(query["lat"][0])
+        lon = float(query["lon"][0])
+        time.sleep(self.latency_s)
+        if lat in self.hang_lats:
+            time.sleep(60)
+        body = json.dumps({"main": {"temp": round(lat - lon / 10, 1)}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency_ms, hang_lats):
+    """Start the stub server on a free port and return (server, weather_url)"""
+    StubWeatherHandler.latency_s = latency_ms / 1000.0
+    StubWeatherHandler.hang_lats = set(hang_lats)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/data/2.5/weather"
+
+
+def make_stations(n_stations) -> dict:
+    return {f"S{i:02d}": {"lat": 45.0 + i / 100, "lon": -92.0} for i in range(n_stations)}
+
+
+def get_temperatures_serial(url, stations) -> dict:
+    """The old per-session lookup: one blocking request per station (timeout added)"""
+    temps = {}
+    for code, station in stations.items():
+        params = {"lat": station["lat"], "lon": station["lon"], "appid": "stub"}
+        try:
+            temps[code] = requests.get(url, params=params, timeout=5).json()["main"]["temp"]
+        except requests.exceptions.RequestException:
+            temps[code] = None
+    return temps
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--stations", type=int, default=2)
+    parser.add_argument("--timeout-s", type=float, default=2.0)
+    parser.add_argument("--hang", nargs="*", default=[], help="station codes that never answer")
+    parser.add_argument("--sessions", type=int, default=100, help="warm lookups to time")
+    args = parser.parse_args()
+
+    stations = make_stations(args.stations)
+    hang_lats = [stations[code]["lat"] for code in args.hang if code in stations]
+    server, url = start_stub_server(args.latency_ms, hang_lats)
+    try:
+        live = {code: s for code, s in stations.items() if s["lat"] not in hang_lats}
+        serial_s, _ = time_call(lambda: get_temperatures_serial(url, live))
+
+        service = CurrentConditionsService(
+            "stub", stations, base_url=url, timeout_seconds=args.timeout_s
+        )
+        cold_s, cold = time_call(service.get_temperatures)
+        while service.refreshing:
+            time.sleep(0.01)
+        service.refreshed_at = None
+        refresh_s, fetched = time_call(service.refresh)
+        warm_s, _ = time_call(lambda: [service.get_temperatures() for _ in range(args.sessions)])
+        temps = service.get_temperatures()
+    finally:
+        server.shutdown()
+
+    results = {
+        "stations": args.stations,
+        "hanging": len(hang_lats),
+        "latency_ms": args.latency_ms,
+        "timeout_s": args.timeout_s,
+        "serial_s_without_hanging": round(serial_s, 3),
+        "cold_get_ms": round(cold_s * 1000, 2),
+        "cold_values": sum(v is not None for v in cold.values()),
+        "refresh_s": round(refresh_s, 3),
+        "refreshed": len(fetched),
+        "warm_get_ms": round(warm_s * 1000 / args.sessions, 4),
+        "values": sum(v is not None for v in temps.values()),
+        "service": service.stats(),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
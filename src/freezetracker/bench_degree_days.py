@@ -0,0 +1,117 @@
+"""
+Benchmark the degree-day kernel (degree_days.py) against the groupby code it replaced.
+
+Both run on synthetic daily means (see synthetic_data.py) for every station at once,
+in long form (one row per station and day, sums reset each July 1 and each station).
+The results are checked to be equal before timing.
+
+    groupby     COLD_F / HOT_F, then three groupby passes (INDEX and the two cumulative sums)
+    kernel      add_degree_days (DataFrame API), same two indices
+    kernel_3    add_degree_days with a third index (thawing index at 29 F)
+    array       compute_degree_days on a (stations x days) array, same two indices
+
+In the src/freezetracker folder, run:
+
+    python bench_degree_days.py
+    python bench_degree_days.py --stations 10 100 1000 --winters 13 --repeat 5
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from freezetracker import synthetic_data
+from freezetracker.degree_days import (
+    add_degree_days,
+    compute_degree_days,
+    default_degree_day_indices,
+)
+
+mndot_indices = dict(default_degree_day_indices, HOT_29_F={"kind": "thawing", "base": 29.0})
+
+
+def make_daily_means(n_stations, n_winters, seed):
+    """Long daily means for every station, in station then date order"""
+    dfs = []
+    for station in synthetic_data.get_station_codes(n_stations):
+        df = synthetic_data.generate_daily_temps(station, n_winters, seed)
+        df.insert(0, "CITY", station)
+        dfs.append(df)
+    df = pd.concat(dfs, ignore_index=True)
+    df["SEASON"] = df["IYEAR"] - (df["IMONTH"] < 7).astype(int)
+    return df
+
+
+def add_degree_days_groupby(df: pd.DataFrame) -> pd.DataFrame:
+    """The per-column groupby implementation the make years scripts used before the kernel"""
+    df = df.copy()
+    temps = df["AVG_DAILY_TEMP_F"].astype(float).round()
+    start_row = (df["CITY"] != df["CITY"].shift()) | ((df["IMONTH"] == 7) & (df["IDAY"] == 1))
+    df["COLD_F"] = (round(32.0 - temps)).clip(lower=0)
+    df["HOT_F"] = (round(temps - 32.0)).clip(lower=0)
+    df["INDEX"] = df.groupby(start_row.cumsum()).cumcount()
+    df["CUMM_COLD_F"] = df.groupby(start_row.cumsum())["COLD_F"].cumsum()
+    df["CUMM_HOT_F"] = df.groupby(start_row.cumsum())["HOT_F"].cumsum()
+    return df
+
+
+def time_best(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def run_size(n_stations, n_winters, repeat, seed):
+    df = make_daily_means(n_stations, n_winters, seed)
+    segment_columns = ["CITY", "SEASON"]
+
+    # Every station shares the same days, so they also fit a (stations x days) array
+    temps = df["AVG_DAILY_TEMP_F"].to_numpy().reshape(n_stations, -1)
+    first_station = df.iloc[: temps.shape[1]]
+    season_starts = (first_station["SEASON"].diff() != 0).to_numpy()
+
+    expected = add_degree_days_groupby(df)
+    actual = add_degree_days(df, segment_columns=segment_columns)
+    array = compute_degree_days(temps, season_starts)
+    for column in ["INDEX", "COLD_F", "HOT_F", "CUMM_COLD_F", "CUMM_HOT_F"]:
+        np.testing.assert_array_equal(actual[column].to_numpy(), expected[column].to_numpy())
+        np.testing.assert_array_equal(array[column].reshape(-1), expected[column].to_numpy())
+
+    timings = {
+        "groupby": time_best(lambda: add_degree_days_groupby(df), repeat),
+        "kernel": time_best(lambda: add_degree_days(df, segment_columns=segment_columns), repeat),
+        "kernel_3": time_best(
+            lambda: add_degree_days(df, mndot_indices, segment_columns=segment_columns), repeat
+        ),
+        "array": time_best(lambda: compute_degree_days(temps, season_starts), repeat),
+    }
+    baseline = timings["groupby"]
+    for name, seconds in timings.items():
+        print(
+            f"{name:<10}{n_stations:>8} st{n_winters:>5} w{len(df):>12,} rows"
+            f"{seconds:>10.4f} s{baseline / seconds:>8.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the degree-day kernel")
+    parser.add_argument("--stations", type=int, nargs="+", default=[2, 100])
+    parser.add_argument("--winters", type=int, nargs="+", default=[13])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("Best of", args.repeat, "runs; speedup is groupby time / time")
+    for n_winters in args.winters:
+        for n_stations in args.stations:
+            run_size(n_stations, n_winters, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure time to first paint of the dashboard: how long panel serve takes to answer
+the page request, with the heavy sections deferred (the default) and built up front.
+
+app.py is served in this process on a free port. Each GET builds a new session and
+returns the page shell; deferred sections are built only once a browser connects,
+so they are not part of the response. Sessions are timed one after another.
+
+    deferred    FREEZE_TRACKER_DEFER_SECTIONS=1: shell, sidebar, max depth and span charts
+    upfront     FREEZE_TRACKER_DEFER_SECTIONS=0: every chart, as before deferred loading
+
+In the src/freezetracker folder, run:
+
+    python bench_first_paint.py
+    python bench_first_paint.py --sessions 10
+
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import threading
+import time
+
+import panel as pn
+import requests
+
+
+def time_sessions(url, n_sessions) -> list:
+    """GET the page n_sessions times; return each response time in ms"""
+    times = []
+    for _ in range(n_sessions):
+        start = time.perf_counter()
+        response = requests.get(url, timeout=600)
+        response.raise_for_status()
+        if "Freeze Tracker Dashboard" not in response.text:
+            raise RuntimeError(f"{url} did not return the dashboard (see app.log)")
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summarize(times) -> dict:
+    return {
+        "sessions": len(times),
+        "first_ms": round(times[0], 1),
+        "p50_ms": round(statistics.median(times), 1),
+        "max_ms": round(max(times), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=5)
+    args = parser.parse_args()
+
+    app_path = str(pathlib.Path(__file__).with_name("app.py"))
+    server = pn.serve({"app": app_path}, port=0, show=False, start=False)
+    server.start()
+    threading.Thread(target=server.io_loop.start, daemon=True).start()
+    url = f"http://127.0.0.1:{server.port}/app"
+
+    results = {}
+    try:
+        for mode, value in [("upfront", "0"), ("deferred", "1")]:
+            os.environ["FREEZE_TRACKER_DEFER_SECTIONS"] = value
+            results[mode] = summarize(time_sessions(url, args.sessions))
+    finally:
+        server.io_loop.add_callback(server.stop)
+
+    results["speedup_p50"] = round(results["upfront"]["p50_ms"] / results["deferred"]["p50_ms"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compare the frost span chart built from one Segments and one Labels element with the
+per-winter Overlay it replaced (one Segments and two Text elements per span).
+
+Spans come from synthetic frost readings (see synthetic_data.py), one per winter.
+For each size, both charts are built and rendered to a bokeh figure:
+
+    build_ms        holoviews elements and overlay
+    render_ms       hv.render to a bokeh figure
+    renderers       glyph renderers in the figure
+    models          bokeh models in the document
+    doc_kb          size of the serialized document (JSON)
+
+In the src/freezetracker folder, run:
+
+    python bench_frost_span.py
+    python bench_frost_span.py --spans 20 200 2000 --repeat 3
+
+"""
+
+import argparse
+import json
+import time
+
+from freezetracker import app, synthetic_data
+
+
+def create_hv_segments_per_span(df):
+    """The per-row code create_chart_frost_span used before (one overlay per span)"""
+    import holoviews as hv
+
+    hv_segments = []
+    for idx, row in df.iterrows():
+        start_text = hv.Text(
+            row["days_after_Jul_1"],
+            row["Winter"],
+            "{:%b %d}  ".format(row["Frost_Start"]),
+            halign="right",
+            fontsize=8,
+        )
+        end_text = hv.Text(
+            row["days_after_Jul_1"] + row["Duration_days"],
+            row["Winter"],
+            "  {:%b %d}".format(row["Frost_End"]),
+            halign="left",
+            fontsize=8,
+        )
+        segment = hv.Segments(
+            [
+                {
+                    "x0": row["days_after_Jul_1"],
+                    "x1": row["days_after_Jul_1"] + row["Duration_days"],
+                    "y0": row["Winter"],
+                    "y1": row["Winter"],
+                    "line_color": row["line_color"],
+                    "start_date": row["Frost_Start"].strftime("%Y-%m-%d"),
+                    "end_date": row["Frost_End"].strftime("%Y-%m-%d"),
+                }
+            ],
+            kdims=["x0", "y0", "x1", "y1"],
+            vdims=["line_color", "start_date", "end_date"],
+        )
+        hv_segments.append(segment * start_text * end_text)
+    return hv.Overlay(hv_segments)
+
+
+def create_hv_segments_columnar(df):
+    return app.create_hv_segments(df) * app.create_hv_span_labels(df)
+
+
+def make_span_df(n_spans, seed):
+    frost_df = synthetic_data.generate_frost_depths(n_spans, seed)
+    _, span_df = synthetic_data.summarize_frost_depths(frost_df)
+    return app.prepare_df_frost_span(span_df)
+
+
+def measure(build, df, cmap, repeat) -> dict:
+    import holoviews as hv
+    from bokeh.embed import json_item
+
+    build_s, render_s = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chart = build(df).opts(hv.opts.Segments(color="line_color", cmap=cmap, line_width=10))
+        built = time.perf_counter()
+        figure = hv.render(chart, backend="bokeh")
+        build_s.append(built - start)
+        render_s.append(time.perf_counter() - built)
+    doc_json = json.dumps(json_item(figure))
+    return {
+        "build_ms": round(min(build_s) * 1000, 1),
+        "render_ms": round(min(render_s) * 1000, 1),
+        "renderers": len(figure.renderers),
+        "models": len(figure.references()),
+        "doc_kb": round(len(doc_json) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frost span chart")
+    parser.add_argument("--spans", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app.configure_app()
+    cmap = app.create_custom_colormap_frost_span()
+    results = []
+    for n_spans in args.spans:
+        df = make_span_df(n_spans, args.seed)
+        for name, build in [
+            ("per_span", create_hv_segments_per_span),
+            ("columnar", create_hv_segments_columnar),
+        ]:
+            result = measure(build, df, cmap, args.repeat)
+            results.append({"chart": name, "spans": len(df), **result})
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
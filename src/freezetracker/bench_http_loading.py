@@ -0,0 +1,131 @@
+"""
+Compare serial and batch loading of processed CSV files over HTTP.
+
+A local HTTP server stands in for raw.githubusercontent.com.
+It serves data/2_processed with keep-alive, sends ETags, answers
+If-None-Match with 304, and sleeps before each reply to inject latency.
+
+In the src/freezetracker folder, run:
+
+    python bench_http_loading.py
+    python bench_http_loading.py --latency-ms 150 --workers 16
+
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from freezetracker import data_load
+from freezetracker.common_content import (
+    default_winter_list,
+    get_data_processed_path_from_code_folder,
+)
+from freezetracker.data_cache import get_data_cache
+
+
+class SlowDataHandler(SimpleHTTPRequestHandler):
+    """Serve files with keep-alive, ETags, and an injected delay per request"""
+
+    protocol_version = "HTTP/1.1"
+    latency_s = 0.0
+
+    def send_head(self):
+        time.sleep(self.latency_s)
+        path = self.translate_path(self.path)
+        try:
+            with open(path, "rb") as f:
+                etag = '"' + hashlib.sha1(f.read()).hexdigest() + '"'
+        except OSError:
+            return super().send_head()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        self.etag = etag
+        return super().send_head()
+
+    def end_headers(self):
+        etag = getattr(self, "etag", None)
+        if etag:
+            self.send_header("ETag", etag)
+            self.etag = None
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server(latency_ms):
+    """Start the stand-in server on a free port and return (server, base_url)"""
+    directory = str(get_data_processed_path_from_code_folder(""))
+    handler = partial(SlowDataHandler, directory=directory)
+    SlowDataHandler.latency_s = latency_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def get_cold_loading_file_names():
+    """The 26 daily_temps files the cold loading charts read"""
+    return [
+        f"daily_temps_{winter}_{city}.csv"
+        for winter in default_winter_list
+        for city in ["ely", "orr"]
+    ]
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server, base_url = start_stand_in_server(args.latency_ms)
+    fnames = get_cold_loading_file_names()
+    try:
+        serial_s, _ = time_call(
+            lambda: [data_load.read_data_processed_csv_to_df(True, f, base_url) for f in fnames]
+        )
+        get_data_cache().clear()
+        batch_s, dfs = time_call(
+            lambda: data_load.read_data_processed_csvs_to_dfs(
+                True, fnames, base_url, max_workers=args.workers
+            )
+        )
+        revalidate_s, _ = time_call(
+            lambda: data_load.read_data_processed_csvs_to_dfs(
+                True, fnames, base_url, max_workers=args.workers
+            )
+        )
+    finally:
+        server.shutdown()
+
+    results = {
+        "files": len(fnames),
+        "loaded": sum(df is not None for df in dfs.values()),
+        "latency_ms": args.latency_ms,
+        "workers": args.workers,
+        "serial_s": round(serial_s, 3),
+        "batch_s": round(batch_s, 3),
+        "batch_revalidate_304_s": round(revalidate_s, 3),
+        "speedup": round(serial_s / batch_s, 1),
+        "cache": get_data_cache().stats(),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Report the cold-start import cost of app.py.
+
+Runs `python -X importtime -c "import freezetracker.app"` in a fresh interpreter
+(no main(), no chart extensions) and reports the total import time, the slowest
+modules it imports, and whether any deferred chart libraries were loaded anyway.
+
+In the src/freezetracker folder, run:
+
+    python bench_import_time.py
+    python bench_import_time.py --runs 5 --top 15
+    python bench_import_time.py --max-ms 2500     # exit 1 if the median is slower
+
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+
+# Imported by the chart functions only; none should load on `import freezetracker.app`
+deferred_modules = ["holoviews", "hvplot", "matplotlib", "requests"]
+
+importtime_line = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_importtime(module_name):
+    """Import a module in a new interpreter and return [(name, self_us, cumulative_us, depth)]"""
+    package_path = pathlib.Path(__file__).resolve().parent
+    env = dict(os.environ, PYTHONPATH=str(package_path.parent))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=package_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = importtime_line.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def summarize(rows, top):
+    """Total time, slowest direct imports of the module, and deferred modules that were loaded"""
+    top_level = [row for row in rows if row[3] == 0]
+    direct = [row for row in rows if row[3] == 1]
+    loaded = {name.split(".")[0] for name, _, _, _ in rows}
+    return {
+        "total_ms": round(sum(row[2] for row in top_level) / 1000, 1),
+        "slowest": [
+            {"module": name, "cumulative_ms": round(cumulative_us / 1000, 1)}
+            for name, _, cumulative_us, _ in sorted(direct, key=lambda r: -r[2])[:top]
+        ],
+        "deferred_loaded": sorted(m for m in deferred_modules if m in loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--module", default="freezetracker.app")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median is slower")
+    args = parser.parse_args()
+
+    summaries = [summarize(run_importtime(args.module), args.top) for _ in range(args.runs)]
+    median_ms = round(statistics.median(s["total_ms"] for s in summaries), 1)
+    results = {
+        "module": args.module,
+        "runs": args.runs,
+        "total_ms": [s["total_ms"] for s in summaries],
+        "median_ms": median_ms,
+        "slowest": summaries[-1]["slowest"],
+        "deferred_loaded": summaries[-1]["deferred_loaded"],
+    }
+    print(json.dumps(results, indent=2))
+
+    if results["deferred_loaded"]:
+        sys.exit(f"Deferred modules loaded on import: {results['deferred_loaded']}")
+    if args.max_ms is not None and median_ms > args.max_ms:
+        sys.exit(f"Import took {median_ms} ms (limit {args.max_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()
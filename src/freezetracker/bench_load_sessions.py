@@ -0,0 +1,187 @@
+"""
+Load-test the dashboard as it would be served: start panel serve on app.py with the given
+--num-procs and --num-threads, open many headless Bokeh sessions against it, and report
+session build latency and the memory of each server process.
+
+Each session is a bokeh.client.pull_session: the server runs app.py for a new document
+and sends it back over the websocket. Sessions are opened --concurrency at a time.
+A headless client never reports the document as ready, so deferred sections are not
+built; add --upfront to build every section before the document is sent.
+
+    latency_ms      p50 / p90 / p95 / max time to open a session and receive its document
+    processes       pid and resident memory (MB) of each server process, before and after
+
+Memory is read with psutil if it is installed, otherwise from /proc (Linux).
+--num-procs forks the server and is not supported on Windows.
+
+In the src/freezetracker folder, run:
+
+    python bench_load_sessions.py
+    python bench_load_sessions.py --sessions 200 --concurrency 16 --num-procs 4 --num-threads 4
+
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import panel.models  # noqa: F401  (registers Panel's bokeh models so documents decode)
+import requests
+from bokeh.client import pull_session
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, num_procs, num_threads, upfront) -> subprocess.Popen:
+    """Start panel serve on app.py in a child process"""
+    folder = pathlib.Path(__file__).parent
+    env = dict(os.environ, FREEZE_TRACKER_DEFER_SECTIONS="0" if upfront else "1")
+    command = [
+        sys.executable,
+        "-m",
+        "panel",
+        "serve",
+        "app.py",
+        "--port",
+        str(port),
+        "--num-procs",
+        str(num_procs),
+        "--num-threads",
+        str(num_threads),
+        "--allow-websocket-origin",
+        f"127.0.0.1:{port}",
+    ]
+    return subprocess.Popen(
+        command, cwd=folder, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_until_ready(url, server, timeout_s) -> float:
+    """GET the page until the server answers; return the time of the first session in ms"""
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"panel serve exited with code {server.returncode}")
+        start = time.perf_counter()
+        try:
+            requests.get(url, timeout=timeout_s).raise_for_status()
+            return (time.perf_counter() - start) * 1000
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.25)
+    raise RuntimeError(f"{url} did not answer within {timeout_s} s")
+
+
+def open_session(url) -> float:
+    """Open one headless session, check it holds the dashboard, and return its time in ms"""
+    start = time.perf_counter()
+    with pull_session(url=url) as session:
+        elapsed = (time.perf_counter() - start) * 1000
+        if session.document.title != "Freeze Tracker Dashboard":
+            raise RuntimeError(f"{url} did not return the dashboard (see app.log)")
+    return elapsed
+
+
+def get_process_tree(pid) -> list:
+    """Return the pid of the server and of every process it forked"""
+    try:
+        import psutil
+
+        return [pid] + [child.pid for child in psutil.Process(pid).children(recursive=True)]
+    except ImportError:
+        pass
+    pids = [pid]
+    for stat in pathlib.Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) in pids:
+            pids.append(int(stat.parent.name))
+    return pids
+
+
+def get_rss_mb(pid):
+    """Resident memory of one process in MB (None if it cannot be read)"""
+    try:
+        import psutil
+
+        return round(psutil.Process(pid).memory_info().rss / 2**20, 1)
+    except ImportError:
+        pass
+    try:
+        status = pathlib.Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            return round(int(line.split()[1]) / 1024, 1)
+    return None
+
+
+def get_memory(server) -> dict:
+    return {str(pid): get_rss_mb(pid) for pid in get_process_tree(server.pid)}
+
+
+def summarize(times) -> dict:
+    cuts = statistics.quantiles(times, n=100, method="inclusive")
+    return {
+        "p50_ms": round(statistics.median(times), 1),
+        "p90_ms": round(cuts[89], 1),
+        "p95_ms": round(cuts[94], 1),
+        "max_ms": round(max(times), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--num-procs", type=int, default=1)
+    parser.add_argument("--num-threads", type=int, default=4)
+    parser.add_argument("--upfront", action="store_true", help="build every section up front")
+    parser.add_argument("--timeout-s", type=float, default=600.0)
+    args = parser.parse_args()
+
+    port = get_free_port()
+    url = f"http://127.0.0.1:{port}/app"
+    server = start_server(port, args.num_procs, args.num_threads, args.upfront)
+    try:
+        first_ms = wait_until_ready(url, server, args.timeout_s)
+        memory_before = get_memory(server)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            times = list(executor.map(open_session, [url] * args.sessions))
+        wall_s = time.perf_counter() - start
+        memory_after = get_memory(server)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    results = {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "num_procs": args.num_procs,
+        "num_threads": args.num_threads,
+        "deferred": not args.upfront,
+        "first_session_ms": round(first_ms, 1),
+        "latency": summarize(times),
+        "sessions_per_s": round(args.sessions / wall_s, 2),
+        "rss_mb_before": memory_before,
+        "rss_mb_after": memory_after,
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Time the frost depth nowcast (nowcast.py) for networks of many stations.
+
+Training rows are synthetic probe readings: for each station and winter, measured days
+with CUMM_COLD_F rising through the winter and FROST_DEPTH_in a noisy line of it.
+
+    train_ms        NowcastModel.train over every station and winter (one grouped pass)
+    json_ms         to_dict and from_dict (what script_3 saves and the app reads)
+    predict_ms      one batched predict for every station
+    loop_ms         the same predictions one station at a time, for comparison
+    update_us       one update (a new daily reading for one station)
+
+In the src/freezetracker folder, run:
+
+    python bench_nowcast.py
+    python bench_nowcast.py --stations 100 1000 5000 --winters 13 --repeat 5
+
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from freezetracker.nowcast import NowcastModel
+
+
+def make_training_df(n_stations, n_winters, days_per_winter, seed) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_rows = n_stations * n_winters * days_per_winter
+    stations = np.repeat([f"S{i:04d}" for i in range(n_stations)], n_winters * days_per_winter)
+    slopes = np.repeat(rng.normal(0.021, 0.002, n_stations), n_winters * days_per_winter)
+    cold = rng.uniform(0, 3000, n_rows)
+    days_back = pd.to_timedelta(rng.integers(0, 4000, n_rows), "D")
+    return pd.DataFrame(
+        {
+            "CITY": pd.Categorical(stations),
+            "DATE": pd.Timestamp("2022-04-30") - days_back,
+            "CUMM_COLD_F": cold.astype("float32"),
+            "FROST_DEPTH_in": (20 + slopes * cold + rng.normal(0, 9, n_rows)).astype("float32"),
+            "DEPTH_MEASURED": True,
+        }
+    )
+
+
+def best_ms(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return round(min(seconds) * 1000, 3), result
+
+
+def predict_one_at_a_time(model, stations, cold):
+    return [model.predict([code], [x]) for code, x in zip(stations, cold)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stations", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--winters", type=int, default=13)
+    parser.add_argument("--days", type=int, default=70, help="probe readings per winter")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = []
+    for n_stations in args.stations:
+        df = make_training_df(n_stations, args.winters, args.days, args.seed)
+        train_ms, model = best_ms(lambda: NowcastModel.train(df), args.repeat)
+        json_ms, _ = best_ms(
+            lambda: NowcastModel.from_dict(json.loads(json.dumps(model.to_dict()))), args.repeat
+        )
+        stations = list(model.stations)
+        cold = np.random.default_rng(args.seed).uniform(0, 3000, len(stations))
+        predict_ms, _ = best_ms(lambda: model.predict(stations, cold), args.repeat)
+        loop_ms, _ = best_ms(lambda: predict_one_at_a_time(model, stations, cold), 1)
+
+        n_updates = 10_000
+        codes = [stations[i % len(stations)] for i in range(n_updates)]
+        update_ms, _ = best_ms(
+            lambda: [model.update(code, 1500.0, 50.0) for code in codes], args.repeat
+        )
+        results.append(
+            {
+                "stations": n_stations,
+                "rows": len(df),
+                "train_ms": train_ms,
+                "json_ms": json_ms,
+                "predict_ms": predict_ms,
+                "loop_ms": loop_ms,
+                "update_us": round(update_ms * 1000 / n_updates, 3),
+            }
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
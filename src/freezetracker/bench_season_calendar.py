@@ -0,0 +1,92 @@
+"""
+Benchmark the vectorized season calendar (season_calendar.py) against the per-row
+.apply code it replaced in app.py, on
+
+- the St. Louis County frost readings (data/2_processed/frost_stlouis.csv, about 2,000 rows)
+- a synthetic series of random dates (1,000,000 rows by default)
+
+Both give Winter and days_after_Jul_1 for every row; the results are checked to be equal.
+
+In the src/freezetracker folder, run:
+
+    python bench_season_calendar.py
+    python bench_season_calendar.py --rows 1000000 --repeat 5
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from freezetracker.common_content import (
+    calculate_winter_start_year,
+    get_data_processed_path_from_code_folder,
+)
+from freezetracker.season_calendar import get_days_after_Jul_1, get_winter_names
+
+
+def add_season_columns_apply(dates: pd.Series) -> pd.DataFrame:
+    """The per-row code prepare_df_freeze_thaw used before the season calendar"""
+    start_year = dates.apply(lambda x: calculate_winter_start_year(x))
+    winter = start_year.astype(str) + "-" + (start_year + 1).astype(str)
+    season_start = dates.apply(
+        lambda x: x.replace(year=calculate_winter_start_year(x), month=7, day=1)
+    )
+    days = (dates - season_start).dt.days
+    return pd.DataFrame({"Winter": winter, "days_after_Jul_1": days})
+
+
+def add_season_columns_vectorized(dates: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"Winter": get_winter_names(dates), "days_after_Jul_1": get_days_after_Jul_1(dates)},
+        index=dates.index,
+    )
+
+
+def read_frost_dates() -> pd.Series:
+    f = get_data_processed_path_from_code_folder("frost_stlouis.csv")
+    return pd.to_datetime(pd.read_csv(f, usecols=["Date"])["Date"], format="%Y/%m/%d")
+
+
+def make_random_dates(n_rows, seed) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("1990-01-01").value // 86_400_000_000_000
+    days = rng.integers(start, start + 40 * 365, n_rows)
+    return pd.Series(pd.to_datetime(days, unit="D"))
+
+
+def time_best(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), result
+
+
+def run(name, dates, repeat, apply_repeat):
+    apply_s, expected = time_best(lambda: add_season_columns_apply(dates), apply_repeat)
+    vector_s, actual = time_best(lambda: add_season_columns_vectorized(dates), repeat)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    print(
+        f"{name:<16}{len(dates):>12,} rows   apply {apply_s:>9.4f} s"
+        f"   vectorized {vector_s:>8.4f} s   {apply_s / vector_s:>8.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized season calendar")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic dates")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Best of {args.repeat} runs (per-row apply runs once on the synthetic dates)")
+    run("frost_stlouis", read_frost_dates(), args.repeat, args.repeat)
+    run("synthetic", make_random_dates(args.rows, args.seed), args.repeat, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark reading the daily_temps table from the Parquet store (script_3_make_store.py)
+against reading the per-winter CSV files it replaced:
+
+- csv     26 daily_temps_{winter}_{city}.csv reads, to_datetime, and one concat
+- store   one read of data/2_processed/daily_temps_store (pyarrow)
+
+Each read runs in a new Python process, as on a cold app start, so the store time
+includes importing pyarrow. Both give the same rows; the row counts are checked to match.
+
+In the src/freezetracker folder, run:
+
+    python bench_store.py
+    python bench_store.py --repeat 5
+
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+def read_csv_files():
+    import pandas as pd
+
+    from freezetracker.common_content import (
+        default_winter_list,
+        get_data_processed_path_from_code_folder,
+    )
+
+    dfs = []
+    for winter in default_winter_list:
+        for city in ["ELY", "ORR"]:
+            fname = f"daily_temps_{winter}_{city.lower()}.csv"
+            df = pd.read_csv(get_data_processed_path_from_code_folder(fname))
+            df["CITY"] = city
+            df["Winter"] = winter
+            df["DATE"] = pd.to_datetime(df["DATE"])
+            dfs.append(df)
+    return pd.concat(dfs, ignore_index=True)
+
+
+def read_store():
+    import pandas as pd
+
+    from freezetracker.common_content import get_data_processed_path_from_code_folder
+
+    store_path = get_data_processed_path_from_code_folder("daily_temps_store")
+    return pd.read_parquet(store_path, engine="pyarrow")
+
+
+readers = {"csv": read_csv_files, "store": read_store}
+
+
+def time_in_new_process(method) -> dict:
+    """Run one read in a fresh interpreter (pandas is imported before the clock starts)"""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", method],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_child(method):
+    import pandas  # noqa: F401
+
+    start = time.perf_counter()
+    df = readers[method]()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({"ms": elapsed_ms, "rows": len(df)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the daily_temps store with CSV reads")
+    parser.add_argument("--repeat", type=int, default=3, help="new processes per method")
+    parser.add_argument("--child", choices=list(readers), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.child)
+        return
+
+    results = {}
+    for method in readers:
+        runs = [time_in_new_process(method) for _ in range(args.repeat)]
+        results[method] = {
+            "median_ms": round(statistics.median(run["ms"] for run in runs), 1),
+            "rows": runs[0]["rows"],
+        }
+    if results["csv"]["rows"] != results["store"]["rows"]:
+        sys.exit(f"Row counts differ: {results}")
+    results["speedup"] = round(results["csv"]["median_ms"] / results["store"]["median_ms"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmark the data pipeline and dashboard builders on synthetic data.
+
+For each (stations, winters) size, writes a synthetic tree (see synthetic_data.py)
+to a temporary folder, runs the stages against it, and times them:
+
+    ingest_hourly_to_daily      ingest_stations generate_daily_means, every station
+    read_all_daily_data         ingest_stations read_daily_data and add_season_columns
+    write_yearly_data           ingest_stations write_winter_files, one file per winter
+    freeze_thaw_points          app prepare_freeze_thaw_chart_points
+    frost_join                  app prepare_cold_loading_vs_frost_depth (all winters, as-of)
+    best_fit_lines              app fit_lines on the joined frame (one line per winter)
+    create_chart_*              each app chart builder (data cache cleared first)
+
+Station stages run once per station and report the total and the per-station median.
+App stages chart ELY and ORR only, so they scale with winters; they run --repeat times.
+
+Results are written as JSON (with the git commit) to compare across commits:
+
+In the src/freezetracker folder, run:
+
+    python bench_suite.py
+    python bench_suite.py --stations 2 100 1000 --winters 13 100 --repeat 5
+    python bench_suite.py --compare ../../bench_results/bench_suite_abc1234.json
+
+"""
+
+import argparse
+import json
+import logging
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from freezetracker import app, ingest_stations, synthetic_data
+from freezetracker.common_content import get_data_processed_path_from_code_folder
+from freezetracker.stations import default_source_filter
+
+app_chart_builders = [
+    "create_chart_frost_max_depth",
+    "create_chart_frost_span",
+    "create_chart_freeze_thaw",
+    "create_chart_ely_aggregate",
+    "create_chart_cold_loading",
+    "create_chart_cold_loading_vs_frost_depth",
+]
+
+
+def get_root_path() -> pathlib.Path:
+    return pathlib.Path(__file__).resolve().parent.parent.parent
+
+
+def get_git_commit():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=get_root_path(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def make_result(stage, n_stations, n_winters, seconds, rows=None):
+    """One JSON row: total seconds, plus median/min/max of the individual timings"""
+    return {
+        "stage": stage,
+        "stations": n_stations,
+        "winters": n_winters,
+        "runs": len(seconds),
+        "total_s": round(sum(seconds), 4),
+        "median_s": round(statistics.median(seconds), 4),
+        "min_s": round(min(seconds), 4),
+        "max_s": round(max(seconds), 4),
+        "rows": rows,
+    }
+
+
+def bench_station_stages(n_stations, n_winters, seed):
+    """Time ingestion and season splitting for every station (run in the synthetic tree).
+    Each station gets its own daily_temps_{code}.csv and per-winter files."""
+    stations = synthetic_data.get_station_codes(n_stations)
+    first_winter = synthetic_data.first_winter_start_year
+    winter_years = range(first_winter, first_winter + n_winters)
+
+    timings = {"ingest_hourly_to_daily": [], "read_all_daily_data": [], "write_yearly_data": []}
+    hourly_rows = 0
+    for station in stations:
+        hourly_df = synthetic_data.generate_hourly_temps(station, n_winters, seed)
+        hourly_rows += len(hourly_df)
+        seconds, daily_df = time_call(
+            ingest_stations.generate_daily_means, hourly_df, default_source_filter
+        )
+        timings["ingest_hourly_to_daily"].append(seconds)
+
+        daily_file = ingest_stations.get_daily_file_name(station)
+        daily_df.to_csv(get_data_processed_path_from_code_folder(daily_file), index=False)
+
+        seconds, df = time_call(
+            lambda: ingest_stations.add_season_columns(
+                ingest_stations.read_daily_data(station), station
+            )
+        )
+        timings["read_all_daily_data"].append(seconds)
+        seconds, _ = time_call(ingest_stations.write_winter_files, station, df, winter_years)
+        timings["write_yearly_data"].append(seconds)
+
+    return [
+        make_result(stage, n_stations, n_winters, seconds, hourly_rows)
+        for stage, seconds in timings.items()
+    ]
+
+
+def set_app_winters(n_winters):
+    """Point the app's winter range at the synthetic winters"""
+    app.min_winter_start_year = synthetic_data.first_winter_start_year
+    app.max_winter_start_year = synthetic_data.first_winter_start_year + n_winters - 1
+    app.default_winter_list = synthetic_data.get_winter_names(n_winters)
+
+
+def bench_app_stages(n_stations, n_winters, repeat):
+    """Time the frost join and every chart builder (ELY and ORR, all winters)"""
+    set_app_winters(n_winters)
+    results = []
+    app.prepare_freeze_thaw_chart_points()  # writes frost_stlouis_out.csv for the join
+    joined_df = app.prepare_cold_loading_vs_frost_depth(False)
+    joined_df = joined_df[joined_df["DEPTH_MEASURED"]]
+    stages = [
+        ("freeze_thaw_points", app.prepare_freeze_thaw_chart_points),
+        ("frost_join", lambda: app.prepare_cold_loading_vs_frost_depth(False)),
+        (
+            "best_fit_lines",
+            lambda: app.fit_lines(joined_df, "CUMM_COLD_F", "FROST_DEPTH_in", ["CITY", "Winter"]),
+        ),
+    ] + [(name, lambda name=name: getattr(app, name)(False)) for name in app_chart_builders]
+    for stage, func in stages:
+        seconds = []
+        for _ in range(repeat):
+            app.pn.state.cache.clear()
+            app.get_data_cache().clear()
+            app.get_shared_tables().clear()
+            seconds.append(time_call(func)[0])
+        results.append(make_result(stage, n_stations, n_winters, seconds))
+    return results
+
+
+def run_size(n_stations, n_winters, repeat, seed):
+    """Run every stage for one size in a temporary synthetic tree"""
+    original_cwd = pathlib.Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="freezetracker_bench_") as root:
+        code_path = synthetic_data.write_synthetic_tree(root, n_winters, seed)
+        os.chdir(code_path)
+        try:
+            results = bench_station_stages(n_stations, n_winters, seed)
+            results += bench_app_stages(n_stations, n_winters, repeat)
+        finally:
+            os.chdir(original_cwd)
+    return results
+
+
+def compare_results(old, new):
+    """Print median time per stage and size, old vs new"""
+    old_rows = {(r["stage"], r["stations"], r["winters"]): r for r in old["results"]}
+    matches = [r for r in new["results"] if (r["stage"], r["stations"], r["winters"]) in old_rows]
+    if not matches:
+        print(f"No stages at the same sizes in the {old['commit']} results")
+        return
+    print(f"\nCompared with {old['commit']} (ratio > 1 is slower)")
+    print(f"{'stage':<42}{'stations':>9}{'winters':>8}{'old s':>10}{'new s':>10}{'ratio':>8}")
+    for row in matches:
+        key = (row["stage"], row["stations"], row["winters"])
+        old_s, new_s = old_rows[key]["median_s"], row["median_s"]
+        ratio = new_s / old_s if old_s else float("nan")
+        print(f"{key[0]:<42}{key[1]:>9}{key[2]:>8}{old_s:>10.4f}{new_s:>10.4f}{ratio:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--stations", type=int, nargs="+", default=[2])
+    parser.add_argument("--winters", type=int, nargs="+", default=[13])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="JSON file (default bench_results/...)")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to compare with")
+    args = parser.parse_args()
+
+    # The pipeline logs every file it writes; keep the benchmark output readable
+    logging.disable(logging.INFO)
+    app.configure_app()
+
+    commit = get_git_commit()
+    results = []
+    for n_winters in args.winters:
+        for n_stations in args.stations:
+            print(f"Running {n_stations} stations x {n_winters} winters")
+            results += run_size(n_stations, n_winters, args.repeat, args.seed)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    out_path = pathlib.Path(args.out) if args.out else (
+        get_root_path().joinpath("bench_results").joinpath(f"bench_suite_{commit}.json")
+    )
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2))
+
+    for row in results:
+        print(
+            f"{row['stage']:<42}{row['stations']:>6} st{row['winters']:>5} w"
+            f"{row['total_s']:>10.3f} s total{row['median_s']:>10.4f} s median"
+        )
+    print(f"Wrote {out_path}")
+
+    if args.compare:
+        compare_results(json.loads(pathlib.Path(args.compare).read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
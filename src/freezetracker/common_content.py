@@ -0,0 +1,53 @@
+"""
+Common content shared by the scripts and data load modules.
+
+app.py imports this content; script_5_make_wasm_app.py vendors it (and the other
+freezetracker modules app.py uses) into the single-file WASM build.
+"""
+
+import pathlib
+from datetime import datetime
+
+import pandas as pd
+
+min_winter_start_year = 2010
+max_winter_start_year = 2022  # 2022-2023 is the most recent winter
+
+default_city_list = ["ELY", "ORR"]
+default_winter_list = [
+    f"{startYear}-{startYear+1}"
+    for startYear in range(min_winter_start_year, max_winter_start_year + 1)
+]
+
+
+def calculate_winter_start_year(date_str) -> int:
+    """Calculate the winter start year based on the date
+    Winter is defined as July 1 to June 30.
+    If July or later, then the winter start year is the current year.
+    Jan-Jun, then the winter start year is the previous year.
+    @returns the winter start year as an int"""
+    date = pd.to_datetime(date_str)
+    if date.month >= 7:
+        return date.year
+    else:
+        return date.year - 1
+
+
+def get_data_processed_path_from_code_folder(fname):
+    pkg_path = pathlib.Path.cwd()
+    src_path = pkg_path.parent
+    root_path = src_path.parent
+    data_path = root_path.joinpath("data")
+    processed_data_path = data_path.joinpath("2_processed")
+    processed_file_path = processed_data_path.joinpath(fname)
+    return processed_file_path
+
+
+def get_days_after_Jul_1_from_date_string(date_string):
+    """Return the number of days after July 1 for the given date string
+    @param date_string: a date string that can be parsed by pd.to_datetime
+    @return: the number of days after July 1"""
+    date = pd.to_datetime(date_string)
+    start_year = calculate_winter_start_year(date)
+    today_days_after_Jul_1 = (date - datetime(start_year, 7, 1)).days
+    return today_days_after_Jul_1
@@ -33,7 +33,7 @@ import pathlib
 
 def get_basename(path):
     """Return the basename of a file path"""
-    bname = pathlib.Path(path).basename()
+    bname = pathlib.Path(path).name
     return bname
 
 
@@ -43,7 +43,8 @@ def get_logger(logger_name, log_file="app.log", log_level=logging.INFO):
     logger.setLevel(log_level)
 
     # Create a file handler for writing logs to a file
-    file_handler = logging.FileHandler(log_file)
+    # (opened on the first message, so importing a module that has a logger creates no file)
+    file_handler = logging.FileHandler(log_file, delay=True)
     file_handler.setLevel(log_level)
 
     # Create a console handler for printing logs to the console
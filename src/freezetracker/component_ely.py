@@ -11,10 +11,13 @@ Data files are stored in:
 ../data/2_processed/folder
 
 For example:
-daily_temps_2011-2012.csv (July 1, 2011 - June 30, 2012)
+daily_temps_2011-2012_ely.csv (July 1, 2011 - June 30, 2012)
+
+The files are read once per process (pn.state.as_cached) and the combined frame is
+shared read-only; each session builds its own figures and panes from it, so the
+component can be served with --num-threads or --num-procs.
 
 """
-import configparser
 import pathlib
 
 import pandas as pd
@@ -31,7 +34,7 @@ def get_data_frame(yearString):
         data_path = root_path.joinpath("data")
         processed_data_path = data_path.joinpath("2_processed")
         fn_start = "daily_temps"
-        data_filename_processed = fn_start + "_" + yearString + ".csv"
+        data_filename_processed = fn_start + "_" + yearString + "_ely.csv"
         f = processed_data_path.joinpath(data_filename_processed)
         print(f"Reading to processed data file {f}")
         df = pd.read_csv(f)
@@ -43,30 +46,51 @@ def get_data_frame(yearString):
         print(f"Error reading data file: {e}")
 
 
-def read_config():
-    """Read the configuration file"""
-    print("Reading config file")
-    config = configparser.ConfigParser()
-    config.read("config.ini")
-    print(f"Config file has sections: {config.sections()}")
-    return config
+def load_combined_df():
+    """Read every winter into one data frame (Days counted from July 1)"""
+    dfs = []
+
+    # Loop over years and read each winter's file
+    for startYear in range(2010, 2023):
+        dfs.append(get_data_frame(f"{startYear}-{startYear+1}"))
+    print("FINISHED reading visualization input files")
+
+    # Concatenate all dataframes into one
+    combined_df = pd.concat(dfs)
+
+    # Ensure the 'DATE' column has a consistent data type
+    combined_df["DATE"] = pd.to_datetime(combined_df["DATE"])
+
+    # Reset index to start from July 1
+    combined_df["Days"] = (
+        combined_df["DATE"]
+        - pd.to_datetime(combined_df["IYEAR"].astype(str) + "-07-01", format="%Y-%m-%d")
+    ).dt.days
+    return combined_df
+
+
+def get_combined_df():
+    """Return the combined frame, read once per process and shared by every session.
+    Treat it as read-only."""
+    return pn.state.as_cached("freezetracker_ely_combined_df", load_combined_df)
 
 
-def plot_cumulative_data(names, cumulative_types):
+def plot_cumulative_data(combined_df, names, cumulative_types):
     # Check if the provided cumulative types are valid
     valid_cumulative_types = ["CUMM_COLD_F", "CUMM_HOT_F"]
     if not set(cumulative_types).issubset(valid_cumulative_types):
         raise ValueError("Invalid cumulative_types. Choose from 'CUMM_COLD_F', 'CUMM_HOT_F'.")
 
     filtered_df = combined_df[combined_df["NAME"].isin(names)]
-    # Create a new DataFrame with columns for 'INDEX', 'Value', 'NAME', and 'Type'
-    plot_df = pd.DataFrame(columns=["INDEX", "Value", "NAME", "Type"])
+    # Stack the selected columns as 'INDEX', 'Value', 'NAME', and 'Type'
+    plot_dfs = []
 
     for cumulative_type in cumulative_types:
         temp_df = filtered_df[["INDEX", cumulative_type, "NAME"]].copy()
         temp_df.columns = ["INDEX", "Value", "NAME"]
         temp_df["Type"] = cumulative_type
-        plot_df = plot_df._append(temp_df)
+        plot_dfs.append(temp_df)
+    plot_df = pd.concat(plot_dfs)
 
     fig = px.line(
         plot_df,
@@ -83,32 +107,8 @@ def plot_cumulative_data(names, cumulative_types):
 
 
 def create_ely_aggregate():
-    global config
-    config = read_config()
-    dfs = []
-    global combined_df
-
-    # Loop over years and write yearly data to separate files
-    for startYear in range(2010, 2023):
-        dfs.append(get_data_frame(f"{startYear}-{startYear+1}"))
-        print("FINISHED reading visualization input files")
-
-    # Concatenate all dataframes into one
-    combined_df = pd.concat(dfs)
-
-    # Ensure the 'DATE' column has a consistent data type
-    combined_df["DATE"] = pd.to_datetime(combined_df["DATE"])
-
-    # Reset index to start from July 1
-    combined_df["Days"] = (
-        combined_df["DATE"]
-        - pd.to_datetime(combined_df["IYEAR"].astype(str) + "-07-01", format="%Y-%m-%d")
-    ).dt.days
-
-    # Call the new function with the desired names and cumulative_type
-    names_to_show = ["2019-2020", "2020-2021", "2021-2022", "2022-2023"]
-    cumulative_types = ["CUMM_COLD_F", "CUMM_HOT_F"]
-    plot_cumulative_data(names_to_show, cumulative_types)
+    """Build a new component for each session from the shared frame"""
+    combined_df = get_combined_df()
 
     figCold = px.line(
         combined_df,
@@ -134,5 +134,5 @@ def create_ely_aggregate():
 
 
 if __name__ == "__main__":
-    ely_aggregate = create_ely_aggregate()
-    pn.serve(ely_aggregate, port=5006, show=True)
+    # Pass the function, not a built component, so sessions do not share panes
+    pn.serve(create_ely_aggregate, port=5006, show=True)
@@ -0,0 +1,205 @@
+"""
+Current temperatures for every configured station, shared by all dashboard sessions.
+
+CurrentConditionsService fetches all stations from OpenWeatherMap at once (one thread
+per station, each request with a timeout) and keeps the results for ttl_seconds.
+Sessions read the cached values and never wait on the network:
+
+    service = CurrentConditionsService(api_key, stations)
+    temps = service.get_temperatures()   # {"ELY": -4.3, "ORR": None, ...}
+
+get_temperatures() returns what is cached and, if it is older than the TTL, starts a
+refresh in a background thread. Only one refresh runs at a time, and a station that
+fails keeps its last good value. The dashboard calls it from one scheduled task per
+process (see shared_feeds.py).
+
+The API key is read from config.ini once, when the service is created.
+get_current_conditions_service() keeps one service per process for the dashboard.
+base_url lets a local stub server stand in for api.openweathermap.org
+(see bench_current_conditions.py).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from freezetracker.common_logger import get_logger
+from freezetracker.data_load import is_pyodide
+from freezetracker.data_load_config import read_config
+from freezetracker.stations import get_station_registry
+from freezetracker.timing import timed
+
+logger = get_logger("current_conditions")
+
+open_weather_map_url = "https://api.openweathermap.org/data/2.5/weather"
+
+# Temperatures older than this are fetched again (OpenWeatherMap updates about every 10 min)
+current_conditions_ttl_seconds = 600
+
+# Connect and read timeout for each request
+current_conditions_timeout_seconds = 5.0
+
+
+def read_open_weather_map_api_key(is_wasm, config_reader=read_config):
+    """Return OPEN_WEATHER_MAP_API_KEY from the [api] section of config.ini, or None
+    @param config_reader: reads config.ini given is_wasm (app.py passes its bundle reader)"""
+    config = config_reader(is_wasm)
+    if config is None or not config.has_option("api", "OPEN_WEATHER_MAP_API_KEY"):
+        logger.warning("No OPEN_WEATHER_MAP_API_KEY in config.ini; current temperatures are off")
+        return None
+    return config.get("api", "OPEN_WEATHER_MAP_API_KEY")
+
+
+class CurrentConditionsService:
+    """Latest temperature (F) per station, fetched concurrently and cached for ttl_seconds"""
+
+    def __init__(
+        self,
+        api_key,
+        stations,
+        base_url=None,
+        ttl_seconds=current_conditions_ttl_seconds,
+        timeout_seconds=current_conditions_timeout_seconds,
+        session=None,
+    ):
+        """@param stations: station code -> {"lat": ..., "lon": ...}
+        @param base_url: weather endpoint (a local stub server in tests)"""
+        self.api_key = api_key
+        self.stations = stations
+        self.url = base_url or open_weather_map_url
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self.session = session or requests.Session()
+        self.temperatures = {}  # code -> temperature F
+        self.refreshed_at = None  # time.monotonic() of the last refresh
+        self.refreshing = False
+        self.lock = threading.Lock()
+        self.refreshes = 0
+        self.failures = 0
+
+    def fetch_temperature(self, code) -> float:
+        """GET the current temperature for one station (raises on HTTP errors and timeouts)"""
+        if not self.api_key:
+            raise ValueError("no OpenWeatherMap API key")
+        station = self.stations[code]
+        params = {
+            "lat": station["lat"],
+            "lon": station["lon"],
+            "appid": self.api_key,
+            "units": "imperial",
+        }
+        response = self.session.get(self.url, params=params, timeout=self.timeout_seconds)
+        response.raise_for_status()
+        return float(response.json()["main"]["temp"])
+
+    def try_fetch_temperature(self, code):
+        try:
+            return self.fetch_temperature(code)
+        except Exception as e:
+            logger.error(f"Error getting temperature for {code}: {e}")
+            return None
+
+    @timed("load")
+    def refresh(self) -> dict:
+        """Fetch every station at once and update the cache.
+        @return: the temperatures fetched (stations that failed are left out)"""
+        codes = list(self.stations)
+        if is_pyodide() or len(codes) < 2:
+            results = {code: self.try_fetch_temperature(code) for code in codes}
+        else:
+            with ThreadPoolExecutor(max_workers=len(codes)) as executor:
+                futures = {
+                    code: executor.submit(self.try_fetch_temperature, code) for code in codes
+                }
+            results = {code: future.result() for code, future in futures.items()}
+
+        fetched = {code: temp for code, temp in results.items() if temp is not None}
+        with self.lock:
+            self.temperatures.update(fetched)
+            self.refreshed_at = time.monotonic()
+            self.refreshes += 1
+            self.failures += len(codes) - len(fetched)
+        logger.info(f"Refreshed current temperatures for {len(fetched)} of {len(codes)} stations")
+        return fetched
+
+    def is_stale(self) -> bool:
+        with self.lock:
+            return (
+                self.refreshed_at is None
+                or time.monotonic() - self.refreshed_at >= self.ttl_seconds
+            )
+
+    def run_refresh(self):
+        try:
+            self.refresh()
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+    def refresh_in_background(self) -> bool:
+        """Start a refresh if the cache is stale and none is running.
+        @return: True if a refresh was started"""
+        if not self.is_stale():
+            return False
+        with self.lock:
+            if self.refreshing:
+                return False
+            self.refreshing = True
+        if is_pyodide():
+            # No threads in the browser; one session, so refresh in place
+            self.run_refresh()
+        else:
+            thread = threading.Thread(target=self.run_refresh, name="conditions", daemon=True)
+            thread.start()
+        return True
+
+    def get_temperatures(self) -> dict:
+        """Return the cached temperature per station (None until fetched) without waiting;
+        start a background refresh if the cache is stale"""
+        self.refresh_in_background()
+        with self.lock:
+            return {code: self.temperatures.get(code) for code in self.stations}
+
+    def stats(self) -> dict:
+        with self.lock:
+            age_s = None if self.refreshed_at is None else time.monotonic() - self.refreshed_at
+            return {
+                "stations": len(self.stations),
+                "cached": len(self.temperatures),
+                "age_s": None if age_s is None else round(age_s, 1),
+                "ttl_s": self.ttl_seconds,
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+            }
+
+
+def make_current_conditions_service(
+    is_wasm, base_url=None, config_reader=read_config, **kwargs
+) -> CurrentConditionsService:
+    """Service for every station in the registry (stations.py) that has coordinates"""
+    stations = {
+        code: {"lat": station["lat"], "lon": station["lon"]}
+        for code, station in get_station_registry().items()
+        if station.get("lat") is not None and station.get("lon") is not None
+    }
+    api_key = read_open_weather_map_api_key(is_wasm, config_reader)
+    return CurrentConditionsService(api_key, stations, base_url=base_url, **kwargs)
+
+
+shared_services = {}  # base_url -> CurrentConditionsService
+shared_services_lock = threading.Lock()
+
+
+def get_current_conditions_service(
+    is_wasm, base_url=None, config_reader=read_config, **kwargs
+) -> CurrentConditionsService:
+    """Return the process-wide service for an endpoint, made on first use
+    (so config.ini is read once, not once per dashboard session)"""
+    with shared_services_lock:
+        service = shared_services.get(base_url)
+        if service is None:
+            service = make_current_conditions_service(is_wasm, base_url, config_reader, **kwargs)
+            shared_services[base_url] = service
+    return service
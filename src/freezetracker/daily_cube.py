@@ -0,0 +1,209 @@
+"""
+Binary store of the per-season daily arrays as memory-mapped NumPy cubes.
+
+Written by the make years scripts into:
+
+/data/2_processed/daily_cube/index.json          station and winter codes -> indices
+/data/2_processed/daily_cube/AVG_DAILY_TEMP_F.npy
+/data/2_processed/daily_cube/COLD_F.npy
+/data/2_processed/daily_cube/HOT_F.npy
+/data/2_processed/daily_cube/CUMM_COLD_F.npy
+/data/2_processed/daily_cube/CUMM_HOT_F.npy
+/data/2_processed/daily_cube/STEFAN_DEPTH_in.npy   frost depth model (frost_model.py)
+
+Each .npy file is a float32 cube indexed [station, winter, day_of_season]
+with 366 days per winter (day 0 is July 1). Days without data are NaN.
+
+Stations are written in place through the memory maps (update_daily_cube_stations);
+the files are only reallocated when a new station or winter is added.
+
+Open with open_daily_cube() and slice without copying, e.g.
+
+    cube = open_daily_cube()
+    ely_cold = cube.get("CUMM_COLD_F", station="ELY")               # [winter, day]
+    all_cold_2022 = cube.get("CUMM_COLD_F", winter="2022-2023")     # [station, day]
+
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from freezetracker.common_content import get_data_processed_path_from_code_folder
+from freezetracker.common_logger import get_logger
+from freezetracker.season_calendar import get_days_after_Jul_1, get_winter_names
+
+logger = get_logger("daily_cube")
+
+cube_folder_name = "daily_cube"
+cube_fields = [
+    "AVG_DAILY_TEMP_F",
+    "COLD_F",
+    "HOT_F",
+    "CUMM_COLD_F",
+    "CUMM_HOT_F",
+    "STEFAN_DEPTH_in",
+]
+days_per_season = 366
+
+
+class DailyCube:
+    """Memory-mapped cubes, one per field, with the index that names their axes"""
+
+    def __init__(self, index, arrays):
+        self.index = index
+        self.arrays = arrays
+        self.stations = {code: i for i, code in enumerate(index["stations"])}
+        self.winters = {name: i for i, name in enumerate(index["winters"])}
+
+    def get(self, field, station=None, winter=None) -> np.ndarray:
+        """Return a view of a field, optionally for one station and/or one winter"""
+        cube = self.arrays[field]
+        if station is not None:
+            cube = cube[self.stations[station]]
+            if winter is not None:
+                return cube[self.winters[winter]]
+            return cube
+        if winter is not None:
+            return cube[:, self.winters[winter]]
+        return cube
+
+    def to_df(self, fields, station) -> pd.DataFrame:
+        """Return one station as a long data frame (NAME, INDEX, fields) for charting"""
+        n_winters = len(self.winters)
+        df = pd.DataFrame(
+            {
+                "NAME": np.repeat(self.index["winters"], days_per_season),
+                "INDEX": np.tile(np.arange(days_per_season), n_winters),
+            }
+        )
+        for field in fields:
+            df[field] = self.get(field, station=station).reshape(-1)
+        return df.dropna(subset=fields, how="all")
+
+
+def get_cube_path():
+    return get_data_processed_path_from_code_folder(cube_folder_name)
+
+
+def read_cube_index():
+    """Return the cube index, or None if no cube has been written"""
+    index_path = get_cube_path().joinpath("index.json")
+    if not index_path.exists():
+        return None
+    return json.loads(index_path.read_text())
+
+
+def open_daily_cube(mmap_mode="r") -> DailyCube:
+    """Open all field cubes as memory maps (no data is read until sliced)"""
+    index = read_cube_index()
+    if index is None:
+        raise FileNotFoundError(f"No daily cube at {get_cube_path()}")
+    cube_path = get_cube_path()
+    arrays = {
+        field: np.load(cube_path.joinpath(f"{field}.npy"), mmap_mode=mmap_mode)
+        for field in index["fields"]
+    }
+    return DailyCube(index, arrays)
+
+
+def get_season_positions(df: pd.DataFrame):
+    """Return (winter names, day_of_season) for each row of a daily data frame"""
+    dates = pd.to_datetime(df["DATE"])
+    return get_winter_names(dates), get_days_after_Jul_1(dates)
+
+
+def get_cube_field_path(field):
+    return get_cube_path().joinpath(f"{field}.npy")
+
+
+def write_cube_index(index):
+    get_cube_path().joinpath("index.json").write_text(json.dumps(index, indent=2))
+
+
+def grow_daily_cube(stations, winters) -> dict:
+    """Make sure the cubes have these stations and winters (and every field).
+    The files are reallocated only when an axis grows; existing values are kept.
+    @return: the cube index"""
+    index = read_cube_index() or {"stations": [], "winters": []}
+    new_stations = [code for code in dict.fromkeys(stations) if code not in index["stations"]]
+    all_winters = sorted(set(index["winters"]) | set(winters))
+    missing_fields = [
+        f
+        for f in cube_fields
+        if f not in index.get("fields", []) or not get_cube_field_path(f).exists()
+    ]
+    if not new_stations and len(all_winters) == len(index["winters"]) and not missing_fields:
+        return index
+
+    new_index = {
+        "stations": index["stations"] + new_stations,
+        "winters": all_winters,
+        "fields": cube_fields,
+        "days_per_season": days_per_season,
+        "dtype": "float32",
+    }
+    shape = (len(new_index["stations"]), len(all_winters), days_per_season)
+    old_winter_i = np.searchsorted(all_winters, index["winters"])
+    cube_path = get_cube_path()
+    cube_path.mkdir(parents=True, exist_ok=True)
+    for field in cube_fields:
+        path = get_cube_field_path(field)
+        temp_path = path.with_suffix(".tmp.npy")
+        array = np.lib.format.open_memmap(temp_path, mode="w+", dtype=np.float32, shape=shape)
+        array[:] = np.nan
+        if index["stations"] and path.exists():
+            old = np.load(path, mmap_mode="r")
+            array[: old.shape[0], old_winter_i, :] = old
+            del old
+        array.flush()
+        # Drop the memory maps before replacing the file (required on Windows)
+        del array
+        os.replace(temp_path, path)
+    write_cube_index(new_index)
+    logger.info(f"Grew daily cube to shape {shape}")
+    return new_index
+
+
+def update_daily_cube_stations(station_dfs: dict):
+    """Write many stations' daily data into the cubes at once.
+    The axes grow (one reallocation) only for new stations or winters; otherwise each
+    station's rows are written in place through the memory maps.
+    Only the winters in each data frame are replaced; a station's other winters are kept.
+    @param station_dfs: station code -> daily data with DATE and the cube fields
+    (as made by add_season_columns)"""
+    positions = {code: get_season_positions(df) for code, df in station_dfs.items()}
+    winters = set()
+    for station_winters, _ in positions.values():
+        winters.update(station_winters)
+    index = grow_daily_cube(list(station_dfs), winters)
+    station_index = {code: i for i, code in enumerate(index["stations"])}
+
+    for field in cube_fields:
+        array = np.load(get_cube_field_path(field), mmap_mode="r+")
+        for code, df in station_dfs.items():
+            station_winters, days = positions[code]
+            winter_i = np.searchsorted(index["winters"], station_winters)
+            station_i = station_index[code]
+            array[station_i, np.unique(winter_i)] = np.nan
+            array[station_i, winter_i, days] = df[field].to_numpy(dtype=np.float32)
+        array.flush()
+        del array
+    shape = (len(index["stations"]), len(index["winters"]), days_per_season)
+    logger.info(f"Wrote {list(station_dfs)} to daily cube with shape {shape}")
+
+
+def update_daily_cube(station, df: pd.DataFrame):
+    """Write one station's daily data into the cubes (see update_daily_cube_stations)
+    @param station: station code, e.g. 'ELY'"""
+    update_daily_cube_stations({station: df})
+
+
+def write_cube_field(field, values):
+    """Overwrite one field of every station and winter in place, e.g. a recomputed model"""
+    array = np.load(get_cube_field_path(field), mmap_mode="r+")
+    array[:] = values
+    array.flush()
+    del array
@@ -0,0 +1,102 @@
+"""
+Process-wide LRU cache of processed data frames, used by app.py and data_load.py.
+
+Entries are keyed by (source, file name) and kept with a validator: the file mtime for
+local files, the ETag for remote files. A lookup with a validator that no longer matches
+drops the entry, so a changed file is read again.
+
+Callers get shallow copies, so adding or replacing columns never changes the cached frame.
+Writing values into a column of a shallow copy is only safe with copy-on-write, which
+copies the column first. pandas 3 always works that way; for older pandas (such as the
+one pyodide ships) enable_copy_on_write() turns it on when this module is imported.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def enable_copy_on_write():
+    """Turn on copy-on-write for pandas 2 (always on, and no longer an option, in pandas 3)"""
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+enable_copy_on_write()
+
+
+class DataFrameCache:
+    """Bounded LRU cache of data frames keyed by (source, file name).
+    Each entry keeps a validator: the file mtime for local files, the ETag for remote files.
+    Callers get a shallow copy, so adding or replacing columns never changes the cached frame."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (validator, df)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_validator(self, key):
+        """Return the validator stored for a key, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry[0] if entry else None
+
+    def get(self, key, validator):
+        """Return a copy of the cached frame if its validator still matches, else None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and validator is not None and entry[0] == validator:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1].copy(deep=False)
+            if entry is not None:
+                del self.entries[key]
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, validator, df):
+        """Store a frame (if it has a validator) and return a copy for the caller"""
+        if validator is not None:
+            with self.lock:
+                self.entries[key] = (validator, df)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+        return df.copy(deep=False)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+data_cache = DataFrameCache()
+
+
+def get_data_cache() -> DataFrameCache:
+    """Return the process-wide data cache (kept by the module, so every session shares it)"""
+    return data_cache
+
+
+def get_data_cache_stats() -> dict:
+    """Return hit / miss / eviction counters for the data cache"""
+    return data_cache.stats()
@@ -1,49 +1,197 @@
 """
-Functions to load data. 
+Functions to load data.
 
 Different when running locally vs. running in on GitHub Pages.
+
+Data frames are kept in the process-wide LRU cache of data_cache.py, keyed by source
+and file name. Local files are revalidated by mtime, remote files by ETag.
+Every file is read through here, so the registry dtypes (data_schema.py) are applied once,
+before a frame is cached. requests is imported where it is used, so app.py can import
+this module without loading it (see bench_import_time.py).
 """
 
 # Standard library imports
 
+import asyncio
 import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
 import pandas as pd
-import requests
 
 from freezetracker.common_content import get_data_processed_path_from_code_folder
 from freezetracker.common_logger import get_logger
+from freezetracker.data_cache import get_data_cache
+from freezetracker.data_schema import apply_file_schema
+
+if TYPE_CHECKING:
+    import requests
 
 logger = get_logger("data_load")
 
 # DATA LOAD
 
+github_data_processed_url = (
+    "https://raw.githubusercontent.com/denisecase/freeze-tracker/main/data/2_processed"
+)
+
+
+def get_data_processed_url(fname, base_url=None):
+    """Return the URL of a processed data file (base_url lets a local server stand in for GitHub)"""
+    return f"{base_url or github_data_processed_url}/{fname}"
+
+
+def is_pyodide() -> bool:
+    """Return True when running in the browser under Pyodide"""
+    return sys.platform == "emscripten"
+
+
+http_session = None
+http_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size=16) -> "requests.Session":
+    """Return the process-wide keep-alive session used for all remote reads"""
+    import requests
+
+    global http_session
+    with http_session_lock:
+        if http_session is None:
+            http_session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            http_session.mount("https://", adapter)
+            http_session.mount("http://", adapter)
+        return http_session
+
+
+def read_remote_csv_to_df(session, url, key):
+    """GET a CSV (revalidating a cached copy by ETag) and return it as a data frame"""
+    data_cache = get_data_cache()
+    etag = data_cache.get_validator(key)
+    headers = {"If-None-Match": etag} if etag else {}
+    response = session.get(url, headers=headers)
+    if response.status_code == 304:
+        df = data_cache.get(key, etag)
+        if df is not None:
+            return df
+        response = session.get(url)
+    response.raise_for_status()
+    etag = response.headers.get("ETag")
+    df = data_cache.get(key, etag)
+    if df is not None:
+        return df
+    df = apply_file_schema(pd.read_csv(io.StringIO(response.text)), key[1])
+    return data_cache.put(key, etag, df)
+
+
+def read_data_processed_csv_to_df(is_WASM, fname, base_url=None):
+    import requests
 
-def read_data_processed_csv_to_df(is_WASM, fname):
-    github_repo = "freeze-tracker"
-    data_subfolder = "2_processed"
-    username = "denisecase"
     from_github = is_WASM
     logger.info(f"Reading data from github: {from_github}")
     if from_github:
         try:
-            url = f"https://raw.githubusercontent.com/{username}/{github_repo}/main/data/{data_subfolder}/{fname}"
-            response = requests.get(url)
-            response.raise_for_status()
-            return pd.read_csv(io.StringIO(response.text))
+            url = get_data_processed_url(fname, base_url)
+            return read_remote_csv_to_df(get_http_session(), url, ("github", fname))
         except requests.exceptions.HTTPError as e:
-            print(f"HTTP Error reading from {url}: {e}")
+            logger.error(f"HTTP Error reading from {url}: {e}")
         except Exception as e:
-            print(f"Error reading from {url}: {e}")
+            logger.error(f"Error reading from {url}: {e}")
     else:
         try:
             full_path = get_data_processed_path_from_code_folder(fname)
-            df = pd.read_csv(full_path)
-            # print column names
-            logger.info(f"Columns: {df.columns}")
+            key = ("local", fname)
+            mtime = full_path.stat().st_mtime_ns
+            data_cache = get_data_cache()
+            df = data_cache.get(key, mtime)
+            if df is not None:
+                return df
+            df = data_cache.put(key, mtime, apply_file_schema(pd.read_csv(full_path), fname))
             logger.info(f"Read {len(df)} rows from {full_path}")
             return df
         except FileNotFoundError:
-            print(f"Error: Data file not found at {full_path}")
+            logger.error(f"Error: Data file not found at {full_path}")
         except Exception as e:
-            print(f"Error reading data file: {e}")
+            logger.error(f"Error reading data file: {e}")
+
+
+# DATA LOAD BATCH
+
+
+async def read_remote_csvs_to_dfs_async(urls_by_fname) -> dict:
+    """Fetch CSVs concurrently with pyfetch (Pyodide), revalidating cached copies by ETag
+    as read_remote_csv_to_df does; failed files map to None"""
+    import requests
+    from pyodide.http import pyfetch
+
+    async def fetch(fname, url):
+        key = ("github", fname)
+        data_cache = get_data_cache()
+        etag = data_cache.get_validator(key)
+        headers = {"If-None-Match": etag} if etag else {}
+        response = await pyfetch(url, headers=headers)
+        if response.status == 304:
+            df = data_cache.get(key, etag)
+            if df is not None:
+                return df
+            response = await pyfetch(url)
+        if not response.ok:
+            raise requests.exceptions.HTTPError(f"{response.status} for {url}")
+        etag = response.headers.get("etag")
+        df = data_cache.get(key, etag)
+        if df is None:
+            df = apply_file_schema(pd.read_csv(io.StringIO(await response.string())), fname)
+            df = data_cache.put(key, etag, df)
+        return df
+
+    fnames = list(urls_by_fname)
+    results = await asyncio.gather(
+        *(fetch(fname, urls_by_fname[fname]) for fname in fnames), return_exceptions=True
+    )
+    dfs = {}
+    for fname, result in zip(fnames, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error reading from {urls_by_fname[fname]}: {result}")
+            result = None
+        dfs[fname] = result
+    return dfs
+
+
+def read_remote_csvs_to_dfs_threaded(urls_by_fname, max_workers) -> dict:
+    """Fetch CSVs concurrently on a thread pool sharing one keep-alive session"""
+    session = get_http_session(pool_size=max_workers)
+
+    def fetch(fname):
+        url = urls_by_fname[fname]
+        try:
+            return read_remote_csv_to_df(session, url, ("github", fname))
+        except Exception as e:
+            logger.error(f"Error reading from {url}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(urls_by_fname, executor.map(fetch, urls_by_fname)))
+
+
+def read_data_processed_csvs_to_dfs(is_WASM, fnames, base_url=None, max_workers=8) -> dict:
+    """Read many processed CSV files in one call
+    Remote files are fetched concurrently: asyncio + pyfetch under Pyodide, a thread pool otherwise.
+    @param fnames: list of file names in data/2_processed
+    @return: dict of file name to data frame (None if the file could not be read)"""
+    if not is_WASM:
+        return {fname: read_data_processed_csv_to_df(is_WASM, fname) for fname in fnames}
+
+    urls_by_fname = {fname: get_data_processed_url(fname, base_url) for fname in fnames}
+    if is_pyodide():
+        try:
+            from pyodide.ffi import run_sync
+
+            return run_sync(read_remote_csvs_to_dfs_async(urls_by_fname))
+        except (ImportError, RuntimeError) as e:
+            logger.warning(f"Concurrent fetch unavailable ({e}), reading files one at a time")
+            return {
+                fname: read_data_processed_csv_to_df(is_WASM, fname, base_url) for fname in fnames
+            }
+    return read_remote_csvs_to_dfs_threaded(urls_by_fname, max_workers)
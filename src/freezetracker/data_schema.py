@@ -0,0 +1,219 @@
+"""
+Schema registry for the processed tables in data/2_processed.
+
+Each table lists its columns and compact dtypes (categorical for repeated
+strings, int8/int16 for calendar fields, float32 for temperatures and depths).
+
+- apply_table_schema() casts a frame on read.
+- enforce_table_schema() checks and casts a frame before it is written.
+- apply_file_schema() casts a frame read from a processed file or store, by its name.
+- Run this module for a memory report per table:
+
+    python data_schema.py
+
+app.py imports the registry; script_5_make_wasm_app.py vendors this module
+into the single-file WASM build.
+"""
+
+import re
+
+import pandas as pd
+
+from freezetracker.common_content import get_data_processed_path_from_code_folder
+from freezetracker.common_logger import get_logger
+
+logger = get_logger("data_schema")
+
+# table name: {"columns": stored in the files, "derived": added by readers}
+processed_table_schemas = {
+    "daily_temps": {
+        "columns": {
+            "IYEAR": "int16",
+            "IMONTH": "int8",
+            "IDAY": "int8",
+            "AVG_DAILY_TEMP_F": "float32",
+            "DATE": "datetime64[ns]",
+            "COLD_F": "float32",
+            "HOT_F": "float32",
+            "INDEX": "int16",
+            "CUMM_COLD_F": "float32",
+            "CUMM_HOT_F": "float32",
+            "STEFAN_DEPTH_in": "float32",
+        },
+        "derived": {
+            "CITY": "category",
+            "Winter": "category",
+            "Days": "int16",
+            "NAME": "category",
+            "CITY_UPPER": "category",
+            "CITY_COLOR": "category",
+        },
+    },
+    "cold_loading_vs_frost_depth": {
+        "columns": {
+            "CITY": "category",
+            "County": "category",
+            "Winter": "category",
+            "days_after_Jul_1": "int16",
+            "IYEAR": "int16",
+            "IMONTH": "int8",
+            "IDAY": "int8",
+            "DATE": "datetime64[ns]",
+            "AVG_DAILY_TEMP_F": "float32",
+            "HOT_F": "float32",
+            "CUMM_HOT_F": "float32",
+            "COLD_F": "float32",
+            "CUMM_COLD_F": "float32",
+            "THAW_DEPTH_in": "float32",
+            "FROST_DEPTH_in": "float32",
+            "DEPTH_MEASURED": "bool",
+        },
+        "derived": {
+            "Days": "int16",
+            "CITY_UPPER": "category",
+            "CITY_COLOR": "category",
+        },
+    },
+    "frost_stlouis_out": {
+        "columns": {
+            "County": "category",
+            "Date": "datetime64[ns]",
+            "THAW_DEPTH_in": "float32",
+            "FROST_DEPTH_in": "float32",
+            "Winter": "category",
+            "days_after_Jul_1": "int16",
+        },
+        "derived": {},
+    },
+    "frost_span": {
+        "columns": {
+            "Winter": "category",
+            "County": "category",
+            "Frost_Start": "datetime64[ns]",
+            "Frost_End": "datetime64[ns]",
+            "Invalid": "bool",
+        },
+        "derived": {},
+    },
+    "frost_depth": {
+        "columns": {
+            "Winter": "category",
+            "Max_Frost_Depth_in": "int16",
+        },
+        "derived": {},
+    },
+}
+
+processed_table_file_patterns = {
+    "daily_temps": re.compile(r"daily_temps_\d{4}-\d{4}_\w+\.csv|daily_temps_store"),
+    "cold_loading_vs_frost_depth": re.compile(
+        r"cold_loading_vs_frost_depth_\d{4}-\d{4}_\w+\.csv|cold_loading_vs_frost_depth_store"
+    ),
+    "frost_stlouis_out": re.compile(r"frost_stlouis_out\.csv"),
+    "frost_span": re.compile(r"frost_span\.csv"),
+    "frost_depth": re.compile(r"frost_depth\.csv"),
+}
+
+
+def get_table_name(fname):
+    """Return the registry table for a processed file or store name, or None"""
+    for table_name, pattern in processed_table_file_patterns.items():
+        if pattern.fullmatch(fname):
+            return table_name
+    return None
+
+
+def get_table_dtypes(table_name) -> dict:
+    schema = processed_table_schemas[table_name]
+    return {**schema["columns"], **schema["derived"]}
+
+
+def apply_table_schema(df: pd.DataFrame, table_name) -> pd.DataFrame:
+    """Cast the registry columns present in a frame to their compact dtypes"""
+    for column, dtype in get_table_dtypes(table_name).items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        if dtype.startswith("datetime64"):
+            df[column] = pd.to_datetime(df[column])
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def enforce_table_schema(df: pd.DataFrame, table_name) -> pd.DataFrame:
+    """Check a frame has every stored column and no unknown ones, then cast it for writing"""
+    dtypes = get_table_dtypes(table_name)
+    missing = [c for c in processed_table_schemas[table_name]["columns"] if c not in df.columns]
+    unknown = [c for c in df.columns if c not in dtypes]
+    if missing or unknown:
+        raise ValueError(f"{table_name} schema mismatch: missing {missing}, unknown {unknown}")
+    return apply_table_schema(df.copy(), table_name)
+
+
+def apply_file_schema(df, fname):
+    """Apply the registry dtypes for a processed file (files not in the registry are unchanged)"""
+    table_name = get_table_name(fname)
+    return df if table_name is None else apply_table_schema(df, table_name)
+
+
+# MEMORY REPORT
+
+
+def get_table_file_names(table_name):
+    processed_data_path = get_data_processed_path_from_code_folder("")
+    pattern = processed_table_file_patterns[table_name]
+    return sorted(f.name for f in processed_data_path.iterdir() if pattern.fullmatch(f.name))
+
+
+def read_table_for_report(table_name):
+    """Read a table's per-winter CSV files or, once those are replaced by it, its store
+    @return: (data frame as pandas reads the CSVs by default, number of sources) or
+    (None, 0) if there is neither"""
+    fnames = get_table_file_names(table_name)
+    csv_names = [fname for fname in fnames if not fname.endswith("_store")]
+    if not csv_names:
+        store_names = [fname for fname in fnames if fname.endswith("_store")]
+        if not store_names:
+            return None, 0
+        df = pd.read_parquet(get_data_processed_path_from_code_folder(store_names[0]))
+        # Widen the stored dtypes to the read_csv defaults, so the report compares the same
+        categories = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+        df = df.astype({c: object for c in categories})
+        df = df.astype({c: "int64" for c in df.select_dtypes("integer").columns})
+        df = df.astype({c: "float64" for c in df.select_dtypes("floating").columns})
+        return df, 1
+    dfs = []
+    for fname in csv_names:
+        df = pd.read_csv(get_data_processed_path_from_code_folder(fname))
+        if table_name == "daily_temps":
+            df["CITY"] = fname[-7:-4].upper()
+            df["NAME"] = fname[12:21]
+        dfs.append(df)
+    return pd.concat(dfs, ignore_index=True), len(dfs)
+
+
+def get_memory_report() -> pd.DataFrame:
+    """Compare the memory used by each table as read by default and with the registry dtypes"""
+    rows = []
+    for table_name in processed_table_schemas:
+        df, sources = read_table_for_report(table_name)
+        if df is None:
+            logger.warning(f"No files or store for {table_name}; left out of the report")
+            continue
+        default_bytes = df.memory_usage(deep=True).sum()
+        typed_bytes = apply_table_schema(df.copy(), table_name).memory_usage(deep=True).sum()
+        rows.append(
+            {
+                "table": table_name,
+                "files": sources,
+                "rows": len(df),
+                "default_kb": round(default_bytes / 1024, 1),
+                "typed_kb": round(typed_bytes / 1024, 1),
+                "ratio": round(default_bytes / typed_bytes, 1),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(get_memory_report().to_string(index=False))
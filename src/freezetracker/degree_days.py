@@ -0,0 +1,134 @@
+"""
+Degree-day kernel: daily and cumulative degree days for any number of bases in one pass.
+
+A freezing index adds up how far each day's mean falls below a base; a thawing index
+adds up how far it rises above one. Each index gets a daily column and a cumulative
+column that resets at every segment start (each July 1, and each new station).
+
+    indices = {
+        "COLD_F": {"kind": "freezing", "base": 32.0},     # freezing index (default)
+        "HOT_F": {"kind": "thawing", "base": 32.0},       # thawing index (default)
+        "HOT_29_F": {"kind": "thawing", "base": 29.0},    # MnDOT-style thawing index
+    }
+
+Array API (one row per station, one column per day, segments shared by all stations):
+
+    result = compute_degree_days(temps, segment_starts, indices)
+    result["CUMM_COLD_F"]   # same shape as temps
+
+DataFrame API (long data, rows in date order within each station):
+
+    df = add_degree_days(df, indices, segment_columns=["CITY", "SEASON"])
+
+Daily means are rounded to whole degrees first, and so are the degree days,
+matching the values the make years scripts have always written (COLD_F, HOT_F).
+Missing days (NaN) have NaN degree days and add nothing to the running sums.
+"""
+
+import numpy as np
+import pandas as pd
+
+degree_day_kinds = ["freezing", "thawing"]
+
+default_degree_day_indices = {
+    "COLD_F": {"kind": "freezing", "base": 32.0},
+    "HOT_F": {"kind": "thawing", "base": 32.0},
+}
+
+
+def get_cumulative_name(name):
+    return f"CUMM_{name}"
+
+
+def get_segment_positions(segment_starts: np.ndarray) -> np.ndarray:
+    """Return, for each day, the position of the first day of its segment
+    (day 0 always starts a segment)"""
+    positions = np.arange(segment_starts.shape[-1])
+    starts = np.asarray(segment_starts, dtype=bool).copy()
+    if starts.shape[-1]:
+        starts[..., 0] = True
+    return np.maximum.accumulate(np.where(starts, positions, 0), axis=-1)
+
+
+def segment_cumsum(values: np.ndarray, segment_first: np.ndarray) -> np.ndarray:
+    """Cumulative sum along the last axis that restarts at each segment.
+    @param values: (..., n_days) with no NaN
+    @param segment_first: first-day positions from get_segment_positions, (n_days,) or like values
+    """
+    total = np.cumsum(values, axis=-1)
+    before = total - values
+    if segment_first.ndim == 1:
+        total -= np.take(before, segment_first, axis=-1)
+    else:
+        total -= np.take_along_axis(before, segment_first, axis=-1)
+    return total
+
+
+def compute_degree_days(temps, segment_starts, indices=None) -> dict:
+    """Compute daily and cumulative degree days for every index in one pass
+    @param temps: daily mean temperatures (F), shape (n_days,) or (n_stations, n_days)
+    @param segment_starts: bool, True where the running sums restart (e.g. July 1),
+        shape (n_days,) shared by all stations, or the same shape as temps
+    @param indices: {name: {"kind": "freezing" | "thawing", "base": F}}
+    @return: {"INDEX": day within segment, name: daily, "CUMM_" + name: cumulative}"""
+    indices = default_degree_day_indices if indices is None else indices
+    temps = np.round(np.asarray(temps, dtype=np.float64))
+    missing = np.isnan(temps)
+    any_missing = missing.any()
+    segment_first = get_segment_positions(np.asarray(segment_starts))
+
+    positions = np.arange(temps.shape[-1])
+    result = {"INDEX": np.broadcast_to(positions - segment_first, temps.shape).copy()}
+    for name, index in indices.items():
+        if index["kind"] == "freezing":
+            daily = index["base"] - temps
+        elif index["kind"] == "thawing":
+            daily = temps - index["base"]
+        else:
+            raise ValueError(f"Unknown degree day kind {index['kind']}. Use {degree_day_kinds}")
+        np.round(daily, out=daily)
+        np.clip(daily, 0, None, out=daily)
+        if any_missing:
+            cumulative = segment_cumsum(np.where(missing, 0.0, daily), segment_first)
+            cumulative[missing] = np.nan
+        else:
+            cumulative = segment_cumsum(daily, segment_first)
+        result[name] = daily
+        result[get_cumulative_name(name)] = cumulative
+    return result
+
+
+def get_segment_starts(df: pd.DataFrame, segment_columns) -> np.ndarray:
+    """True on each row whose segment key differs from the row before"""
+    starts = np.zeros(len(df), dtype=bool)
+    if len(df):
+        starts[0] = True
+    for column in segment_columns:
+        # Compare codes, not values, so string keys do not fall back to Python comparisons
+        codes, _ = pd.factorize(df[column])
+        starts[1:] |= codes[1:] != codes[:-1]
+    return starts
+
+
+def add_degree_days(
+    df: pd.DataFrame,
+    indices=None,
+    segment_columns=None,
+    temp_column="AVG_DAILY_TEMP_F",
+) -> pd.DataFrame:
+    """Add INDEX and the daily and cumulative columns of every index to a copy of df
+    @param df: one row per day, in date order within each segment
+    @param indices: {name: {"kind", "base"}} (default COLD_F and HOT_F at 32 F)
+    @param segment_columns: columns whose change restarts the sums, e.g. ["CITY", "SEASON"]
+    @param temp_column: daily mean temperature column (F)"""
+    segment_columns = segment_columns or []
+    df = df.copy()
+    if segment_columns:
+        segment_starts = get_segment_starts(df, segment_columns)
+    else:
+        segment_starts = np.zeros(len(df), dtype=bool)
+    result = compute_degree_days(df[temp_column].to_numpy(), segment_starts, indices)
+    df["INDEX"] = result.pop("INDEX")
+    for name, values in result.items():
+        df[name] = values
+    return df
@@ -0,0 +1,196 @@
+"""
+Extract the frost tables from the MnDOT frost probe workbook in one pass.
+
+/data/1_raw/FrostProbeData10-3-22-withgraphs.xlsx
+
+The workbook is opened once, reading only the sheets named in frost_workbook_extracts.
+Each extract takes one range from one sheet, turns it into a typed table, and writes
+it to data/2_processed in the shape the app reads:
+
+    frost_stlouis.csv   County, Date, THAW_DEPTH_in, FROST_DEPTH_in, SECONDARY_FROST_DEPTH_in
+    frost_depth.csv     Winter, Max_Frost_Depth_in
+    frost_span.csv      Winter, County, Frost_Start, Frost_End, Invalid
+
+Dates marked with * in the workbook (e.g. 12/1/2021*) are estimates; their span row
+has Invalid set to True.
+
+The workbook's SHA-256 (and the extract list) is kept in frost_workbook_manifest.json.
+If neither has changed and every output exists, nothing is read or written.
+
+In the src/freezetracker folder, run:
+
+    python extract_frost_workbook.py
+    python extract_frost_workbook.py --force
+
+"""
+
+import argparse
+import hashlib
+import json
+
+import pandas as pd
+
+from freezetracker.common_content import get_data_processed_path_from_code_folder
+from freezetracker.common_logger import get_logger
+from freezetracker.season_calendar import get_winter_names
+from freezetracker.stations import get_data_raw_path
+
+logger = get_logger("extract_frost_workbook")
+
+frost_workbook_file_name = "FrostProbeData10-3-22-withgraphs.xlsx"
+frost_workbook_manifest_file_name = "frost_workbook_manifest.json"
+frost_date_format = "%Y/%m/%d"
+
+# One (sheet, range) per output table; "table" picks the transform below
+frost_workbook_extracts = [
+    {
+        "sheet": "St Louis",
+        "range": "A1:E2040",
+        "table": "frost_readings",
+        "out": "frost_stlouis.csv",
+    },
+    {
+        "sheet": "Summary",
+        "range": "AO4:AP25",
+        "table": "frost_depth",
+        "out": "frost_depth.csv",
+    },
+    {
+        "sheet": "Frost Start & End Dates",
+        "range": "AK22:AM43",
+        "table": "frost_span",
+        "out": "frost_span.csv",
+    },
+]
+
+
+def to_frame(rows) -> pd.DataFrame:
+    """First row is the header; empty cells ('') become missing values"""
+    df = pd.DataFrame(rows[1:], columns=rows[0])
+    return df.replace("", None)
+
+
+def parse_frost_dates(dates: pd.Series):
+    """Parse 2001/11/28 or 12/1/2021* dates; return (dates, marked with *)"""
+    dates = dates.astype(str).str.strip()
+    marked = dates.str.endswith("*")
+    return pd.to_datetime(dates.str.rstrip("*"), format="mixed"), marked
+
+
+def make_frost_readings(rows) -> pd.DataFrame:
+    df = to_frame(rows)
+    depths = pd.DataFrame(
+        {
+            "THAW_DEPTH_in": df["THAW DEPTH (inches)"],
+            "FROST_DEPTH_in": df["FROST DEPTH (inches)"],
+            "SECONDARY_FROST_DEPTH_in": df["SECONDARY FROST DEPTH (inches)"],
+        }
+    )
+    dates, _ = parse_frost_dates(df["Date"])
+    out = pd.DataFrame({"County": df["County"], "Date": dates.dt.strftime(frost_date_format)})
+    for column in depths.columns:
+        out[column] = pd.to_numeric(depths[column]).astype("Int16")
+    return out
+
+
+def make_frost_depth(rows) -> pd.DataFrame:
+    df = to_frame(rows)
+    return pd.DataFrame(
+        {
+            "Winter": df["Winter"].astype(str),
+            "Max_Frost_Depth_in": pd.to_numeric(df["Max. Frost Depth (inches)"]).astype("int16"),
+        }
+    )
+
+
+def make_frost_span(rows) -> pd.DataFrame:
+    df = to_frame(rows)
+    start, start_marked = parse_frost_dates(df["Frost Start"])
+    end, end_marked = parse_frost_dates(df["Frost End"])
+    return pd.DataFrame(
+        {
+            "Winter": get_winter_names(start),
+            "County": df["County"],
+            "Frost_Start": start.dt.strftime(frost_date_format),
+            "Frost_End": end.dt.strftime(frost_date_format),
+            "Invalid": start_marked | end_marked,
+        }
+    )
+
+
+frost_table_makers = {
+    "frost_readings": make_frost_readings,
+    "frost_depth": make_frost_depth,
+    "frost_span": make_frost_span,
+}
+
+
+def hash_file(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_manifest_path():
+    return get_data_processed_path_from_code_folder(frost_workbook_manifest_file_name)
+
+
+def read_manifest() -> dict:
+    f = get_manifest_path()
+    return json.loads(f.read_text()) if f.exists() else {}
+
+
+def is_up_to_date(workbook_hash, extracts) -> bool:
+    """True if the last run used the same workbook and extracts and its outputs still exist"""
+    manifest = read_manifest()
+    if manifest.get("workbook_sha256") != workbook_hash or manifest.get("extracts") != extracts:
+        return False
+    return all(
+        get_data_processed_path_from_code_folder(extract["out"]).exists() for extract in extracts
+    )
+
+
+def read_workbook_ranges(path, extracts) -> list:
+    """Open the workbook once (only the needed sheets) and return each extract's rows"""
+    import pylightxl as xl
+
+    sheets = sorted({extract["sheet"] for extract in extracts})
+    logger.info(f"Reading sheets {sheets} from {path}")
+    db = xl.readxl(path, ws=tuple(sheets))
+    return [db.ws(ws=extract["sheet"]).range(address=extract["range"]) for extract in extracts]
+
+
+def extract_frost_workbook(force=False, extracts=None) -> list:
+    """Write every extract's table unless the workbook is unchanged.
+    @return: the output files written (empty if skipped)"""
+    extracts = frost_workbook_extracts if extracts is None else extracts
+    path = get_data_raw_path().joinpath(frost_workbook_file_name)
+    workbook_hash = hash_file(path)
+    if not force and is_up_to_date(workbook_hash, extracts):
+        logger.info(f"{path.name} is unchanged (sha256 {workbook_hash[:12]}); nothing to do")
+        return []
+
+    written = []
+    for extract, rows in zip(extracts, read_workbook_ranges(path, extracts)):
+        df = frost_table_makers[extract["table"]](rows)
+        f = get_data_processed_path_from_code_folder(extract["out"])
+        df.to_csv(f, index=False)
+        logger.info(f"Wrote {len(df)} rows from {extract['sheet']}!{extract['range']} to {f}")
+        written.append(f)
+
+    manifest = {"workbook": path.name, "workbook_sha256": workbook_hash, "extracts": extracts}
+    get_manifest_path().write_text(json.dumps(manifest, indent=2))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract frost tables from the probe workbook")
+    parser.add_argument("--force", action="store_true", help="extract even if unchanged")
+    args = parser.parse_args()
+    extract_frost_workbook(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
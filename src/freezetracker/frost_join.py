@@ -0,0 +1,150 @@
+"""
+Join daily cold loading with frost depth for every station and winter in one pass.
+
+Frost probe readings (frost_stlouis_out.csv) are taken every few days, so an exact
+(winter, day) join leaves most days without a depth. Here each daily row gets the
+depth interpolated in time between the probe readings on either side of it:
+
+    backward as-of match   last reading on or before the day (same winter)
+    forward as-of match    next reading on or after the day (same winter)
+    depth                  linear between the two, if they are at most max_gap_days apart
+
+Days on a reading keep its value; days before the first or after the last reading of a
+winter, or inside a longer gap, stay empty. THAW_DEPTH_in and FROST_DEPTH_in are filled
+separately (each from its own readings). DEPTH_MEASURED marks days with a probe reading.
+
+Readings are joined only to the stations in their county, as listed in the station
+registry (frost_county, see stations.py). Stations without one get no County and no depths.
+Charts and fits use the DEPTH_MEASURED days; the interpolated days only fill gaps.
+
+The result is written as the cold_loading_vs_frost_depth store (Parquet, partitioned by
+CITY and Winter) by script_3_make_store.py, right after the daily_temps store.
+app.py imports the join (script_5_make_wasm_app.py vendors it into the WASM build).
+"""
+
+import numpy as np
+import pandas as pd
+
+from freezetracker.common_logger import get_logger
+
+logger = get_logger("frost_join")
+
+frost_depth_columns = ["THAW_DEPTH_in", "FROST_DEPTH_in"]
+
+# Readings further apart than this are not interpolated between
+frost_depth_max_gap_days = 14
+
+cold_loading_vs_frost_depth_columns = [
+    "CITY",
+    "County",
+    "Winter",
+    "days_after_Jul_1",
+    "IYEAR",
+    "IMONTH",
+    "IDAY",
+    "DATE",
+    "AVG_DAILY_TEMP_F",
+    "HOT_F",
+    "CUMM_HOT_F",
+    "COLD_F",
+    "CUMM_COLD_F",
+    "THAW_DEPTH_in",
+    "FROST_DEPTH_in",
+    "DEPTH_MEASURED",
+    "Days",
+]
+
+
+def interpolate_readings(days: pd.DataFrame, readings: pd.DataFrame, column, max_gap_days):
+    """Interpolate one reading column onto days (both with Winter and Days, days sorted by Days)
+    @return: array of values aligned with days (NaN where no readings are close enough)"""
+    readings = readings.dropna(subset=[column])
+    readings = readings.groupby(["Winter", "Days"], as_index=False)[column].mean()
+    readings["READ_DAY"] = readings["Days"]
+    readings = readings.sort_values("Days", kind="stable")
+
+    before = pd.merge_asof(days, readings, on="Days", by="Winter", direction="backward")
+    after = pd.merge_asof(days, readings, on="Days", by="Winter", direction="forward")
+    gap = (after["READ_DAY"] - before["READ_DAY"]).to_numpy(dtype=float)
+    since = days["Days"].to_numpy(dtype=float) - before["READ_DAY"].to_numpy(dtype=float)
+    low = before[column].to_numpy(dtype=float)
+    high = after[column].to_numpy(dtype=float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(gap > 0, since / gap, 0.0)
+    values = low + weight * (high - low)
+    return np.where(gap <= max_gap_days, values, np.nan)
+
+
+def join_county_frost_depths(df: pd.DataFrame, readings: pd.DataFrame, max_gap_days):
+    """Add interpolated depths and DEPTH_MEASURED to one county's daily rows (in place)
+    @param readings: the county's probe readings (Winter, Days, depth columns)"""
+    days = pd.DataFrame(
+        {
+            "Winter": df["Winter"].astype(str),
+            "Days": df["Days"].astype("int64"),
+            "ROW": np.arange(len(df)),
+        }
+    ).sort_values("Days", kind="stable")
+    rows = days["ROW"].to_numpy()
+    for column in frost_depth_columns:
+        values = np.empty(len(df))
+        values[rows] = interpolate_readings(days, readings, column, max_gap_days)
+        df[column] = values
+
+    measured = readings.dropna(subset=frost_depth_columns, how="all")
+    measured_keys = pd.MultiIndex.from_frame(measured[["Winter", "Days"]])
+    day_keys = pd.MultiIndex.from_arrays([df["Winter"].astype(str), df["Days"].astype("int64")])
+    df["DEPTH_MEASURED"] = day_keys.isin(measured_keys)
+    return len(measured)
+
+
+def join_frost_depths(
+    daily_df: pd.DataFrame,
+    frost_df: pd.DataFrame,
+    station_counties: dict,
+    max_gap_days=frost_depth_max_gap_days,
+) -> pd.DataFrame:
+    """Add County, days_after_Jul_1, interpolated depths, and DEPTH_MEASURED to daily rows
+    @param daily_df: daily_temps store rows (CITY, Winter, Days, DATE, degree days, ...)
+    @param frost_df: frost_stlouis_out rows (County, Winter, days_after_Jul_1, depths)
+    @param station_counties: station code -> County of its probe readings
+    (e.g. {"ORR": "StLouis"}); other stations get no depths
+    @param max_gap_days: longest gap between readings to interpolate across"""
+    df = daily_df.reset_index(drop=True)
+    df["County"] = df["CITY"].astype(str).map(station_counties).astype(object)
+    df["County"] = df["County"].where(df["County"].notna(), None)
+    for column in frost_depth_columns:
+        df[column] = np.nan
+    df["DEPTH_MEASURED"] = False
+
+    readings = pd.DataFrame(
+        {
+            "County": frost_df["County"],
+            "Winter": frost_df["Winter"].astype(str),
+            "Days": frost_df["days_after_Jul_1"].astype("int64"),
+        }
+    )
+    for column in frost_depth_columns:
+        readings[column] = frost_df[column].astype(float)
+
+    n_measured = 0
+    for county, county_readings in readings.groupby("County", sort=True):
+        is_county = (df["County"] == county).to_numpy()
+        if not is_county.any():
+            continue
+        county_df = df.loc[is_county].reset_index(drop=True)
+        n_measured += join_county_frost_depths(
+            county_df, county_readings.drop(columns="County"), max_gap_days
+        )
+        for column in frost_depth_columns + ["DEPTH_MEASURED"]:
+            df.loc[is_county, column] = county_df[column].to_numpy()
+
+    df["DEPTH_MEASURED"] = df["DEPTH_MEASURED"].astype(bool)
+    df["days_after_Jul_1"] = df["Days"]
+    logger.info(
+        f"Joined {len(df)} days with {n_measured} probe readings: "
+        f"{int(df['DEPTH_MEASURED'].sum())} measured days, "
+        f"{int(df['FROST_DEPTH_in'].notna().sum())} days with a frost depth"
+    )
+    return df[cold_loading_vs_frost_depth_columns]
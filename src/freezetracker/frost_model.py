@@ -0,0 +1,159 @@
+"""
+Physics-based frost penetration depth from the freezing index (modified Berggren / Stefan).
+
+The Stefan equation gives the depth frost reaches after a freezing index F (degree days
+below 32 F, i.e. CUMM_COLD_F); the modified Berggren form scales it by a coefficient
+lambda that accounts for the heat the soil gives up as it cools:
+
+    depth_ft = lambda * sqrt(48 * k * F / L)
+    L = 1.434 * w * dry_density          latent heat of the soil water, BTU/ft^3
+
+with k in BTU/(ft hr F), w in percent, and dry density in lb/ft^3 (48 = 2 * 24 hours/day).
+Per station, everything but F folds into one coefficient, so for a whole network
+
+    STEFAN_DEPTH_in = coefficient[station] * sqrt(CUMM_COLD_F[station, ..., day])
+
+is one broadcast multiply over a [station, ..., day] array (compute_stefan_depths).
+Soil parameters come from the station registry (stations.py, default_soil_parameters).
+The depth only grows through the season: thawing in spring is not modeled.
+
+The season stage of ingest_stations.py adds STEFAN_DEPTH_in to each daily row
+(daily_temps_{winter}_{code}.csv, the daily_temps store, and the daily cube).
+The soil parameters are part of each winter's input hash, so the next season stage
+rebuilds a station after they change. To recompute the depths of every station at once
+(the daily cube, the per-winter files, and the daily_temps store) without a rebuild,
+in the src/freezetracker folder, run:
+
+    python frost_model.py
+
+"""
+
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from freezetracker.common_content import get_data_processed_path_from_code_folder
+from freezetracker.common_logger import get_logger
+from freezetracker.daily_cube import (
+    get_cube_path,
+    grow_daily_cube,
+    open_daily_cube,
+    read_cube_index,
+    write_cube_field,
+)
+from freezetracker.data_schema import enforce_table_schema
+from freezetracker.script_3_make_store import write_store
+from freezetracker.stations import get_soil_parameters
+
+logger = get_logger("frost_model")
+
+stefan_depth_column = "STEFAN_DEPTH_in"
+
+winter_file_pattern = re.compile(r"daily_temps_(\d{4}-\d{4})_([a-z0-9]+)\.csv")
+
+# Latent heat of fusion of water per unit of soil: BTU/ft^3 per (percent moisture x lb/ft^3)
+latent_heat_factor = 1.434
+
+
+def get_depth_coefficients(soils) -> np.ndarray:
+    """Inches of frost per sqrt(F-day) for each station's soil parameters
+    @param soils: list of dicts with the keys of default_soil_parameters"""
+    conductivity = np.array([soil["conductivity"] for soil in soils], dtype=float)
+    moisture_pct = np.array([soil["moisture_pct"] for soil in soils], dtype=float)
+    dry_density = np.array([soil["dry_density_pcf"] for soil in soils], dtype=float)
+    lambda_coefficient = np.array([soil["lambda_coefficient"] for soil in soils], dtype=float)
+    latent_heat = latent_heat_factor * moisture_pct * dry_density
+    return 12.0 * lambda_coefficient * np.sqrt(48.0 * conductivity / latent_heat)
+
+
+def get_station_depth_coefficients(codes) -> np.ndarray:
+    return get_depth_coefficients([get_soil_parameters(code) for code in codes])
+
+
+def compute_stefan_depths(freezing_index, coefficients) -> np.ndarray:
+    """Frost depth (in) for a [station, ..., day] array of freezing index (F-days)
+    @param coefficients: one per station (get_depth_coefficients); NaN days stay NaN
+    @return: depths rounded to 0.1 in, as written to the files"""
+    freezing_index = np.asarray(freezing_index, dtype=np.float32)
+    shape = (-1,) + (1,) * (freezing_index.ndim - 1)
+    coefficients = np.asarray(coefficients, dtype=np.float32).reshape(shape)
+    return np.round(coefficients * np.sqrt(np.maximum(freezing_index, 0.0)), 1)
+
+
+def add_stefan_depths(df: pd.DataFrame, code) -> pd.DataFrame:
+    """Add STEFAN_DEPTH_in from CUMM_COLD_F to one station's daily rows"""
+    coefficients = get_station_depth_coefficients([code])
+    df[stefan_depth_column] = compute_stefan_depths(
+        df["CUMM_COLD_F"].to_numpy()[np.newaxis], coefficients
+    )[0]
+    return df
+
+
+def update_cube_stefan_depths():
+    """Recompute STEFAN_DEPTH_in for every station and winter in the daily cube
+    (after soil parameters change); returns the cube shape"""
+    index = read_cube_index()
+    if index is None:
+        raise FileNotFoundError(f"No daily cube at {get_cube_path()}")
+    # Adds the field to an older cube that does not have it yet
+    grow_daily_cube(index["stations"], index["winters"])
+    cube = open_daily_cube()
+    start = time.perf_counter()
+    coefficients = get_station_depth_coefficients(index["stations"])
+    depths = compute_stefan_depths(cube.get("CUMM_COLD_F"), coefficients)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # Close the memory maps before writing through them again
+    del cube
+    write_cube_field(stefan_depth_column, depths)
+    logger.info(f"Computed {stefan_depth_column} for cube {depths.shape} in {elapsed_ms:.1f} ms")
+    return depths.shape
+
+
+def update_winter_files_stefan_depths():
+    """Recompute STEFAN_DEPTH_in in every daily_temps_{winter}_{code}.csv file;
+    returns the number of files written"""
+    processed_path = get_data_processed_path_from_code_folder("")
+    count = 0
+    for f in sorted(processed_path.glob("daily_temps_*.csv")):
+        match = winter_file_pattern.fullmatch(f.name)
+        if match is None:
+            continue
+        df = add_stefan_depths(pd.read_csv(f), match.group(2).upper())
+        enforce_table_schema(df, "daily_temps").to_csv(f, index=False)
+        count += 1
+    logger.info(f"Computed {stefan_depth_column} for {count} per-winter files")
+    return count
+
+
+def update_store_stefan_depths():
+    """Recompute STEFAN_DEPTH_in for every row of the daily_temps store, all stations in one
+    multiply; returns the number of rows written (0 if there is no store)"""
+    store_path = get_data_processed_path_from_code_folder("daily_temps_store")
+    if not store_path.exists():
+        logger.warning(f"No store at {store_path}")
+        return 0
+    df = pd.read_parquet(store_path)
+    cities = df["CITY"].astype(str)
+    codes = cities.unique()
+    coefficients = dict(zip(codes, get_station_depth_coefficients(codes)))
+    df[stefan_depth_column] = compute_stefan_depths(
+        df["CUMM_COLD_F"].to_numpy(), cities.map(coefficients).to_numpy()
+    )
+    write_store("daily_temps", enforce_table_schema(df, "daily_temps"))
+    return len(df)
+
+
+def main():
+    if read_cube_index() is None:
+        logger.warning(f"No daily cube at {get_cube_path()}")
+    else:
+        update_cube_stefan_depths()
+    update_winter_files_stefan_depths()
+    update_store_stefan_depths()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""
+Ingestion engine for any number of stations, driven by the station registry (stations.py).
+
+Stages, per station:
+
+- daily:   hourly readings -> data/2_processed/daily_temps_{code}.csv
+           (Excel import if configured and present, else the existing daily file,
+           plus any raw NOAA ISD CSVs in data/1_raw for the station's isd_id)
+- seasons: daily_temps_{code}.csv -> DATE, COLD_F, HOT_F, INDEX, cumulative sums
+           reset each July 1, and the modeled frost depth STEFAN_DEPTH_in (frost_model.py)
+           -> one daily_temps_{winter}_{code}.csv per winter,
+           and the station's rows in the daily cube (daily_cube.py)
+
+Season builds are incremental. Each winter only depends on its own days, so the
+daily rows of each winter are hashed and kept in a small manifest,
+
+/data/2_processed/season_manifest/{code}.json   winter -> input hash and row count
+
+and only winters whose hash changed (or whose file is missing) are recomputed and
+rewritten, plus the latest season in the data on every run. Use --full to rebuild all.
+Only winters in --first-winter..--last-winter are written, so only they get new manifest
+entries; a changed winter outside the range is rebuilt by the next run that includes it.
+A station's manifest is saved only after its rebuilt winters are in the daily cube,
+so winters whose cube write failed are rebuilt on the next run.
+
+Stations run in parallel on a process pool. Each reports its own progress;
+a failing station is logged and reported without stopping the others.
+
+In the src/freezetracker folder, run:
+
+    python ingest_stations.py                          # all stations, both stages
+    python ingest_stations.py --stations ORR --stages seasons
+    python ingest_stations.py --workers 8
+    python ingest_stations.py --stages seasons --full
+
+"""
+
+import argparse
+import hashlib
+import json
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from freezetracker.common_content import (
+    get_data_processed_path_from_code_folder,
+    max_winter_start_year,
+    min_winter_start_year,
+)
+from freezetracker.common_logger import get_logger
+from freezetracker.daily_cube import read_cube_index, update_daily_cube_stations
+from freezetracker.data_schema import enforce_table_schema
+from freezetracker.degree_days import add_degree_days, default_degree_day_indices
+from freezetracker.frost_model import add_stefan_depths
+from freezetracker.isd_hourly import get_raw_isd_csv_paths, merge_daily_data, read_isd_daily_means
+from freezetracker.stations import (
+    get_data_raw_path,
+    get_soil_parameters,
+    get_station,
+    get_station_registry,
+)
+
+logger = get_logger("ingest_stations")
+
+ingest_stages = ["daily", "seasons"]
+daily_columns = ["IYEAR", "IMONTH", "IDAY", "AVG_DAILY_TEMP_F"]
+season_columns = daily_columns + [
+    "DATE",
+    "COLD_F",
+    "HOT_F",
+    "INDEX",
+    "CUMM_COLD_F",
+    "CUMM_HOT_F",
+    "STEFAN_DEPTH_in",
+]
+
+season_manifest_folder_name = "season_manifest"
+
+# Part of every winter's hash: bump when add_season_columns changes to rebuild everything
+season_build_version = 2
+
+
+def get_daily_file_name(code):
+    return f"daily_temps_{code.lower()}.csv"
+
+
+def get_winter_file_name(code, yearString):
+    return f"daily_temps_{yearString}_{code.lower()}.csv"
+
+
+# STAGE: HOURLY -> DAILY
+
+
+def read_raw_excel_hourly_data(station) -> pd.DataFrame:
+    """Read a station's Excel import (SOURCE, IYEAR, IMONTH, IDAY, TMP_F), or empty if none"""
+    excel = station.get("excel")
+    if not excel:
+        return pd.DataFrame()
+    f = get_data_raw_path().joinpath(excel["file"])
+    if not f.exists():
+        logger.info(f"No Excel import at {f}")
+        return pd.DataFrame()
+    logger.info(f"Reading from raw data file {f}")
+    columns_to_read = ["SOURCE", "IYEAR", "IMONTH", "IDAY", "TMP_F"]
+    return pd.read_excel(f, sheet_name=excel["sheet"], usecols=columns_to_read)
+
+
+def generate_daily_means(df: pd.DataFrame, source_filter) -> pd.DataFrame:
+    """Filter hourly readings by SOURCE and average them by year, month, and day"""
+    newdf = df.copy()
+
+    # IYEAR maybe 2010.0 and is a float. Change it to int
+    newdf["IYEAR"] = df["IYEAR"].astype(int)
+    newdf["IMONTH"] = df["IMONTH"].astype(int)
+    newdf["IDAY"] = df["IDAY"].astype(int)
+
+    # SOURCE may be read as 7 or 7.0 (Excel) or "7" (CSV)
+    source = newdf["SOURCE"].astype(str).str.replace(r"\.0$", "", regex=True)
+    newdf = newdf[source.isin(source_filter)]
+
+    df_daily = (
+        newdf.groupby(["IYEAR", "IMONTH", "IDAY"])["TMP_F"]
+        .mean()
+        .reset_index()
+        .rename(columns={"TMP_F": "AVG_DAILY_TEMP_F"})
+    )
+    return df_daily[daily_columns]
+
+
+def read_processed_daily_data(code) -> pd.DataFrame:
+    """Read the existing daily_temps_{code}.csv (empty if there is none yet)"""
+    f = get_data_processed_path_from_code_folder(get_daily_file_name(code))
+    if not f.exists():
+        return pd.DataFrame(columns=daily_columns)
+    return pd.read_csv(f, float_precision="round_trip")
+
+
+def read_raw_isd_daily_data(station) -> pd.DataFrame:
+    """Stream the station's rows from any raw NOAA ISD CSVs into daily means"""
+    paths = get_raw_isd_csv_paths(get_data_raw_path())
+    df = read_isd_daily_means(paths, stations=[station["isd_id"]], sources=station["source_filter"])
+    return df[daily_columns]
+
+
+def make_daily_data(code) -> pd.DataFrame:
+    """Build and save daily_temps_{code}.csv for one station"""
+    station = get_station(code)
+    df = read_raw_excel_hourly_data(station)
+    if not df.empty:
+        df_daily = generate_daily_means(df, station["source_filter"])
+    else:
+        df_daily = read_processed_daily_data(code)
+
+    df_isd = read_raw_isd_daily_data(station)
+    if not df_isd.empty:
+        df_daily = merge_daily_data(df_daily, df_isd)
+
+    f = get_data_processed_path_from_code_folder(get_daily_file_name(code))
+    logger.info(f"Writing {len(df_daily)} days to {f}")
+    df_daily.to_csv(f, index=False)
+    return df_daily
+
+
+# STAGE: DAILY -> SEASONS
+
+
+def get_season_start_years(df: pd.DataFrame) -> pd.Series:
+    """Return the winter start year of each daily row (July 1 - June 30)"""
+    return df["IYEAR"] - (df["IMONTH"] < 7).astype(int)
+
+
+def add_season_columns(df: pd.DataFrame, code=None) -> pd.DataFrame:
+    """Add DATE, COLD_F, HOT_F, the day INDEX and cumulative sums that reset each July 1,
+    and STEFAN_DEPTH_in from the station's soil (defaults for an unknown code)"""
+    df = df[daily_columns].copy()
+    df["AVG_DAILY_TEMP_F"] = df["AVG_DAILY_TEMP_F"].astype(float).round()
+
+    # Combine "IYEAR", "IMONTH", and "IDAY" columns into a single date column
+    df["DATE"] = pd.to_datetime(
+        df["IYEAR"].astype(str) + "-" + df["IMONTH"].astype(str) + "-" + df["IDAY"].astype(str),
+        format="%Y-%m-%d",
+    )
+
+    # INDEX starts at 0 each July 1; cumulative sums of COLD_F and HOT_F reset on July 1.
+    # Segmenting by season (not by counting July 1 rows) lets any subset of winters be built alone.
+    df["SEASON"] = get_season_start_years(df)
+    df = add_degree_days(df, default_degree_day_indices, segment_columns=["SEASON"])
+    df = add_stefan_depths(df, code)
+    return df[season_columns]
+
+
+def read_daily_data(code) -> pd.DataFrame:
+    """Read daily_temps_{code}.csv (daily columns only)"""
+    f = get_data_processed_path_from_code_folder(get_daily_file_name(code))
+    logger.info(f"Reading from processed data file {f}")
+    return pd.read_csv(f, usecols=daily_columns)
+
+
+def write_winter_files(code, df: pd.DataFrame, winter_start_years):
+    """Write one daily_temps_{winter}_{code}.csv per winter (July 1 - June 30)"""
+    for startYear in winter_start_years:
+        start_date = pd.to_datetime(f"{startYear}-07-01")
+        end_date = pd.to_datetime(f"{startYear+1}-06-30")
+        yearString = f"{startYear}-{startYear+1}"
+        df_year = df[(df["DATE"] >= start_date) & (df["DATE"] <= end_date)]
+        f = get_data_processed_path_from_code_folder(get_winter_file_name(code, yearString))
+        enforce_table_schema(df_year, "daily_temps").to_csv(f, index=False)
+        logger.info(f"Saved {len(df_year)} days to {f}")
+
+
+def get_season_manifest_path(code):
+    folder = get_data_processed_path_from_code_folder(season_manifest_folder_name)
+    return folder.joinpath(f"{code.lower()}.json")
+
+
+def read_season_manifest(code) -> dict:
+    """Return {winter start year (str): {"hash", "rows"}} from the last build (empty if none)"""
+    f = get_season_manifest_path(code)
+    if not f.exists():
+        return {}
+    manifest = json.loads(f.read_text())
+    if manifest.get("version") != season_build_version:
+        return {}
+    return manifest["winters"]
+
+
+def write_season_manifest(code, winters: dict):
+    f = get_season_manifest_path(code)
+    f.parent.mkdir(parents=True, exist_ok=True)
+    manifest = {"station": code, "version": season_build_version, "winters": winters}
+    f.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def hash_season_inputs(df: pd.DataFrame, code) -> str:
+    """Hash one winter's daily rows (values and order) and the station's soil parameters
+    (STEFAN_DEPTH_in depends on both)"""
+    row_hashes = pd.util.hash_pandas_object(df[daily_columns], index=False)
+    digest = hashlib.sha256(str(season_build_version).encode())
+    digest.update(json.dumps(get_soil_parameters(code), sort_keys=True).encode())
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def get_changed_seasons(code, df: pd.DataFrame, winter_start_years, full=False):
+    """Compare each winter's input hash with the manifest.
+    @return: (start years to rebuild, manifest entries for the winters whose files are
+    current: the requested winters, plus the previous entries of the others)"""
+    seasons = get_season_start_years(df)
+    previous = read_season_manifest(code)
+    old = {} if full else previous
+    latest = int(seasons.max()) if len(seasons) else None
+    changed, winters = [], {}
+    for startYear, df_season in df.groupby(seasons):
+        startYear = int(startYear)
+        entry = {"hash": hash_season_inputs(df_season, code), "rows": len(df_season)}
+        f = get_data_processed_path_from_code_folder(
+            get_winter_file_name(code, f"{startYear}-{startYear+1}")
+        )
+        missing = startYear in winter_start_years and not f.exists()
+        if old.get(str(startYear)) != entry or missing or startYear == latest:
+            changed.append(startYear)
+        if startYear in winter_start_years:
+            winters[str(startYear)] = entry
+        elif str(startYear) in previous:
+            # Not written this run: keep what its file was built from, so a later run
+            # that includes the winter still sees it as changed
+            winters[str(startYear)] = previous[str(startYear)]
+    return changed, winters
+
+
+def make_season_data(code, winter_start_years, full=False):
+    """Rebuild the winters whose daily inputs changed since the last build.
+    The manifest is not written here: call write_season_manifest with the returned entries
+    once the rebuilt rows are also in the daily cube, so a failed cube write is retried.
+    @return: (the rebuilt winters' rows with the season columns (empty if none changed),
+    the new manifest entries)"""
+    df = read_daily_data(code)
+    winter_start_years = list(winter_start_years)
+
+    # The cube holds every winter; rebuild them all if this station is not in it yet
+    cube_index = read_cube_index()
+    full = full or cube_index is None or code not in cube_index["stations"]
+
+    changed, winters = get_changed_seasons(code, df, winter_start_years, full)
+    logger.info(f"{code}: rebuilding {len(changed)} of {len(winters)} winters {changed}")
+    df_changed = add_season_columns(df[get_season_start_years(df).isin(changed)], code)
+    write_winter_files(code, df_changed, [y for y in winter_start_years if y in changed])
+    return df_changed, winters
+
+
+# ENGINE
+
+
+def ingest_station(code, stages, winter_start_years, full=False) -> dict:
+    """Run the stages for one station (in a worker process).
+    Never raises: failures are returned so other stations keep going."""
+    result = {"station": code, "ok": True, "stages": {}, "error": None}
+    try:
+        for stage in stages:
+            start = time.perf_counter()
+            if stage == "daily":
+                df = make_daily_data(code)
+            elif stage == "seasons":
+                df, result["season_manifest"] = make_season_data(code, winter_start_years, full)
+                result["season_df"] = df
+            else:
+                raise ValueError(f"Unknown stage {stage}. Choose from {ingest_stages}")
+            seconds = round(time.perf_counter() - start, 3)
+            result["stages"][stage] = {"seconds": seconds, "rows": len(df)}
+    except Exception as e:
+        result["ok"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    return result
+
+
+def update_cube_and_manifests(results):
+    """Write the rebuilt winters of every station into the daily cube, then save each
+    station's season manifest. If the cube write fails, no manifest is saved (the winters
+    are rebuilt next run) and those stations are marked failed."""
+    season_dfs = {}
+    for result in results:
+        season_df = result.pop("season_df", None)
+        if season_df is not None and not season_df.empty:
+            season_dfs[result["station"]] = season_df
+    try:
+        if season_dfs:
+            update_daily_cube_stations(season_dfs)
+    except Exception as e:
+        logger.error(f"Daily cube update FAILED: {type(e).__name__}: {e}")
+        for result in results:
+            if result["station"] in season_dfs:
+                result["ok"] = False
+                result["error"] = f"daily cube: {type(e).__name__}: {e}"
+                result.pop("season_manifest", None)
+    for result in results:
+        winters = result.pop("season_manifest", None)
+        if result["ok"] and winters is not None:
+            write_season_manifest(result["station"], winters)
+
+
+def run_ingestion(
+    codes=None, stages=None, winter_start_years=None, max_workers=None, full=False
+) -> list:
+    """Ingest many stations in parallel and return one result per station.
+    The daily cube is updated in this process once every station is done, since all
+    stations share its files. Only changed winters are rebuilt unless full is True."""
+    codes = codes or list(get_station_registry())
+    stages = stages or ingest_stages
+    if winter_start_years is None:
+        winter_start_years = range(min_winter_start_year, max_winter_start_year + 1)
+    winter_start_years = list(winter_start_years)
+
+    results = []
+    logger.info(f"Ingesting {len(codes)} stations ({', '.join(stages)}), workers: {max_workers}")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(ingest_station, code, stages, winter_start_years, full): code
+            for code in codes
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            code = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. out of memory)
+                result = {"station": code, "ok": False, "stages": {}, "error": repr(e)}
+            if result["ok"]:
+                logger.info(f"[{done}/{len(codes)}] {code} done: {result['stages']}")
+            else:
+                logger.error(f"[{done}/{len(codes)}] {code} FAILED: {result['error']}")
+                logger.debug(result.get("traceback", ""))
+            results.append(result)
+
+    update_cube_and_manifests(results)
+
+    failed = [r["station"] for r in results if not r["ok"]]
+    logger.info(f"Ingested {len(results) - len(failed)} of {len(results)} stations")
+    if failed:
+        logger.error(f"Failed stations: {failed}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest hourly data for registered stations")
+    parser.add_argument("--stations", nargs="+", default=None, help="codes (default: all)")
+    parser.add_argument("--stages", nargs="+", default=ingest_stages, choices=ingest_stages)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPUs)")
+    parser.add_argument("--first-winter", type=int, default=min_winter_start_year)
+    parser.add_argument("--last-winter", type=int, default=max_winter_start_year)
+    parser.add_argument("--full", action="store_true", help="rebuild every winter")
+    args = parser.parse_args()
+
+    winter_start_years = range(args.first_winter, args.last_winter + 1)
+    results = run_ingestion(
+        args.stations, args.stages, winter_start_years, args.workers, args.full
+    )
+    if not all(r["ok"] for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Streaming reader for raw NOAA Global Hourly (ISD) CSV downloads, e.g.
+
+/data/1_raw/MoreEly_HourlyTemps_2023_05_01_3323565.csv
+
+    STATION,NAME,...,DATE,SOURCE,REPORT_TYPE,CALL_SIGN,QUALITY_CONTROL,TMP
+    72745994964,"ELY MUNICIPAL AIRPORT, MN US",...,2023-03-31T00:15:00,7,FM-15,KELO ,V020,"+0010,5"
+
+TMP is tenths of a degree C with a quality code: "+0010,5" is 1.0 C, quality 5.
+"+9999" is missing. Quality codes 2, 3, 6, and 7 mark suspect or erroneous values.
+
+Files are read in chunks of rows; each chunk is parsed with vectorized string
+operations, filtered, and folded into running per-station, per-day sums and counts.
+Memory stays bounded by the chunk size plus one sum/count per station-day,
+so multi-year files for a whole region do not need to fit in memory.
+
+Daily means match the Excel import (SOURCE 7, UTC days, TMP_F from TMP_C per reading):
+
+    df = read_isd_daily_means(paths, stations=["72745994964"])
+    # STATION, IYEAR, IMONTH, IDAY, AVG_DAILY_TEMP_F, N_READINGS
+"""
+
+import pathlib
+
+import pandas as pd
+
+from freezetracker.common_logger import get_logger
+
+logger = get_logger("isd_hourly")
+
+isd_columns = ["STATION", "DATE", "SOURCE", "QUALITY_CONTROL", "TMP"]
+isd_missing_tenths_c = 9999
+
+# SOURCE 7 is ASOS/AWOS merged with USAF surface hourly (what the Excel import kept)
+default_sources = ["7"]
+
+# TMP quality codes for values that passed (or were not flagged by) NOAA checks
+good_quality_codes = ["0", "1", "4", "5", "9", "A", "C", "I", "M", "P", "R", "U"]
+
+# Fold the per-chunk partial sums together once this many have been collected
+partials_per_compaction = 32
+
+
+def is_isd_csv(path) -> bool:
+    """Return True if a CSV file has the ISD columns this reader needs"""
+    header = pd.read_csv(path, nrows=0).columns
+    return all(column in header for column in isd_columns)
+
+
+def parse_isd_temperature(tmp: pd.Series) -> pd.DataFrame:
+    """Split TMP strings ("+0010,5") into TMP_F (NaN if missing) and TMP_QUALITY"""
+    tenths_c = pd.to_numeric(tmp.str.slice(0, 5), errors="coerce")
+    tenths_c = tenths_c.where(tenths_c != isd_missing_tenths_c)
+    return pd.DataFrame(
+        {
+            "TMP_F": tenths_c / 10.0 * 9.0 / 5.0 + 32.0,
+            "TMP_QUALITY": tmp.str.slice(6, 7),
+        },
+        index=tmp.index,
+    )
+
+
+def filter_isd_chunk(chunk, stations, sources, quality_controls, quality_codes) -> pd.DataFrame:
+    """Keep readings from the wanted stations and sources with a usable temperature"""
+    keep = chunk["SOURCE"].isin(sources)
+    if stations is not None:
+        keep &= chunk["STATION"].isin(stations)
+    if quality_controls is not None:
+        keep &= chunk["QUALITY_CONTROL"].isin(quality_controls)
+    chunk = chunk[keep]
+    temps = parse_isd_temperature(chunk["TMP"])
+    usable = temps["TMP_F"].notna() & temps["TMP_QUALITY"].isin(quality_codes)
+    return pd.DataFrame(
+        {
+            "STATION": chunk["STATION"][usable],
+            "DAY": chunk["DATE"].str.slice(0, 10)[usable],
+            "TMP_F": temps["TMP_F"][usable],
+        }
+    )
+
+
+class DailyMeans:
+    """Running per-station, per-day sums and counts of readings"""
+
+    def __init__(self):
+        self.partials = []
+        self.rows_read = 0
+        self.rows_used = 0
+
+    def add(self, readings: pd.DataFrame):
+        """Fold one chunk of filtered readings (STATION, DAY, TMP_F) into the totals"""
+        self.rows_used += len(readings)
+        if readings.empty:
+            return
+        self.partials.append(readings.groupby(["STATION", "DAY"])["TMP_F"].agg(["sum", "count"]))
+        if len(self.partials) >= partials_per_compaction:
+            self.compact()
+
+    def compact(self):
+        if len(self.partials) > 1:
+            totals = pd.concat(self.partials).groupby(level=["STATION", "DAY"]).sum()
+            self.partials = [totals]
+
+    def result(self) -> pd.DataFrame:
+        """Return STATION, IYEAR, IMONTH, IDAY, AVG_DAILY_TEMP_F, N_READINGS sorted by day"""
+        columns = ["STATION", "IYEAR", "IMONTH", "IDAY", "AVG_DAILY_TEMP_F", "N_READINGS"]
+        self.compact()
+        if not self.partials:
+            return pd.DataFrame(columns=columns)
+        totals = self.partials[0].reset_index()
+        days = totals["DAY"].str.split("-", expand=True).astype(int)
+        df = pd.DataFrame(
+            {
+                "STATION": totals["STATION"],
+                "IYEAR": days[0],
+                "IMONTH": days[1],
+                "IDAY": days[2],
+                "AVG_DAILY_TEMP_F": totals["sum"] / totals["count"],
+                "N_READINGS": totals["count"].astype(int),
+            }
+        )
+        return df.sort_values(["STATION", "IYEAR", "IMONTH", "IDAY"], ignore_index=True)
+
+
+def read_isd_daily_means(
+    paths,
+    stations=None,
+    sources=None,
+    quality_controls=None,
+    quality_codes=None,
+    chunksize=50_000,
+) -> pd.DataFrame:
+    """Stream ISD CSV files into daily mean temperatures (F)
+    @param paths: CSV files (any number of stations and years each)
+    @param stations: STATION ids to keep, e.g. ["72745994964"], or None for all
+    @param sources: SOURCE codes to keep (default ["7"])
+    @param quality_controls: QUALITY_CONTROL values to keep (e.g. ["V020"]), or None for all
+    @param quality_codes: TMP quality codes to keep (default: all but suspect/erroneous)
+    @param chunksize: rows per chunk
+    @return: one row per station and UTC day"""
+    sources = default_sources if sources is None else sources
+    quality_codes = good_quality_codes if quality_codes is None else quality_codes
+    daily_means = DailyMeans()
+    for path in paths:
+        logger.info(f"Streaming hourly readings from {path}")
+        reader = pd.read_csv(path, usecols=isd_columns, dtype=str, chunksize=chunksize)
+        for chunk in reader:
+            daily_means.rows_read += len(chunk)
+            readings = filter_isd_chunk(chunk, stations, sources, quality_controls, quality_codes)
+            daily_means.add(readings)
+    logger.info(f"Used {daily_means.rows_used} of {daily_means.rows_read} hourly readings")
+    return daily_means.result()
+
+
+def get_raw_isd_csv_paths(raw_data_path: pathlib.Path) -> list:
+    """Return the ISD CSV files in the raw data folder (other CSVs are skipped)"""
+    return [f for f in sorted(raw_data_path.glob("*.csv")) if is_isd_csv(f)]
+
+
+def merge_daily_data(old_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """Add new days to processed daily data; days in both take the new value"""
+    key = ["IYEAR", "IMONTH", "IDAY"]
+    df = pd.concat([old_df, new_df[old_df.columns]], ignore_index=True)
+    df = df.drop_duplicates(subset=key, keep="last")
+    return df.sort_values(key, ignore_index=True)
@@ -0,0 +1,238 @@
+"""
+Nowcast today's frost depth for every station from its cumulative cold loading.
+
+A straight line FROST_DEPTH_in = slope * CUMM_COLD_F + intercept is fit per station
+(CITY) to the days with a frost probe reading (DEPTH_MEASURED) in every winter of the
+cold_loading_vs_frost_depth store. The model keeps each station's sufficient statistics
+(n, means, and centered sums sxx, sxy, syy; see regression.py), so:
+
+    train               one grouped pass over all stations and winters
+    update              adds one daily observation to a station in O(1) (Welford's update)
+    add_measured_days   updates with the probe readings newer than the saved fit
+    predict             depth and a prediction band for many stations in one array operation
+
+The band is a 90% prediction interval, with depths clipped at 0:
+
+    depth +/- nowcast_interval_z * residual_std * sqrt(1 + 1/n + (x - x_mean)^2 / sxx)
+
+With no cold loading (CUMM_COLD_F <= 0) there is no frost, so the depth and band are 0
+there, not the fit's intercept. A station whose latest day is in an earlier winter than
+today is marked CURRENT_WINTER False, so the app does not show its depth as today's.
+
+The model is saved as data/2_processed/frost_nowcast_model.json by script_3_make_store.py
+(after the store it is trained from) and bundled for the WASM app by script_4_make_bundle.py.
+app.py imports the model and shows the nowcast in the sidebar.
+
+In the src/freezetracker folder, run:
+
+    python nowcast.py             (train, save, and print today's nowcast)
+
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from freezetracker.common_content import get_data_processed_path_from_code_folder
+from freezetracker.common_logger import get_logger
+from freezetracker.regression import fit_lines
+from freezetracker.season_calendar import get_winter_start_years
+
+logger = get_logger("nowcast")
+
+nowcast_model_file_name = "frost_nowcast_model.json"
+
+# Two-sided 90% normal quantile for the prediction band
+nowcast_interval_z = 1.645
+
+nowcast_stat_columns = ["n", "x_mean", "y_mean", "sxx", "sxy", "syy"]
+
+
+class NowcastModel:
+    """Per-station linear fit of FROST_DEPTH_in on CUMM_COLD_F, kept as sufficient statistics"""
+
+    def __init__(self, stations=(), stats=None, trained_through=None):
+        """@param stations: station codes, one per row of stats
+        @param stats: array (stations x nowcast_stat_columns)"""
+        self.stations = list(stations)
+        self.index = {code: i for i, code in enumerate(self.stations)}
+        shape = (len(self.stations), len(nowcast_stat_columns))
+        self.stats = np.zeros(shape) if stats is None else np.asarray(stats, dtype=float)
+        self.trained_through = trained_through
+
+    @classmethod
+    def train(cls, df: pd.DataFrame) -> "NowcastModel":
+        """Fit every station at once from cold_loading_vs_frost_depth rows
+        (CITY, DATE, CUMM_COLD_F, FROST_DEPTH_in, DEPTH_MEASURED)"""
+        measured = df[df["DEPTH_MEASURED"].astype(bool)]
+        fits = fit_lines(measured, "CUMM_COLD_F", "FROST_DEPTH_in", "CITY")
+        trained_through = None
+        if len(measured):
+            trained_through = pd.Timestamp(measured["DATE"].max()).strftime("%Y-%m-%d")
+        model = cls(
+            [str(code) for code in fits.index],
+            fits[nowcast_stat_columns].to_numpy(),
+            trained_through,
+        )
+        logger.info(f"Trained nowcast for {len(model.stations)} stations on {len(measured)} days")
+        return model
+
+    def update(self, station, cumm_cold_f, frost_depth_in):
+        """Add one observation to a station's fit (a new station starts empty)"""
+        i = self.index.get(station)
+        if i is None:
+            i = self.index[station] = len(self.stations)
+            self.stations.append(station)
+            self.stats = np.vstack([self.stats, np.zeros(len(nowcast_stat_columns))])
+        row = self.stats[i]
+        row[0] += 1
+        dx = cumm_cold_f - row[1]
+        dy = frost_depth_in - row[2]
+        row[1] += dx / row[0]
+        row[2] += dy / row[0]
+        row[3] += dx * (cumm_cold_f - row[1])
+        row[4] += dx * (frost_depth_in - row[2])
+        row[5] += dy * (frost_depth_in - row[2])
+
+    def add_measured_days(self, df: pd.DataFrame) -> int:
+        """Add the probe readings dated after trained_through, one update each
+        @return: the number of readings added"""
+        measured = df[df["DEPTH_MEASURED"].astype(bool)]
+        measured = measured.dropna(subset=["CUMM_COLD_F", "FROST_DEPTH_in"])
+        if self.trained_through is not None:
+            measured = measured[measured["DATE"] > pd.Timestamp(self.trained_through)]
+        for code, x, y in zip(
+            measured["CITY"].astype(str), measured["CUMM_COLD_F"], measured["FROST_DEPTH_in"]
+        ):
+            self.update(code, float(x), float(y))
+        if len(measured):
+            self.trained_through = pd.Timestamp(measured["DATE"].max()).strftime("%Y-%m-%d")
+        return len(measured)
+
+    def coefficients(self) -> pd.DataFrame:
+        """Slope, intercept, and residual_std per station (NaN until a station has 3 points)"""
+        n, x_mean, y_mean, sxx, sxy, syy = self.stats.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+            sse = np.maximum(syy - slope * sxy, 0.0)
+            residual_std = np.where(n > 2, np.sqrt(sse / (n - 2)), np.nan)
+        return pd.DataFrame(
+            {
+                "n": n.astype(int),
+                "slope": slope,
+                "intercept": y_mean - slope * x_mean,
+                "residual_std": residual_std,
+            },
+            index=pd.Index(self.stations, name="CITY"),
+        )
+
+    def predict(self, stations, cumm_cold_f, z=nowcast_interval_z) -> pd.DataFrame:
+        """Predict frost depth (in) and its band for each (station, CUMM_COLD_F) pair at once
+        @return: CITY, CUMM_COLD_F, FROST_DEPTH_in, FROST_DEPTH_LOW_in, FROST_DEPTH_HIGH_in
+        (NaN for stations the model does not know; 0 where CUMM_COLD_F <= 0)"""
+        stations = list(stations)
+        x = np.asarray(cumm_cold_f, dtype=float)
+        rows = np.array([self.index.get(code, -1) for code in stations], dtype=int)
+        stats = np.vstack([self.stats, np.full(len(nowcast_stat_columns), np.nan)])[rows]
+        n, x_mean, y_mean, sxx, sxy, syy = stats.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+            residual_std = np.sqrt(np.maximum(syy - slope * sxy, 0.0) / (n - 2))
+            depth = y_mean + slope * (x - x_mean)
+            spread = z * residual_std * np.sqrt(1 + 1 / n + (x - x_mean) ** 2 / sxx)
+        # No cold loading, no frost (for the stations the model knows)
+        no_frost = (x <= 0) & (rows >= 0)
+        return pd.DataFrame(
+            {
+                "CITY": stations,
+                "CUMM_COLD_F": x,
+                "FROST_DEPTH_in": np.where(no_frost, 0.0, np.maximum(depth, 0.0)),
+                "FROST_DEPTH_LOW_in": np.where(no_frost, 0.0, np.maximum(depth - spread, 0.0)),
+                "FROST_DEPTH_HIGH_in": np.where(no_frost, 0.0, np.maximum(depth + spread, 0.0)),
+            }
+        )
+
+    def to_dict(self) -> dict:
+        columns = ["slope", "intercept", "residual_std"]
+        coefficients = self.coefficients()[columns].to_numpy().tolist()
+        stations = {}
+        for code, stats, values in zip(self.stations, self.stats.tolist(), coefficients):
+            entry = dict(zip(nowcast_stat_columns, stats))
+            entry.update({c: None if np.isnan(v) else v for c, v in zip(columns, values)})
+            stations[code] = entry
+        return {
+            "x": "CUMM_COLD_F",
+            "y": "FROST_DEPTH_in",
+            "trained_through": self.trained_through,
+            "stations": stations,
+        }
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "NowcastModel":
+        stations = list(content["stations"])
+        stats = [
+            [content["stations"][code][column] for column in nowcast_stat_columns]
+            for code in stations
+        ]
+        shape = (len(stations), len(nowcast_stat_columns))
+        stats = np.array(stats, dtype=float).reshape(shape)
+        return cls(stations, stats, content.get("trained_through"))
+
+    def save(self, fname=nowcast_model_file_name):
+        path = get_data_processed_path_from_code_folder(fname)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        logger.info(f"Wrote nowcast model for {len(self.stations)} stations to {path}")
+
+    @classmethod
+    def load(cls, fname=nowcast_model_file_name) -> "NowcastModel":
+        path = get_data_processed_path_from_code_folder(fname)
+        return cls.from_dict(json.loads(path.read_text()))
+
+
+def get_latest_cold_loading(daily_df: pd.DataFrame, today=None) -> pd.DataFrame:
+    """Last day of each station in daily_temps rows (on or before today, if given):
+    CITY, DATE, CUMM_COLD_F"""
+    df = daily_df[["CITY", "DATE", "CUMM_COLD_F"]].dropna()
+    if today is not None:
+        df = df[df["DATE"] < pd.Timestamp(today).normalize() + pd.Timedelta(days=1)]
+    df = df.sort_values("DATE", kind="stable").groupby("CITY", observed=True).tail(1)
+    df = df.assign(CITY=df["CITY"].astype(str))
+    return df.sort_values("CITY").reset_index(drop=True)
+
+
+def nowcast_frost_depths(model: NowcastModel, daily_df: pd.DataFrame, today=None) -> pd.DataFrame:
+    """Predict each station's frost depth for today (default: the current date), in one
+    batched call, from its cold loading on its latest day up to today.
+    @return: model.predict() columns plus NOWCAST_DATE (today), DATE, the day the cold
+    loading is from (earlier than today when the station's data is behind), and
+    CURRENT_WINTER, False when DATE is in an earlier winter than today"""
+    today = pd.Timestamp.now() if today is None else pd.Timestamp(today)
+    today = today.normalize()
+    latest = get_latest_cold_loading(daily_df, today)
+    predicted = model.predict(latest["CITY"], latest["CUMM_COLD_F"])
+    predicted.insert(1, "NOWCAST_DATE", today)
+    predicted.insert(2, "DATE", latest["DATE"].to_numpy())
+    current_winter = get_winter_start_years([today])[0]
+    predicted["CURRENT_WINTER"] = get_winter_start_years(latest["DATE"]) == current_winter
+    return predicted
+
+
+def main():
+    """Train from the stores, save the model, and print today's nowcast"""
+    store_path = get_data_processed_path_from_code_folder("cold_loading_vs_frost_depth_store")
+    model = NowcastModel.train(pd.read_parquet(store_path, engine="pyarrow"))
+    model.save()
+    daily_df = pd.read_parquet(
+        get_data_processed_path_from_code_folder("daily_temps_store"),
+        engine="pyarrow",
+        columns=["CITY", "DATE", "CUMM_COLD_F"],
+    )
+    nowcast_df = nowcast_frost_depths(model, daily_df)
+    for column in ["NOWCAST_DATE", "DATE"]:
+        nowcast_df[column] = nowcast_df[column].dt.strftime("%Y-%m-%d")
+    print(nowcast_df.round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Least-squares best-fit lines for many groups at once (e.g. every station and winter).
+
+fit_lines() centers x and y within each group and sums the products in one grouped pass:
+
+    sxx, sxy, syy      sums of dx*dx, dx*dy, dy*dy (dx = x - group mean of x)
+    slope              sxy / sxx
+    intercept          mean y - slope * mean x
+    r2                 sxy^2 / (sxx * syy)
+    residual_std       sqrt((syy - slope * sxy) / (n - 2)), the spread around the line
+
+Groups with fewer than two distinct x values get NaN for the slope and everything after it.
+A line is drawn from its two endpoints (get_line_endpoints). The means and sums are
+returned too, so a fit can be extended one point at a time (see nowcast.py).
+
+The cold loading vs frost depth charts use this for the line per winter, without sklearn.
+app.py imports it (script_5_make_wasm_app.py vendors it into the WASM build).
+"""
+
+import numpy as np
+import pandas as pd
+
+from freezetracker.common_logger import get_logger
+
+logger = get_logger("regression")
+
+fit_columns = [
+    "n",
+    "slope",
+    "intercept",
+    "r2",
+    "residual_std",
+    "x_mean",
+    "y_mean",
+    "sxx",
+    "sxy",
+    "syy",
+]
+
+
+def fit_lines(df: pd.DataFrame, x, y, by) -> pd.DataFrame:
+    """Fit y = slope * x + intercept for every group of df in one pass
+    @param x, y: column names (rows missing either are left out)
+    @param by: column name or list of names to group by
+    @return: one row per group (indexed by the by columns) with fit_columns"""
+    by = [by] if isinstance(by, str) else list(by)
+    data = df[by + [x, y]].dropna(subset=[x, y])
+    data = data.astype({x: float, y: float})
+    x_values = data[x]
+    y_values = data[y]
+    groups = data.groupby(by, observed=True, sort=True)
+    x_mean = groups[x].transform("mean")
+    y_mean = groups[y].transform("mean")
+    dx = x_values - x_mean
+    dy = y_values - y_mean
+
+    sums = (
+        data[by]
+        .assign(n=1, sxx=dx * dx, sxy=dx * dy, syy=dy * dy, x_mean=x_mean, y_mean=y_mean)
+        .groupby(by, observed=True, sort=True)
+        .agg(
+            n=("n", "sum"),
+            sxx=("sxx", "sum"),
+            sxy=("sxy", "sum"),
+            syy=("syy", "sum"),
+            x_mean=("x_mean", "first"),
+            y_mean=("y_mean", "first"),
+        )
+    )
+    n = sums["n"].to_numpy()
+    sxx = sums["sxx"].to_numpy()
+    sxy = sums["sxy"].to_numpy()
+    syy = sums["syy"].to_numpy()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+        sse = np.maximum(syy - slope * sxy, 0.0)
+        sums["slope"] = slope
+        sums["intercept"] = sums["y_mean"].to_numpy() - slope * sums["x_mean"].to_numpy()
+        sums["r2"] = np.where(np.isfinite(slope) & (syy > 0), sxy * sxy / (sxx * syy), np.nan)
+        sums["residual_std"] = np.where(n > 2, np.sqrt(sse / (n - 2)), np.nan)
+    logger.info(f"Fit {len(sums)} lines to {len(data)} rows")
+    return sums[fit_columns]
+
+
+def get_line_endpoints(fit, xmin, xmax) -> list:
+    """Return the two (x, y) points of a fitted line (one row of fit_lines) at xmin and xmax"""
+    return [(x, fit["slope"] * x + fit["intercept"]) for x in (xmin, xmax)]
@@ -0,0 +1,111 @@
+"""
+This script reads the per-winter processed files
+
+/data/2_processed/daily_temps_2010-2011_ely.csv
+etc.
+
+and writes them into a columnar Parquet store partitioned by station and winter:
+
+/data/2_processed/daily_temps_store/CITY=ELY/Winter=2010-2011/part-0.parquet
+
+It then joins every station and winter with the frost probe readings of its county
+(frost_stlouis_out.csv, interpolated between readings, see frost_join.py) and writes
+
+/data/2_processed/cold_loading_vs_frost_depth_store/CITY=ORR/Winter=2010-2011/part-0.parquet
+
+Last, it fits the frost depth nowcast for every station from that store (see nowcast.py):
+
+/data/2_processed/frost_nowcast_model.json
+
+Columns are typed by the schema registry (data_schema.py) and the derived
+DATE and Days fields are stored,
+so the app reads what it needs in one call without re-parsing dates.
+
+Run after the make years scripts (and after the app has prepared frost_stlouis_out.csv).
+"""
+
+import pathlib
+import shutil
+
+import pandas as pd
+
+from freezetracker.common_content import max_winter_start_year, min_winter_start_year
+from freezetracker.common_logger import get_logger
+from freezetracker.data_schema import apply_table_schema, enforce_table_schema
+from freezetracker.frost_join import join_frost_depths
+from freezetracker.nowcast import NowcastModel
+from freezetracker.stations import get_frost_counties
+
+logger = get_logger("script_3_make_store")
+
+# store name: (per-winter file pattern, cities with files)
+store_sources = {
+    "daily_temps": ("daily_temps_{winter}_{city}.csv", ["ELY", "ORR"]),
+}
+frost_file_name = "frost_stlouis_out.csv"
+
+
+def get_processed_data_path() -> pathlib.Path:
+    package_path = pathlib.Path.cwd()
+    src_path = package_path.parent
+    root_path = src_path.parent
+    return root_path.joinpath("data").joinpath("2_processed")
+
+
+def read_store_source_files(store_name) -> pd.DataFrame:
+    """Read all per-winter files for a store into one typed data frame"""
+    file_pattern, cities = store_sources[store_name]
+    processed_data_path = get_processed_data_path()
+    dfs = []
+    for city in cities:
+        for startYear in range(min_winter_start_year, max_winter_start_year + 1):
+            winter = f"{startYear}-{startYear+1}"
+            f = processed_data_path.joinpath(file_pattern.format(winter=winter, city=city.lower()))
+            if not f.exists():
+                logger.warning(f"Skipping missing file {f}")
+                continue
+            df = pd.read_csv(f)
+            df["CITY"] = city
+            df["Winter"] = winter
+            df["DATE"] = pd.to_datetime(df["DATE"])
+            df["Days"] = (df["DATE"] - pd.Timestamp(year=startYear, month=7, day=1)).dt.days
+            dfs.append(df)
+    return enforce_table_schema(pd.concat(dfs, ignore_index=True), store_name)
+
+
+def write_store(store_name, df: pd.DataFrame):
+    """Write a data frame as a Parquet dataset partitioned by CITY and Winter"""
+    store_path = get_processed_data_path().joinpath(f"{store_name}_store")
+    if store_path.exists():
+        shutil.rmtree(store_path)
+    logger.info(f"Writing {len(df)} rows to store {store_path}")
+    df.to_parquet(
+        store_path,
+        engine="pyarrow",
+        partition_cols=["CITY", "Winter"],
+        index=False,
+        basename_template="part-{i}.parquet",
+    )
+
+
+def make_cold_loading_vs_frost_depth(daily_df: pd.DataFrame) -> pd.DataFrame:
+    """Join all stations and winters with the frost readings in one pass"""
+    f = get_processed_data_path().joinpath(frost_file_name)
+    frost_df = apply_table_schema(pd.read_csv(f), "frost_stlouis_out")
+    df = join_frost_depths(daily_df, frost_df, get_frost_counties())
+    return enforce_table_schema(df, "cold_loading_vs_frost_depth")
+
+
+def main():
+    """Main entry point of the script"""
+    logger.info("START make store script")
+    daily_df = read_store_source_files("daily_temps")
+    write_store("daily_temps", daily_df)
+    frost_df = make_cold_loading_vs_frost_depth(daily_df)
+    write_store("cold_loading_vs_frost_depth", frost_df)
+    NowcastModel.train(frost_df).save()
+    logger.info("FINISHED make store script")
+
+
+if __name__ == "__main__":
+    main()
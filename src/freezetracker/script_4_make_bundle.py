@@ -0,0 +1,149 @@
+"""
+This script packs everything the dashboard reads from data/2_processed
+(plus config.ini) into one compressed, versioned bundle:
+
+/data/2_processed/data_bundle.zip
+    index.json                              version, tables, and file aliases
+    config.ini
+    frost_nowcast_model.json
+    frost_depth.parquet
+    frost_span.parquet
+    frost_stlouis_out.parquet
+    daily_temps_store.parquet               whole store, one table
+    cold_loading_vs_frost_depth_store.parquet
+
+In WASM the app fetches the bundle once and serves every table from memory.
+Per-winter CSV names (e.g. daily_temps_2010-2011_ely.csv) are listed in the index
+as aliases: a store table plus the filters that select that winter and city.
+
+Run after script_3_make_store.py.
+"""
+
+import hashlib
+import io
+import json
+import pathlib
+import zipfile
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from freezetracker.common_logger import get_logger
+from freezetracker.data_schema import apply_table_schema, get_table_name
+
+logger = get_logger("script_4_make_bundle")
+
+bundle_file_name = "data_bundle.zip"
+bundle_csv_files = ["frost_depth.csv", "frost_span.csv", "frost_stlouis_out.csv"]
+bundle_store_names = ["daily_temps", "cold_loading_vs_frost_depth"]
+bundle_files = ["frost_nowcast_model.json"]
+bundle_store_file_patterns = {
+    "daily_temps": "daily_temps_{winter}_{city}.csv",
+}
+
+
+def get_root_path() -> pathlib.Path:
+    package_path = pathlib.Path.cwd()
+    src_path = package_path.parent
+    return src_path.parent
+
+
+def get_processed_data_path() -> pathlib.Path:
+    return get_root_path().joinpath("data").joinpath("2_processed")
+
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """Uncompressed Parquet: the zip deflates it, and the browser needs no codec"""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, engine="pyarrow", index=False, compression=None)
+    return buffer.getvalue()
+
+
+def get_store_aliases(store_name, df: pd.DataFrame) -> dict:
+    """Map each per-winter CSV name to the store filters that select its rows"""
+    if store_name not in bundle_store_file_patterns:
+        return {}
+    file_pattern = bundle_store_file_patterns[store_name]
+    processed_data_path = get_processed_data_path()
+    aliases = {}
+    for (city, winter), _ in df.groupby(["CITY", "Winter"], observed=True):
+        fname = file_pattern.format(winter=winter, city=str(city).lower())
+        csv_path = processed_data_path.joinpath(fname)
+        if not csv_path.exists():
+            continue
+        aliases[fname] = {
+            "table": f"{store_name}_store",
+            "filters": [["CITY", "==", str(city)], ["Winter", "==", str(winter)]],
+            "columns": list(pd.read_csv(csv_path, nrows=0).columns),
+        }
+    return aliases
+
+
+def build_bundle_members():
+    """Return (members, index) for the bundle"""
+    processed_data_path = get_processed_data_path()
+    members = {}
+    tables = {}
+    aliases = {}
+
+    for fname in bundle_csv_files:
+        df = apply_table_schema(pd.read_csv(processed_data_path.joinpath(fname)), get_table_name(fname))
+        member = fname.replace(".csv", ".parquet")
+        members[member] = to_parquet_bytes(df)
+        tables[fname] = {"member": member, "rows": len(df), "columns": list(df.columns)}
+
+    for store_name in bundle_store_names:
+        df = pd.read_parquet(processed_data_path.joinpath(f"{store_name}_store"), engine="pyarrow")
+        member = f"{store_name}_store.parquet"
+        members[member] = to_parquet_bytes(df)
+        tables[f"{store_name}_store"] = {
+            "member": member,
+            "rows": len(df),
+            "columns": list(df.columns),
+        }
+        aliases.update(get_store_aliases(store_name, df))
+
+    members["config.ini"] = get_root_path().joinpath("config.ini").read_bytes()
+    files = {"config.ini": "config.ini"}
+    for fname in bundle_files:
+        path = processed_data_path.joinpath(fname)
+        if not path.exists():
+            logger.warning(f"Skipping missing file {path}")
+            continue
+        members[fname] = path.read_bytes()
+        files[fname] = fname
+
+    digest = hashlib.sha256()
+    for member in sorted(members):
+        digest.update(member.encode())
+        digest.update(members[member])
+
+    index = {
+        "version": digest.hexdigest()[:12],
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables": tables,
+        "aliases": aliases,
+        "files": files,
+    }
+    return members, index
+
+
+def write_bundle(members, index):
+    bundle_path = get_processed_data_path().joinpath(bundle_file_name)
+    with zipfile.ZipFile(bundle_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("index.json", json.dumps(index, indent=2))
+        for member in sorted(members):
+            archive.writestr(member, members[member])
+    logger.info(f"Wrote bundle version {index['version']} ({bundle_path.stat().st_size} bytes)")
+
+
+def main():
+    """Main entry point of the script"""
+    logger.info("START make bundle script")
+    members, index = build_bundle_members()
+    write_bundle(members, index)
+    logger.info("FINISHED make bundle script")
+
+
+if __name__ == "__main__":
+    main()
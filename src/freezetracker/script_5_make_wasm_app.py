@@ -0,0 +1,178 @@
+"""
+This script builds the single-file app that panel convert ships to the browser.
+
+app.py imports its shared code (season calendar, schemas, frost join, regression,
+nowcast, current conditions, ...) from the freezetracker package, which the browser
+does not have. This script vendors it: it follows app.py's freezetracker imports
+(including those inside functions, and the modules those import) and writes
+
+/build/wasm/app.py
+    a prelude holding the source of each module, which writes them to a temporary
+    freezetracker package on sys.path when the page starts
+    app.py itself, unchanged
+
+The vendored modules are the package files as they are when the script runs, so the
+browser runs the same code as panel serve. Then the built file is converted:
+
+    panel convert ../../build/wasm/app.py --to pyodide-worker --out . --requirements ...
+
+app.js and app.html are written next to app.py, as before. The requirements are the
+packages imported by app.py and the vendored modules (not freezetracker itself).
+
+In the src/freezetracker folder, run:
+
+    python script_5_make_wasm_app.py                (build and convert)
+    python script_5_make_wasm_app.py --no-convert   (build only)
+
+Run after script_4_make_bundle.py.
+"""
+
+import argparse
+import ast
+import pathlib
+import subprocess
+import sys
+
+from freezetracker.common_logger import get_logger
+
+logger = get_logger("script_5_make_wasm_app")
+
+package_name = "freezetracker"
+app_file_name = "app.py"
+requirements_file_name = "requirements.txt"
+
+prelude_template = '''# Vendored {package} modules (written by script_5_make_wasm_app.py)
+import pathlib as _pathlib
+import sys as _sys
+import tempfile as _tempfile
+
+_vendored_sources = {sources}
+
+
+def _install_vendored_package():
+    root_path = _pathlib.Path(_tempfile.mkdtemp(prefix="{package}_"))
+    package_path = root_path.joinpath("{package}")
+    package_path.mkdir()
+    package_path.joinpath("__init__.py").write_text("")
+    for name, source in _vendored_sources.items():
+        package_path.joinpath(f"{{name}}.py").write_text(source, encoding="utf-8")
+    _sys.path.insert(0, str(root_path))
+
+
+_install_vendored_package()
+
+'''
+
+
+def get_package_path() -> pathlib.Path:
+    return pathlib.Path.cwd()
+
+
+def get_build_path() -> pathlib.Path:
+    root_path = get_package_path().parent.parent
+    return root_path.joinpath("build").joinpath("wasm")
+
+
+def get_imported_modules(source) -> set:
+    """Return the freezetracker modules a source imports anywhere (also inside functions)"""
+    modules = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            if node.module == package_name:
+                modules.update(alias.name for alias in node.names)
+                continue
+            names = [node.module]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        else:
+            continue
+        for name in names:
+            parts = name.split(".")
+            if parts[0] == package_name and len(parts) > 1:
+                modules.add(parts[1])
+    return modules
+
+
+def collect_module_sources(app_source) -> dict:
+    """Return module name -> source for every module app.py needs, following imports"""
+    package_path = get_package_path()
+    sources = {}
+    pending = sorted(get_imported_modules(app_source))
+    while pending:
+        name = pending.pop()
+        if name in sources:
+            continue
+        sources[name] = package_path.joinpath(f"{name}.py").read_text(encoding="utf-8")
+        pending.extend(sorted(get_imported_modules(sources[name]) - sources.keys()))
+    return dict(sorted(sources.items()))
+
+
+def make_wasm_app_source(app_source, module_sources) -> str:
+    """Return the prelude (vendored modules) followed by app.py"""
+    entries = "".join(f"    {name!r}: {source!r},\n" for name, source in module_sources.items())
+    prelude = prelude_template.format(package=package_name, sources="{\n" + entries + "}")
+    return prelude + app_source
+
+
+def get_requirements(sources) -> list:
+    """Return the packages imported by the sources, without freezetracker"""
+    from panel.io.mime_render import find_requirements
+
+    requirements = set()
+    for source in sources:
+        requirements.update(find_requirements(source))
+    requirements.discard(package_name)
+    return sorted(requirements)
+
+
+def build_wasm_app() -> pathlib.Path:
+    """Write build/wasm/app.py and its requirements.txt, and return the app path"""
+    app_source = get_package_path().joinpath(app_file_name).read_text(encoding="utf-8")
+    module_sources = collect_module_sources(app_source)
+    build_path = get_build_path()
+    build_path.mkdir(parents=True, exist_ok=True)
+
+    app_path = build_path.joinpath(app_file_name)
+    app_path.write_text(make_wasm_app_source(app_source, module_sources), encoding="utf-8")
+    requirements = get_requirements([app_source, *module_sources.values()])
+    build_path.joinpath(requirements_file_name).write_text("\n".join(requirements) + "\n")
+    logger.info(f"Vendored {len(module_sources)} modules into {app_path}: {list(module_sources)}")
+    logger.info(f"Requirements: {requirements}")
+    return app_path
+
+
+def convert_wasm_app(app_path: pathlib.Path):
+    """Convert the built app to app.js and app.html next to app.py (run from this folder,
+    so the prerender reads the local data)"""
+    command = [
+        sys.executable,
+        "-m",
+        "panel",
+        "convert",
+        str(app_path),
+        "--to",
+        "pyodide-worker",
+        "--out",
+        ".",
+        "--requirements",
+        str(app_path.parent.joinpath(requirements_file_name)),
+    ]
+    logger.info(f"Running {' '.join(command)}")
+    subprocess.run(command, check=True)
+
+
+def main():
+    """Main entry point of the script"""
+    parser = argparse.ArgumentParser(description="Build (and convert) the single-file WASM app")
+    parser.add_argument("--no-convert", action="store_true", help="only write build/wasm")
+    args = parser.parse_args()
+
+    logger.info("START make wasm app script")
+    app_path = build_wasm_app()
+    if not args.no_convert:
+        convert_wasm_app(app_path)
+    logger.info("FINISHED make wasm app script")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Vectorized season calendar: winter start year, winter name, and days after July 1
+for whole columns of dates at once.
+
+A winter runs July 1 - June 30, so 2022-11-15 and 2023-04-15 are both in winter 2022-2023
+(start year 2022), and 2022-07-01 is day 0 of it.
+
+    dates = pd.to_datetime(df["Date"], format="%Y/%m/%d")
+    df["Winter"] = get_winter_names(dates)                 # "2022-2023"
+    df["days_after_Jul_1"] = get_days_after_Jul_1(dates)   # 0 .. 365
+
+The arithmetic runs on NumPy datetime64 months and days, with no per-row Python calls.
+app.py imports these; common_content.py keeps the one-date versions.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def get_season_start_months(dates) -> np.ndarray:
+    """Return July of each date's winter as datetime64[M]
+    @param dates: datetime-like Series, DatetimeIndex, or array with no missing values"""
+    values = pd.DatetimeIndex(dates).to_numpy(dtype="datetime64[ns]")
+    if np.isnat(values).any():
+        raise ValueError("Dates must not be missing to place them in a winter")
+    months = values.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]")
+    before_july = (months - years.astype("datetime64[M]")) < np.timedelta64(6, "M")
+    return years.astype("datetime64[M]") + np.where(before_july, -6, 6).astype("timedelta64[M]")
+
+
+def get_winter_start_years(dates) -> np.ndarray:
+    """Return each date's winter start year (July or later: this year, else last year)"""
+    return get_season_start_months(dates).astype("datetime64[Y]").astype("int64") + 1970
+
+
+def get_winter_names_from_start_years(start_years) -> np.ndarray:
+    """Return winter names like '2022-2023' for an array of start years"""
+    # Format each distinct year once, then spread the names back over the rows
+    unique_years, inverse = np.unique(np.asarray(start_years, dtype="int64"), return_inverse=True)
+    names = np.array([f"{year}-{year+1}" for year in unique_years], dtype=object)
+    return names[inverse]
+
+
+def get_winter_names(dates) -> np.ndarray:
+    """Return each date's winter name, e.g. '2022-2023'"""
+    return get_winter_names_from_start_years(get_winter_start_years(dates))
+
+
+def get_days_after_Jul_1(dates) -> np.ndarray:
+    """Return the number of days since July 1 of each date's winter (July 1 is 0)"""
+    values = pd.DatetimeIndex(dates).to_numpy(dtype="datetime64[ns]")
+    days = values.astype("datetime64[D]")
+    season_start = get_season_start_months(values).astype("datetime64[D]")
+    return (days - season_start).astype("int64")
+
+
+def add_season_calendar_columns(df: pd.DataFrame, date_column="Date") -> pd.DataFrame:
+    """Add Winter and days_after_Jul_1 columns from a datetime column"""
+    dates = df[date_column]
+    df["Winter"] = get_winter_names(dates)
+    df["days_after_Jul_1"] = get_days_after_Jul_1(dates)
+    return df
@@ -0,0 +1,108 @@
+"""
+Values refreshed by one task per process and watched by every dashboard session.
+
+    feed = get_shared_feed("current_temperatures")
+    feed.update(version, lambda: service.get_temperatures)   # read() for this version
+    feed.start(period_seconds=10)                            # one schedule per process
+    feed.param.watch(lambda event: show(event.new), "value")
+
+A SharedFeed keeps the latest result of its read() in the value param. publish() calls
+read() again and sets value; param then calls every session's watchers (only when the
+value changed). start() publishes on one pn.state.schedule_task per process, so the
+work is done once per period, not once per session. In the browser there is only one
+session, so start() uses a periodic callback there instead.
+
+update() swaps in a new read() when the data behind it changes (a new version): the
+first caller makes it, and callers that arrive meanwhile wait for it.
+
+Feeds live in this module, not in app.py: panel serve runs app.py as a new module for
+each session and clears it when the session ends, and pn.state.schedule_task does not
+accept callbacks defined in app.py. For the same reason, read() should only use
+importable code and plain data.
+"""
+
+import sys
+import threading
+
+import param
+
+from freezetracker.common_logger import get_logger
+
+logger = get_logger("shared_feeds")
+
+
+class SharedFeed(param.Parameterized):
+    """Latest value of read(), published on one schedule per process"""
+
+    value = param.Parameter(default=None, doc="latest result of read(), None until published")
+
+    def __init__(self, name, **params):
+        super().__init__(**params)
+        self.feed_name = name
+        self.read = None
+        self.version = None
+        self.started = False
+        self.lock = threading.Lock()
+        self.publishes = 0
+        self.failures = 0
+
+    def publish(self):
+        """Call read() and set value (errors are logged and keep the last value)"""
+        read = self.read
+        if read is None:
+            return
+        try:
+            value = read()
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Error publishing {self.feed_name}: {e}")
+            return
+        self.publishes += 1
+        self.value = value
+
+    def update(self, version, make_read) -> bool:
+        """Use make_read() as read() unless this version is already in use, then publish.
+        @return: True if this call made the new read()"""
+        with self.lock:
+            if self.read is not None and self.version == version:
+                return False
+            self.read = make_read()
+            self.version = version
+        self.publish()
+        return True
+
+    def start(self, period_seconds):
+        """Publish every period_seconds from now on (only the first call schedules)"""
+        import panel as pn
+
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+        if sys.platform == "emscripten":
+            pn.state.add_periodic_callback(self.publish, period=int(period_seconds * 1000))
+        else:
+            pn.state.schedule_task(
+                f"freezetracker_{self.feed_name}", self.publish, period=f"{period_seconds}s"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "version": str(self.version),
+            "started": self.started,
+            "publishes": self.publishes,
+            "failures": self.failures,
+        }
+
+
+shared_feeds = {}  # name -> SharedFeed
+shared_feeds_lock = threading.Lock()
+
+
+def get_shared_feed(name) -> SharedFeed:
+    """Return the process-wide feed for name (made empty on first use)"""
+    with shared_feeds_lock:
+        feed = shared_feeds.get(name)
+        if feed is None:
+            feed = shared_feeds[name] = SharedFeed(name)
+    return feed
@@ -0,0 +1,108 @@
+"""
+Chart-ready frames, read and derived once per process and shared by every session.
+
+    df = get_shared_table(is_wasm, "frost_span", ["frost_span.csv"], load_frost_span_table)
+
+Concurrent requests for a table that is still loading wait for that one load
+(single-flight), so 30 sessions opening at once do the I/O once, not 30 times.
+Local tables are reloaded when their source files change (by mtime); in WASM the
+data does not change while the page is open.
+
+Callers get shallow copies, so adding or replacing columns never changes the shared
+frame (copy-on-write, see data_cache.py, keeps in-place writes off it as well).
+"""
+
+import threading
+from concurrent.futures import Future
+
+from freezetracker.common_content import get_data_processed_path_from_code_folder
+from freezetracker.data_cache import enable_copy_on_write
+
+enable_copy_on_write()
+
+
+class SharedTables:
+    """Process-wide frames keyed by name, each kept with the version of its sources.
+    Callers get a shallow copy, so adding or replacing columns never changes the shared frame."""
+
+    def __init__(self):
+        self.tables = {}  # name -> (version, df)
+        self.loading = {}  # (name, version) -> Future
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.waits = 0
+
+    def get(self, name, version, load):
+        """Return the frame for name, calling load() only if no frame of this version exists
+        and no other caller is already loading it (otherwise wait for that load)"""
+        with self.lock:
+            entry = self.tables.get(name)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1].copy(deep=False)
+            future = self.loading.get((name, version))
+            is_loader = future is None
+            if is_loader:
+                future = Future()
+                self.loading[(name, version)] = future
+                self.loads += 1
+            else:
+                self.waits += 1
+
+        if is_loader:
+            try:
+                df = load()
+                with self.lock:
+                    if df is not None:
+                        self.tables[name] = (version, df)
+                future.set_result(df)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self.lock:
+                    del self.loading[(name, version)]
+        df = future.result()
+        return None if df is None else df.copy(deep=False)
+
+    def clear(self):
+        """Drop every table and reset the counters (loads in progress still finish)"""
+        with self.lock:
+            self.tables.clear()
+            self.hits = self.loads = self.waits = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "tables": len(self.tables),
+                "loading": len(self.loading),
+                "hits": self.hits,
+                "loads": self.loads,
+                "waits": self.waits,
+            }
+
+
+shared_tables = SharedTables()
+
+
+def get_shared_tables() -> SharedTables:
+    """Return the process-wide tables (kept by the module, so every session shares them)"""
+    return shared_tables
+
+
+def get_source_version(is_wasm, fnames):
+    """Version of processed files or stores: their mtimes locally; fixed in WASM,
+    where the data (bundle or GitHub) does not change while the page is open"""
+    if is_wasm:
+        return "wasm"
+    versions = []
+    for fname in fnames:
+        path = get_data_processed_path_from_code_folder(fname)
+        versions.append(path.stat().st_mtime_ns if path.exists() else None)
+    return tuple(versions)
+
+
+def get_shared_table(is_wasm, name, fnames, load):
+    """Return a shared frame, loaded by load() once per version of fnames
+    @param fnames: processed files or store folders the frame is built from"""
+    return shared_tables.get((name, is_wasm), get_source_version(is_wasm, fnames), load)
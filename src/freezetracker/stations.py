@@ -0,0 +1,130 @@
+"""
+Station registry for the ingestion engine (see ingest_stations.py).
+
+Each station has:
+
+- name: display name
+- isd_id: NOAA Global Hourly (ISD) STATION id, used to pick its rows out of raw CSVs
+- excel: optional pre-converted Excel import in data/1_raw (file, sheet)
+- source_filter: SOURCE codes to keep (7 = ASOS/AWOS merged with USAF surface hourly)
+- lat, lon: coordinates
+- frost_county: optional County of the frost probe readings taken at the station
+  (frost_stlouis_out.csv, see frost_join.py); stations without one get no frost depths
+- soil: optional soil parameters for the frost depth model (frost_model.py);
+  any left out take their value from default_soil_parameters
+
+Processed files are named from the station code, e.g. daily_temps_ely.csv.
+
+More stations (e.g. a county network) can be listed in data/1_raw/stations.csv
+instead of editing this file:
+
+    code,name,isd_id,source_filter,lat,lon,frost_county
+    ABC,Example Airport,12345678901,7,47.50,-92.50,
+
+Soil parameters may be added as extra columns named as in default_soil_parameters
+(e.g. moisture_pct,dry_density_pcf); empty cells take the default.
+
+"""
+
+import pathlib
+
+import pandas as pd
+
+default_source_filter = ["7"]
+
+# Frost depth model inputs (modified Berggren / Stefan, see frost_model.py)
+default_soil_parameters = {
+    "conductivity": 1.0,  # k, frozen soil thermal conductivity, BTU/(ft hr F)
+    "moisture_pct": 10.0,  # w, water content, percent of dry weight
+    "dry_density_pcf": 120.0,  # dry unit weight, lb/ft^3
+    "lambda_coefficient": 0.7,  # Berggren correction for the soil's heat capacity
+}
+
+station_registry = {
+    "ELY": {
+        "name": "Ely Municipal Airport",
+        "isd_id": "72745994964",
+        "excel": {"file": "FromNOAA_3297412_Ely_Import.xlsx", "sheet": "FromNOAA"},
+        "source_filter": default_source_filter,
+        "lat": 47.9,
+        "lon": -91.86,
+        "frost_county": "StLouis",
+    },
+    "ORR": {
+        "name": "Orr Regional Airport",
+        "isd_id": "72654404958",
+        "excel": {
+            "file": "FromNOAA_3320024_Orr_Import.xlsx",
+            "sheet": "FromNOAA_3320024_Orr_Import",
+        },
+        "source_filter": default_source_filter,
+        "lat": 48.05,
+        "lon": -92.83,
+        "frost_county": "StLouis",
+    },
+}
+
+stations_file_name = "stations.csv"
+
+
+def get_data_raw_path() -> pathlib.Path:
+    package_path = pathlib.Path.cwd()
+    root_path = package_path.parent.parent
+    return root_path.joinpath("data").joinpath("1_raw")
+
+
+def read_stations_file(path) -> dict:
+    """Read extra stations from a CSV (code,name,isd_id,source_filter,lat,lon, optional
+    frost_county and soil).
+    source_filter may list several codes separated by spaces, e.g. "7 4"."""
+    df = pd.read_csv(path, dtype={"code": str, "isd_id": str, "source_filter": str})
+    stations = {}
+    for row in df.to_dict("records"):
+        source_filter = str(row.get("source_filter") or "").split()
+        stations[row["code"].upper()] = {
+            "name": row.get("name", row["code"]),
+            "isd_id": row["isd_id"],
+            "excel": None,
+            "source_filter": source_filter or default_source_filter,
+            "lat": row.get("lat"),
+            "lon": row.get("lon"),
+            "frost_county": row.get("frost_county") if pd.notna(row.get("frost_county")) else None,
+            "soil": {
+                name: float(row[name])
+                for name in default_soil_parameters
+                if pd.notna(row.get(name))
+            },
+        }
+    return stations
+
+
+def get_station_registry() -> dict:
+    """Return the built-in stations plus any listed in data/1_raw/stations.csv"""
+    registry = dict(station_registry)
+    stations_path = get_data_raw_path().joinpath(stations_file_name)
+    if stations_path.exists():
+        registry.update(read_stations_file(stations_path))
+    return registry
+
+
+def get_soil_parameters(code) -> dict:
+    """Return a station's soil parameters, with defaults for any it does not set"""
+    station = get_station_registry().get(code, {})
+    return {**default_soil_parameters, **(station.get("soil") or {})}
+
+
+def get_frost_counties() -> dict:
+    """Return station code -> County of its frost probe readings, for stations that have one"""
+    return {
+        code: station["frost_county"]
+        for code, station in get_station_registry().items()
+        if station.get("frost_county")
+    }
+
+
+def get_station(code) -> dict:
+    """Return one station's registry entry, e.g. get_station("ELY")"""
+    registry = get_station_registry()
+    if code not in registry:
+        raise KeyError(f"Unknown station {code}. Known stations: {sorted(registry)}")
+    return registry[code]
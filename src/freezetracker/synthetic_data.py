@@ -0,0 +1,174 @@
+"""
+Deterministic synthetic data for benchmarks, at any number of stations and winters.
+
+Generates the same inputs the pipeline reads, shaped like the real files:
+
+- hourly temperatures like the NOAA import (SOURCE, IYEAR, IMONTH, IDAY, TMP_F)
+- daily_temps_{city}.csv as written by script_1 (IYEAR, IMONTH, IDAY, AVG_DAILY_TEMP_F)
+- frost_stlouis.csv, frost_depth.csv, frost_span.csv like the MnDOT St. Louis County data
+
+The first two stations are ELY and ORR (the app charts those); the rest are S0002, S0003, ...
+The same seed, station, and winters always give the same values.
+
+write_synthetic_tree() lays the files out like this repo (root/data/2_processed,
+root/src/freezetracker) so scripts and app functions that resolve paths from the
+working directory run unchanged against it.
+"""
+
+import pathlib
+import zlib
+
+import numpy as np
+import pandas as pd
+
+first_winter_start_year = 2010
+named_stations = ["ELY", "ORR"]
+frost_county = "StLouis"
+
+
+def get_station_codes(n_stations):
+    """Return n station codes: ELY, ORR, then S0002, S0003, ..."""
+    codes = named_stations[:n_stations]
+    return codes + [f"S{i:04d}" for i in range(len(codes), n_stations)]
+
+
+def get_winter_names(n_winters, first_winter=first_winter_start_year):
+    return [f"{year}-{year+1}" for year in range(first_winter, first_winter + n_winters)]
+
+
+def get_rng(seed, name):
+    """A generator seeded by the run seed and a name, independent of generation order"""
+    return np.random.default_rng([seed, zlib.crc32(name.encode())])
+
+
+def get_season_hours(n_winters, first_winter=first_winter_start_year) -> pd.DatetimeIndex:
+    start = f"{first_winter}-07-01"
+    end = f"{first_winter + n_winters}-06-30 23:00"
+    return pd.date_range(start, end, freq="h")
+
+
+def generate_daily_anomalies(rng, n_days, persistence=0.8, scale=6.0) -> np.ndarray:
+    """Day-to-day weather: an AR(1) series so cold snaps last several days"""
+    shocks = rng.normal(0.0, scale * np.sqrt(1 - persistence**2), n_days)
+    anomalies = np.empty(n_days)
+    anomalies[0] = rng.normal(0.0, scale)
+    for i in range(1, n_days):
+        anomalies[i] = persistence * anomalies[i - 1] + shocks[i]
+    return anomalies
+
+
+def generate_hourly_temps(station, n_winters, seed=0, first_winter=first_winter_start_year):
+    """Hourly readings from July 1 of the first winter through June 30 of the last.
+    About 10% of rows have a SOURCE other than 7 (script_1 drops those)."""
+    rng = get_rng(seed, station)
+    hours = get_season_hours(n_winters, first_winter)
+    day_of_year = hours.dayofyear.to_numpy()
+    hour = hours.hour.to_numpy()
+
+    station_offset = 0.0 if station in named_stations else rng.normal(0.0, 4.0)
+    annual = 37.0 - 36.0 * np.cos(2 * np.pi * (day_of_year - 20) / 365.25)
+    diurnal = 8.0 * np.cos(2 * np.pi * (hour - 15) / 24)
+    day_number = (hours.normalize() - hours[0].normalize()).days.to_numpy()
+    daily = generate_daily_anomalies(rng, day_number[-1] + 1)[day_number]
+    noise = rng.normal(0.0, 2.0, len(hours))
+
+    return pd.DataFrame(
+        {
+            "SOURCE": np.where(rng.random(len(hours)) < 0.9, 7, 4),
+            "IYEAR": hours.year,
+            "IMONTH": hours.month,
+            "IDAY": hours.day,
+            "TMP_F": np.round(annual + diurnal + daily + noise + station_offset, 1),
+        }
+    )
+
+
+def generate_daily_temps(station, n_winters, seed=0, first_winter=first_winter_start_year):
+    """Daily averages as written by script_1 (daily_temps_{city}.csv)"""
+    hourly = generate_hourly_temps(station, n_winters, seed, first_winter)
+    hourly = hourly[hourly["SOURCE"] == 7]
+    return (
+        hourly.groupby(["IYEAR", "IMONTH", "IDAY"])["TMP_F"]
+        .mean()
+        .reset_index()
+        .rename(columns={"TMP_F": "AVG_DAILY_TEMP_F"})
+    )
+
+
+def generate_frost_depths(n_winters, seed=0, first_winter=first_winter_start_year):
+    """Frost and thaw depth readings like frost_stlouis.csv (every few days, Nov 1 - May 15)"""
+    rng = get_rng(seed, frost_county)
+    rows = []
+    for start_year in range(first_winter, first_winter + n_winters):
+        dates = pd.date_range(f"{start_year}-11-01", f"{start_year+1}-05-15", freq="D")
+        frost_start = pd.Timestamp(f"{start_year}-11-15")
+        frost_start += pd.Timedelta(days=int(rng.integers(0, 20)))
+        frost_peak = pd.Timestamp(f"{start_year+1}-03-01")
+        frost_peak += pd.Timedelta(days=int(rng.integers(0, 15)))
+        thaw_start = frost_peak + pd.Timedelta(days=int(rng.integers(5, 15)))
+        thaw_end = thaw_start + pd.Timedelta(days=int(rng.integers(25, 45)))
+        max_depth = float(rng.integers(40, 80))
+
+        frost_days = (dates - frost_start).days.to_numpy()
+        peak_days = (frost_peak - frost_start).days
+        frost = max_depth * np.sqrt(np.clip(frost_days, 0, peak_days) / peak_days)
+        frost = np.where((dates >= frost_start) & (dates <= thaw_end), np.round(frost), np.nan)
+
+        thaw_days = (dates - thaw_start).days.to_numpy()
+        thaw = max_depth * thaw_days / (thaw_end - thaw_start).days
+        thaw = np.where((dates >= thaw_start) & (dates <= thaw_end), np.round(thaw), np.nan)
+
+        measured = rng.random(len(dates)) < 0.4
+        rows.append(
+            pd.DataFrame(
+                {
+                    "County": frost_county,
+                    "Date": dates.strftime("%Y/%m/%d"),
+                    "THAW_DEPTH_in": np.where(measured, thaw, np.nan),
+                    "FROST_DEPTH_in": np.where(measured, frost, np.nan),
+                    "SECONDARY_FROST_DEPTH_in": np.nan,
+                }
+            )
+        )
+    return pd.concat(rows, ignore_index=True)
+
+
+def summarize_frost_depths(frost_df: pd.DataFrame):
+    """Return (frost_depth, frost_span) tables from frost readings"""
+    df = frost_df.dropna(subset=["FROST_DEPTH_in"]).copy()
+    dates = pd.to_datetime(df["Date"], format="%Y/%m/%d")
+    start_year = dates.dt.year - (dates.dt.month < 7).astype(int)
+    df["Winter"] = start_year.astype(str) + "-" + (start_year + 1).astype(str)
+    df["Date"] = dates
+    grouped = df.groupby("Winter")
+    depth_df = grouped["FROST_DEPTH_in"].max().astype(int).reset_index()
+    depth_df.columns = ["Winter", "Max_Frost_Depth_in"]
+    span_df = grouped["Date"].agg(["min", "max"]).reset_index()
+    span_df.columns = ["Winter", "Frost_Start", "Frost_End"]
+    span_df.insert(1, "County", frost_county)
+    span_df["Frost_Start"] = span_df["Frost_Start"].dt.strftime("%Y/%m/%d")
+    span_df["Frost_End"] = span_df["Frost_End"].dt.strftime("%Y/%m/%d")
+    span_df["Invalid"] = False
+    return depth_df, span_df
+
+
+def write_synthetic_tree(root, n_winters, seed=0, first_winter=first_winter_start_year):
+    """Write ELY/ORR daily temps and the frost files under root, laid out like this repo.
+    Other stations are generated on the fly by the benchmarks (see generate_hourly_temps).
+    @return: path of root/src/freezetracker (run scripts and app functions from there)"""
+    root = pathlib.Path(root)
+    code_path = root.joinpath("src").joinpath("freezetracker")
+    processed_path = root.joinpath("data").joinpath("2_processed")
+    code_path.mkdir(parents=True, exist_ok=True)
+    processed_path.mkdir(parents=True, exist_ok=True)
+
+    for station in named_stations:
+        daily_df = generate_daily_temps(station, n_winters, seed, first_winter)
+        daily_df.to_csv(processed_path.joinpath(f"daily_temps_{station.lower()}.csv"), index=False)
+
+    frost_df = generate_frost_depths(n_winters, seed, first_winter)
+    frost_df.to_csv(processed_path.joinpath("frost_stlouis.csv"), index=False)
+    depth_df, span_df = summarize_frost_depths(frost_df)
+    depth_df.to_csv(processed_path.joinpath("frost_depth.csv"), index=False)
+    span_df.to_csv(processed_path.joinpath("frost_span.csv"), index=False)
+    return code_path
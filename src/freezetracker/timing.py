@@ -0,0 +1,129 @@
+"""
+Timing spans for the load, transform, chart, and page phases of dashboard construction.
+
+    @timed("load")
+    def read_config(is_wasm): ...
+
+    with timed_span("page", "section charts"):
+        ...
+
+Each span is logged as a JSON record through the app.timing logger and added to the
+process-wide StageTimings (count, p50, p95 per stage) that the admin pane shows.
+The timings live in this module, so every session of a panel serve process adds to
+the same summary.
+"""
+
+import functools
+import json
+import logging
+import pathlib
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+timing_logger = logging.getLogger("app.timing")
+
+# page and chart spans log at INFO; the many small load/transform spans at DEBUG
+span_log_levels = {"page": logging.INFO, "chart": logging.INFO}
+
+span_stack = threading.local()
+
+
+class StageTimings:
+    """Recent durations (ms) per (phase, stage), summarized as percentiles"""
+
+    def __init__(self, max_samples=500):
+        self.max_samples = max_samples
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, phase, stage, ms):
+        with self.lock:
+            key = (phase, stage)
+            if key not in self.samples:
+                self.samples[key] = deque(maxlen=self.max_samples)
+            self.samples[key].append(ms)
+
+    def summary(self) -> list:
+        """One row per stage, slowest p95 first"""
+        with self.lock:
+            samples = {key: list(values) for key, values in self.samples.items()}
+        rows = []
+        for (phase, stage), values in samples.items():
+            if len(values) > 1:
+                cuts = statistics.quantiles(values, n=20, method="inclusive")
+                p50, p95 = cuts[9], cuts[18]
+            else:
+                p50 = p95 = values[0]
+            rows.append(
+                {
+                    "phase": phase,
+                    "stage": stage,
+                    "count": len(values),
+                    "p50_ms": round(p50, 1),
+                    "p95_ms": round(p95, 1),
+                    "max_ms": round(max(values), 1),
+                    "total_ms": round(sum(values), 1),
+                }
+            )
+        return sorted(rows, key=lambda row: -row["p95_ms"])
+
+
+stage_timings = StageTimings()
+
+
+def get_stage_timings() -> StageTimings:
+    """Return the process-wide timings (shared by all sessions)"""
+    return stage_timings
+
+
+@contextmanager
+def timed_span(phase, stage, **fields):
+    """Time a block as one span, e.g. with timed_span("load", "read_config"): ...
+    @param phase: 'page', 'chart', 'load', or 'transform'
+    @param fields: extra values for the log record (e.g. fname)"""
+    stack = span_stack.__dict__.setdefault("stages", [])
+    parent = stack[-1] if stack else None
+    stack.append(stage)
+    ok = True
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ok = False
+        raise
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        stack.pop()
+        stage_timings.record(phase, stage, ms)
+        record = {"phase": phase, "stage": stage, "ms": round(ms, 1), "parent": parent, "ok": ok}
+        record.update(fields)
+        level = span_log_levels.get(phase, logging.DEBUG)
+        timing_logger.log(level, f"SPAN {json.dumps(record, default=str)}", extra={"span": record})
+
+
+def timed(phase):
+    """Decorator: time each call of a function as a span named after the function"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed_span(phase, func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_stage_timings_summary() -> list:
+    return stage_timings.summary()
+
+
+def dump_stage_timings(fname="stage_timings.json"):
+    """Write the per-stage summary to a JSON file and return its path"""
+    path = pathlib.Path(fname)
+    path.write_text(json.dumps(get_stage_timings_summary(), indent=2))
+    return path
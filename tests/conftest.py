@@ -0,0 +1,32 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def log_folder(tmp_path_factory):
+    return tmp_path_factory.mktemp("logs")
+
+
+@pytest.fixture(autouse=True)
+def log_to_tmp_path(log_folder):
+    """Send the modules' app.log (common_logger.py) to a temporary folder,
+    not the folder pytest runs in"""
+    log_file = str(log_folder / "app.log")
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        for handler in getattr(logger, "handlers", []):
+            if isinstance(handler, logging.FileHandler) and handler.baseFilename != log_file:
+                handler.close()
+                handler.baseFilename = log_file
+
+
+@pytest.fixture
+def processed_folder(tmp_path, monkeypatch):
+    """Run from a temporary src/freezetracker folder, so data/2_processed is temporary too
+    (the scripts find the data folder from the working folder)"""
+    code_folder = tmp_path / "src" / "freezetracker"
+    code_folder.mkdir(parents=True)
+    processed = tmp_path / "data" / "2_processed"
+    processed.mkdir(parents=True)
+    monkeypatch.chdir(code_folder)
+    return processed
@@ -0,0 +1,62 @@
+"""CurrentConditionsService against a stub weather server on localhost"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from freezetracker.current_conditions import CurrentConditionsService
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Answer with temp = lat, or 500 for lat 99"""
+
+    def do_GET(self):
+        lat = float(parse_qs(urlparse(self.path).query)["lat"][0])
+        if lat == 99:
+            self.send_error(500)
+            return
+        body = json.dumps({"main": {"temp": lat}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def weather_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/data/2.5/weather"
+    server.shutdown()
+
+
+def make_service(url, **kwargs):
+    stations = {"ABC": {"lat": 47.5, "lon": -92.0}, "XYZ": {"lat": 99, "lon": -92.0}}
+    return CurrentConditionsService("stub-key", stations, base_url=url, **kwargs)
+
+
+def test_refresh_keeps_the_stations_that_answer(weather_url):
+    service = make_service(weather_url, timeout_seconds=2.0)
+    assert service.refresh() == {"ABC": 47.5}
+    assert service.temperatures == {"ABC": 47.5}
+    assert service.stats()["failures"] == 1
+    assert not service.is_stale()
+
+
+def test_get_temperatures_returns_the_cache_and_refreshes_in_the_background(weather_url):
+    service = make_service(weather_url, ttl_seconds=0)
+    assert service.get_temperatures() == {"ABC": None, "XYZ": None}
+    for _ in range(100):
+        if service.stats()["refreshes"]:
+            break
+        time.sleep(0.05)
+    assert service.get_temperatures()["ABC"] == 47.5
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from freezetracker.daily_cube import (
+    cube_fields,
+    grow_daily_cube,
+    open_daily_cube,
+    read_cube_index,
+    update_daily_cube_stations,
+)
+
+
+def make_daily_rows(dates, value):
+    dates = pd.to_datetime(dates)
+    return pd.DataFrame({"DATE": dates, **{field: value for field in cube_fields}})
+
+
+def test_update_places_rows_by_day_of_season(processed_folder):
+    # Aug 1 is day 31; Jan 1 2011 is day 184 of winter 2010-2011
+    update_daily_cube_stations(
+        {
+            "ABC": make_daily_rows(["2010-08-01", "2011-01-01"], 5.0),
+            "XYZ": make_daily_rows(["2011-07-01"], 7.0),
+        }
+    )
+    cube = open_daily_cube()
+    assert cube.index["stations"] == ["ABC", "XYZ"]
+    assert cube.index["winters"] == ["2010-2011", "2011-2012"]
+
+    abc = cube.get("CUMM_COLD_F", station="ABC", winter="2010-2011")
+    assert abc.shape == (366,)
+    assert abc[31] == abc[184] == 5.0
+    assert np.isnan(abc).sum() == 364
+    assert cube.get("COLD_F", station="XYZ", winter="2011-2012")[0] == 7.0
+    assert np.isnan(cube.get("COLD_F", station="XYZ", winter="2010-2011")).all()
+
+
+def test_update_replaces_only_the_winters_given(processed_folder):
+    update_daily_cube_stations({"ABC": make_daily_rows(["2010-08-01", "2011-08-01"], 1.0)})
+    update_daily_cube_stations({"ABC": make_daily_rows(["2011-08-02"], 2.0)})
+    cube = open_daily_cube()
+    assert cube.get("HOT_F", station="ABC", winter="2010-2011")[31] == 1.0
+    winter = cube.get("HOT_F", station="ABC", winter="2011-2012")
+    assert np.isnan(winter[31])
+    assert winter[32] == 2.0
+
+
+def test_grow_keeps_values_and_reallocates_only_when_an_axis_grows(processed_folder):
+    update_daily_cube_stations({"ABC": make_daily_rows(["2011-08-01"], 3.0)})
+    path = processed_folder / "daily_cube" / "COLD_F.npy"
+    mtime = path.stat().st_mtime_ns
+
+    assert grow_daily_cube(["ABC"], ["2011-2012"]) == read_cube_index()
+    assert path.stat().st_mtime_ns == mtime
+
+    index = grow_daily_cube(["XYZ"], ["2010-2011"])
+    assert index["stations"] == ["ABC", "XYZ"]
+    assert index["winters"] == ["2010-2011", "2011-2012"]
+    cube = open_daily_cube()
+    assert cube.get("COLD_F").shape == (2, 2, 366)
+    assert cube.get("COLD_F", station="ABC", winter="2011-2012")[31] == 3.0
+    assert np.isnan(cube.get("COLD_F", station="ABC", winter="2010-2011")).all()
+    assert np.isnan(cube.get("COLD_F", station="XYZ")).all()
+
+
+def test_to_df_gives_one_station_in_long_form(processed_folder):
+    update_daily_cube_stations({"ABC": make_daily_rows(["2010-07-01", "2010-07-03"], 4.0)})
+    df = open_daily_cube().to_df(["CUMM_COLD_F"], "ABC")
+    assert df["NAME"].tolist() == ["2010-2011", "2010-2011"]
+    assert df["INDEX"].tolist() == [0, 2]
+    assert df["CUMM_COLD_F"].tolist() == [4.0, 4.0]
@@ -0,0 +1,87 @@
+"""Remote loaders against a stub server on localhost (no internet needed)"""
+
+import hashlib
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from freezetracker import data_load
+from freezetracker.data_cache import get_data_cache
+
+
+class StubDataHandler(SimpleHTTPRequestHandler):
+    """Serve files from a folder with ETags, answering If-None-Match with 304"""
+
+    protocol_version = "HTTP/1.1"
+    statuses = []
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        try:
+            with open(path, "rb") as f:
+                etag = '"' + hashlib.sha1(f.read()).hexdigest() + '"'
+        except OSError:
+            self.statuses.append(404)
+            return super().send_head()
+        if self.headers.get("If-None-Match") == etag:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        self.statuses.append(200)
+        self.etag = etag
+        return super().send_head()
+
+    def end_headers(self):
+        etag = getattr(self, "etag", None)
+        if etag:
+            self.send_header("ETag", etag)
+            self.etag = None
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def data_server(tmp_path):
+    (tmp_path / "a.csv").write_text("CITY,COLD_F\nELY,3\nORR,5\n")
+    (tmp_path / "b.csv").write_text("CITY,COLD_F\nELY,1\n")
+    StubDataHandler.statuses = []
+    handler = partial(StubDataHandler, directory=str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    get_data_cache().clear()
+    yield tmp_path, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    get_data_cache().clear()
+
+
+def test_remote_csv_is_revalidated_by_etag(data_server):
+    folder, base_url = data_server
+    df = data_load.read_data_processed_csv_to_df(True, "a.csv", base_url)
+    assert df["COLD_F"].tolist() == [3, 5]
+
+    again = data_load.read_data_processed_csv_to_df(True, "a.csv", base_url)
+    assert again["COLD_F"].tolist() == [3, 5]
+    assert StubDataHandler.statuses == [200, 304]
+    assert get_data_cache().stats()["hits"] == 1
+
+    (folder / "a.csv").write_text("CITY,COLD_F\nELY,4\n")
+    changed = data_load.read_data_processed_csv_to_df(True, "a.csv", base_url)
+    assert changed["COLD_F"].tolist() == [4]
+
+
+def test_batch_read_returns_none_for_missing_files(data_server):
+    _, base_url = data_server
+    dfs = data_load.read_data_processed_csvs_to_dfs(
+        True, ["a.csv", "b.csv", "missing.csv"], base_url, max_workers=3
+    )
+    assert len(dfs["a.csv"]) == 2
+    assert len(dfs["b.csv"]) == 1
+    assert dfs["missing.csv"] is None
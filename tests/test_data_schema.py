@@ -0,0 +1,23 @@
+import pandas as pd
+
+from freezetracker.data_schema import get_memory_report
+
+
+def test_memory_report_reads_a_store_that_replaced_the_csv_files(processed_folder):
+    df = pd.DataFrame(
+        {
+            "CITY": ["ORR", "ORR"],
+            "Winter": ["2020-2021", "2020-2021"],
+            "CUMM_COLD_F": [10.0, 20.0],
+            "FROST_DEPTH_in": [1.0, 2.0],
+        }
+    )
+    store = processed_folder / "cold_loading_vs_frost_depth_store"
+    df.to_parquet(store, partition_cols=["CITY", "Winter"], index=False)
+    (processed_folder / "frost_span.csv").write_text("County,Winter\nStLouis,2020-2021\n")
+
+    report = get_memory_report().set_index("table")
+
+    assert report.loc["cold_loading_vs_frost_depth", "rows"] == 2
+    assert report.loc["frost_span", "rows"] == 1
+    assert "daily_temps" not in report.index
@@ -0,0 +1,30 @@
+import numpy as np
+
+from freezetracker.degree_days import compute_degree_days, get_segment_positions, segment_cumsum
+
+
+def test_segment_cumsum_restarts_at_each_segment():
+    values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    segment_first = get_segment_positions(np.array([True, False, True, False, False]))
+    np.testing.assert_array_equal(segment_first, [0, 0, 2, 2, 2])
+    np.testing.assert_array_equal(segment_cumsum(values, segment_first), [1, 3, 3, 7, 12])
+
+
+def test_segment_cumsum_per_station_segments():
+    values = np.array([[1.0, 1.0, 1.0, 1.0], [2.0, 2.0, 2.0, 2.0]])
+    starts = np.array([[True, False, True, False], [True, False, False, False]])
+    segment_first = get_segment_positions(starts)
+    np.testing.assert_array_equal(
+        segment_cumsum(values, segment_first), [[1, 2, 1, 2], [2, 4, 6, 8]]
+    )
+
+
+def test_compute_degree_days_rounds_and_skips_missing_days():
+    temps = [30.0, 34.0, 20.4, np.nan, 31.0]
+    starts = [True, False, False, True, False]
+    result = compute_degree_days(temps, starts)
+    np.testing.assert_array_equal(result["INDEX"], [0, 1, 2, 0, 1])
+    np.testing.assert_array_equal(result["COLD_F"], [2, 0, 12, np.nan, 1])
+    np.testing.assert_array_equal(result["CUMM_COLD_F"], [2, 2, 14, np.nan, 1])
+    np.testing.assert_array_equal(result["HOT_F"], [0, 2, 0, np.nan, 0])
+    np.testing.assert_array_equal(result["CUMM_HOT_F"], [0, 2, 2, np.nan, 0])
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from freezetracker.frost_join import interpolate_readings, join_frost_depths
+from freezetracker.stations import get_frost_counties
+
+
+def make_daily_rows(city, days):
+    dates = pd.Timestamp("2020-07-01") + pd.to_timedelta(days, unit="D")
+    return pd.DataFrame(
+        {
+            "CITY": city,
+            "Winter": "2020-2021",
+            "Days": days,
+            "IYEAR": dates.year,
+            "IMONTH": dates.month,
+            "IDAY": dates.day,
+            "DATE": dates,
+            "AVG_DAILY_TEMP_F": 20.0,
+            "HOT_F": 0.0,
+            "CUMM_HOT_F": 0.0,
+            "COLD_F": 12.0,
+            "CUMM_COLD_F": [12.0 * (i + 1) for i in range(len(days))],
+        }
+    )
+
+
+def make_readings(days, frost_depths, thaw_depths=None):
+    return pd.DataFrame(
+        {
+            "County": "StLouis",
+            "Winter": "2020-2021",
+            "days_after_Jul_1": days,
+            "THAW_DEPTH_in": thaw_depths if thaw_depths is not None else np.nan,
+            "FROST_DEPTH_in": frost_depths,
+        }
+    )
+
+
+def test_interpolate_readings_within_max_gap():
+    days = pd.DataFrame({"Winter": "W", "Days": np.arange(7)})
+    readings = pd.DataFrame({"Winter": "W", "Days": [1, 4, 20], "FROST_DEPTH_in": [10, 16, 30]})
+    values = interpolate_readings(days, readings, "FROST_DEPTH_in", max_gap_days=5)
+    np.testing.assert_allclose(values, [np.nan, 10, 12, 14, 16, np.nan, np.nan])
+
+
+def test_join_frost_depths_only_for_stations_in_the_county():
+    daily_df = pd.concat(
+        [make_daily_rows("ORR", [150, 151, 152, 153]), make_daily_rows("ELY", [150, 151])],
+        ignore_index=True,
+    )
+    frost_df = make_readings([150, 153], [6.0, 12.0], [np.nan, 1.0])
+
+    df = join_frost_depths(daily_df, frost_df, {"ORR": "StLouis"}, max_gap_days=14)
+
+    orr = df[df["CITY"] == "ORR"]
+    assert orr["County"].tolist() == ["StLouis"] * 4
+    np.testing.assert_allclose(orr["FROST_DEPTH_in"], [6, 8, 10, 12])
+    np.testing.assert_allclose(orr["THAW_DEPTH_in"], [np.nan, np.nan, np.nan, 1.0])
+    assert orr["DEPTH_MEASURED"].tolist() == [True, False, False, True]
+    assert orr["days_after_Jul_1"].tolist() == [150, 151, 152, 153]
+
+    ely = df[df["CITY"] == "ELY"]
+    assert ely["County"].isna().all()
+    assert ely["FROST_DEPTH_in"].isna().all()
+    assert not ely["DEPTH_MEASURED"].any()
+
+
+def test_ely_and_orr_share_the_st_louis_county_readings():
+    assert get_frost_counties() == {"ELY": "StLouis", "ORR": "StLouis"}
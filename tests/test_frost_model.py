@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from freezetracker import frost_model
+from freezetracker.daily_cube import open_daily_cube
+from freezetracker.frost_model import compute_stefan_depths, get_depth_coefficients
+from freezetracker.ingest_stations import ingest_station, update_cube_and_manifests
+from freezetracker.script_3_make_store import read_store_source_files, write_store
+from freezetracker.stations import default_soil_parameters
+
+
+def test_depth_coefficient_for_default_soil():
+    # 12 in/ft * 0.7 * sqrt(48 * 1.0 / (1.434 * 10 * 120))
+    coefficients = get_depth_coefficients([default_soil_parameters])
+    np.testing.assert_allclose(coefficients, [1.40293], rtol=1e-5)
+
+
+def test_stefan_depths_grow_with_the_square_root_of_the_freezing_index():
+    coefficients = get_depth_coefficients([default_soil_parameters])
+    depths = compute_stefan_depths([[0.0, 100.0, 400.0, np.nan, -5.0]], coefficients)
+    np.testing.assert_allclose(depths, [[0.0, 14.0, 28.1, np.nan, 0.0]], rtol=1e-6)
+
+
+def test_stefan_depths_broadcast_one_coefficient_per_station():
+    freezing_index = np.full((2, 1, 2), 100.0)
+    depths = compute_stefan_depths(freezing_index, [1.0, 2.0])
+    np.testing.assert_allclose(depths, [[[10.0, 10.0]], [[20.0, 20.0]]])
+
+
+def write_orr_winter(folder):
+    """Build one ORR winter (Dec 1 and 2 at 10 F) with the season stage, then its store"""
+    rows = [{"IYEAR": 2015, "IMONTH": 12, "IDAY": day, "AVG_DAILY_TEMP_F": 10.0} for day in (1, 2)]
+    pd.DataFrame(rows).to_csv(folder / "daily_temps_orr.csv", index=False)
+    results = [ingest_station("ORR", ["seasons"], [2015])]
+    update_cube_and_manifests(results)
+    assert results[0]["ok"], results[0]["error"]
+    write_store("daily_temps", read_store_source_files("daily_temps"))
+
+
+def test_main_rewrites_the_cube_files_and_store(processed_folder, monkeypatch):
+    write_orr_winter(processed_folder)
+    soil = dict(default_soil_parameters, conductivity=4.0)
+    monkeypatch.setattr(frost_model, "get_soil_parameters", lambda code: soil)
+    frost_model.main()
+
+    df = pd.read_csv(processed_folder / "daily_temps_2015-2016_orr.csv")
+    expected = compute_stefan_depths(df["CUMM_COLD_F"], get_depth_coefficients([soil]))
+    assert df["STEFAN_DEPTH_in"].gt(0).all()
+    np.testing.assert_allclose(df["STEFAN_DEPTH_in"], expected)
+    store = pd.read_parquet(processed_folder / "daily_temps_store")
+    np.testing.assert_allclose(store.sort_values("DATE")["STEFAN_DEPTH_in"], expected)
+    cube = open_daily_cube()
+    cube_depths = cube.get("STEFAN_DEPTH_in", station="ORR")
+    np.testing.assert_allclose(cube_depths[~np.isnan(cube_depths)], expected)
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from freezetracker import frost_model, ingest_stations
+from freezetracker.ingest_stations import (
+    ingest_station,
+    read_season_manifest,
+    update_cube_and_manifests,
+)
+from freezetracker.stations import default_soil_parameters
+
+
+def write_daily_file(folder, temps_by_winter):
+    """Two days (Dec 1 and 2) per winter start year, at the given temperature"""
+    rows = [
+        {"IYEAR": year, "IMONTH": 12, "IDAY": day, "AVG_DAILY_TEMP_F": temp}
+        for year, temp in temps_by_winter.items()
+        for day in (1, 2)
+    ]
+    pd.DataFrame(rows).to_csv(folder / "daily_temps_abc.csv", index=False)
+
+
+def build_seasons(winter_start_years):
+    results = [ingest_station("ABC", ["seasons"], winter_start_years)]
+    update_cube_and_manifests(results)
+    assert results[0]["ok"], results[0]["error"]
+
+
+def read_winter_temps(folder, winter):
+    return pd.read_csv(folder / f"daily_temps_{winter}_abc.csv")["AVG_DAILY_TEMP_F"].tolist()
+
+
+def test_winter_changed_outside_a_partial_run_is_rebuilt_by_a_full_run(processed_folder):
+    all_winters = [2010, 2011, 2012]
+    write_daily_file(processed_folder, {2010: 10.0, 2011: 11.0, 2012: 12.0})
+    build_seasons(all_winters)
+    assert read_winter_temps(processed_folder, "2010-2011") == [10.0, 10.0]
+    built = read_season_manifest("ABC")
+
+    # 2010 changes, but this run only covers 2011: its file and manifest entry stay as built
+    write_daily_file(processed_folder, {2010: 20.0, 2011: 11.0, 2012: 12.0})
+    build_seasons([2011])
+    assert read_winter_temps(processed_folder, "2010-2011") == [10.0, 10.0]
+    assert read_season_manifest("ABC")["2010"] == built["2010"]
+
+    build_seasons(all_winters)
+    assert read_winter_temps(processed_folder, "2010-2011") == [20.0, 20.0]
+    assert read_season_manifest("ABC")["2010"] != built["2010"]
+
+
+def test_soil_parameter_change_rebuilds_the_winters(processed_folder, monkeypatch):
+    write_daily_file(processed_folder, {2010: 10.0, 2011: 11.0})
+    build_seasons([2010, 2011])
+    depths = pd.read_csv(processed_folder / "daily_temps_2010-2011_abc.csv")["STEFAN_DEPTH_in"]
+
+    soil = dict(default_soil_parameters, conductivity=4.0)
+    monkeypatch.setattr(ingest_stations, "get_soil_parameters", lambda code: soil)
+    monkeypatch.setattr(frost_model, "get_soil_parameters", lambda code: soil)
+    build_seasons([2010, 2011])
+    rebuilt = pd.read_csv(processed_folder / "daily_temps_2010-2011_abc.csv")["STEFAN_DEPTH_in"]
+    assert (rebuilt > depths).all()
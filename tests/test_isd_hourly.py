@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from freezetracker import isd_hourly
+
+header = "STATION,NAME,DATE,SOURCE,REPORT_TYPE,QUALITY_CONTROL,TMP\n"
+rows = [
+    '72745994964,ELY,2023-03-31T00:15:00,7,FM-15,V020,"+0010,5"',
+    '72745994964,ELY,2023-03-31T01:15:00,7,FM-15,V020,"+0020,1"',
+    '72745994964,ELY,2023-03-31T02:15:00,7,FM-15,V020,"+9999,9"',
+    '72745994964,ELY,2023-03-31T03:15:00,7,FM-15,V020,"+0030,3"',
+    '72745994964,ELY,2023-03-31T04:15:00,4,FM-15,V020,"+0500,5"',
+    '72745994964,ELY,2023-04-01T00:15:00,7,FM-15,V020,"-0050,5"',
+    '72654404958,ORR,2023-03-31T00:15:00,7,FM-15,V020,"+0100,5"',
+]
+
+
+@pytest.fixture
+def isd_csv(tmp_path):
+    path = tmp_path / "hourly.csv"
+    path.write_text(header + "\n".join(rows) + "\n")
+    return path
+
+
+def test_parse_isd_temperature():
+    temps = isd_hourly.parse_isd_temperature(pd.Series(["+0010,5", "-0050,1", "+9999,9"]))
+    assert temps["TMP_F"].tolist()[:2] == pytest.approx([33.8, 23.0])
+    assert pd.isna(temps["TMP_F"].iloc[2])
+    assert temps["TMP_QUALITY"].tolist() == ["5", "1", "9"]
+
+
+def test_daily_means_from_small_chunks_with_compaction(isd_csv, monkeypatch):
+    """Chunks of two rows, compacted every two partials, give the same means as one pass"""
+    monkeypatch.setattr(isd_hourly, "partials_per_compaction", 2)
+    df = isd_hourly.read_isd_daily_means([isd_csv], stations=["72745994964"], chunksize=2)
+    whole = isd_hourly.read_isd_daily_means([isd_csv], stations=["72745994964"])
+    pd.testing.assert_frame_equal(df, whole)
+    assert df[["IYEAR", "IMONTH", "IDAY", "N_READINGS"]].values.tolist() == [
+        [2023, 3, 31, 2],
+        [2023, 4, 1, 1],
+    ]
+    assert df["AVG_DAILY_TEMP_F"].tolist() == pytest.approx([34.7, 23.0])
+
+
+def test_compact_folds_partials_into_one():
+    daily_means = isd_hourly.DailyMeans()
+    for temp in [30.0, 40.0, 50.0]:
+        daily_means.add(pd.DataFrame({"STATION": ["A"], "DAY": ["2023-01-02"], "TMP_F": [temp]}))
+    daily_means.compact()
+    assert len(daily_means.partials) == 1
+    df = daily_means.result()
+    assert df.loc[0, "AVG_DAILY_TEMP_F"] == pytest.approx(40.0)
+    assert df.loc[0, "N_READINGS"] == 3
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from freezetracker.nowcast import NowcastModel, nowcast_frost_depths
+
+
+def make_frost_rows():
+    return pd.DataFrame(
+        {
+            "CITY": ["ORR"] * 5 + ["ABC"] * 3,
+            "DATE": pd.to_datetime(
+                ["2021-01-01", "2021-01-08", "2021-01-15", "2021-01-22", "2021-01-23"]
+                + ["2021-01-01", "2021-01-08", "2021-01-15"]
+            ),
+            "CUMM_COLD_F": [100.0, 300.0, 500.0, 800.0, 810.0, 0.0, 100.0, 200.0],
+            "FROST_DEPTH_in": [10.0, 14.0, 21.0, 26.0, 99.0, 5.0, 6.0, 7.0],
+            "DEPTH_MEASURED": [True, True, True, True, False, True, True, True],
+        }
+    )
+
+
+def test_updates_one_at_a_time_match_training():
+    df = make_frost_rows()
+    trained = NowcastModel.train(df)
+    updated = NowcastModel()
+    for row in df[df["DEPTH_MEASURED"]].itertuples():
+        updated.update(row.CITY, row.CUMM_COLD_F, row.FROST_DEPTH_in)
+
+    assert sorted(updated.stations) == trained.stations == ["ABC", "ORR"]
+    order = [updated.index[code] for code in trained.stations]
+    np.testing.assert_allclose(updated.stats[order], trained.stats)
+    assert trained.trained_through == "2021-01-22"
+
+
+def test_add_measured_days_only_adds_newer_readings():
+    df = make_frost_rows()
+    model = NowcastModel.train(df[df["DATE"] <= "2021-01-08"])
+    added = model.add_measured_days(df)
+    assert added == 3
+    np.testing.assert_allclose(model.stats, NowcastModel.train(df).stats)
+
+
+def test_predict_with_band_and_unknown_station():
+    model = NowcastModel()
+    for x in [0.0, 100.0, 200.0]:
+        model.update("ABC", x, 0.05 * x + 5.0)
+    predicted = model.predict(["ABC", "ABC", "XYZ"], [400.0, -1000.0, 400.0])
+    assert predicted["FROST_DEPTH_in"].tolist()[:2] == pytest.approx([25.0, 0.0])
+    assert predicted.loc[0, "FROST_DEPTH_LOW_in"] == pytest.approx(25.0)
+    assert predicted.loc[0, "FROST_DEPTH_HIGH_in"] == pytest.approx(25.0)
+    assert np.isnan(predicted.loc[2, "FROST_DEPTH_in"])
+
+
+def test_predict_no_frost_without_cold_loading():
+    model = NowcastModel()
+    for x in [0.0, 100.0, 200.0, 300.0]:
+        model.update("ABC", x, 0.05 * x + 5.0 + (x % 200) / 100)
+    predicted = model.predict(["ABC", "ABC", "XYZ"], [0.0, 10.0, 0.0])
+    columns = ["FROST_DEPTH_in", "FROST_DEPTH_LOW_in", "FROST_DEPTH_HIGH_in"]
+    assert predicted.loc[0, columns].tolist() == [0.0, 0.0, 0.0]
+    # The intercept still applies once there is some cold loading
+    assert predicted.loc[1, "FROST_DEPTH_in"] > 5.0
+    assert np.isnan(predicted.loc[2, "FROST_DEPTH_in"])
+
+
+def test_model_round_trips_through_a_dict():
+    model = NowcastModel.train(make_frost_rows())
+    copy = NowcastModel.from_dict(model.to_dict())
+    assert copy.stations == model.stations
+    assert copy.trained_through == model.trained_through
+    np.testing.assert_allclose(copy.stats, model.stats)
+
+
+def test_nowcast_uses_the_latest_day_up_to_today():
+    model = NowcastModel()
+    for x in [0.0, 100.0, 200.0]:
+        model.update("ABC", x, 0.05 * x + 5.0)
+    daily_df = pd.DataFrame(
+        {
+            "CITY": ["ABC", "ABC", "ABC"],
+            "DATE": pd.to_datetime(["2021-01-01", "2021-01-02", "2021-01-03"]),
+            "CUMM_COLD_F": [100.0, 120.0, 140.0],
+        }
+    )
+    df = nowcast_frost_depths(model, daily_df, today="2021-01-02 15:00")
+    assert df.loc[0, "NOWCAST_DATE"] == pd.Timestamp("2021-01-02")
+    assert df.loc[0, "DATE"] == pd.Timestamp("2021-01-02")
+    assert df.loc[0, "FROST_DEPTH_in"] == pytest.approx(11.0)
+    assert df.loc[0, "CURRENT_WINTER"]
+
+    stale = nowcast_frost_depths(model, daily_df, today="2021-02-01")
+    assert stale.loc[0, "NOWCAST_DATE"] == pd.Timestamp("2021-02-01")
+    assert stale.loc[0, "DATE"] == pd.Timestamp("2021-01-03")
+    assert stale.loc[0, "CURRENT_WINTER"]
+
+    # Winter 2021-2022 starts July 1, with no data yet
+    next_winter = nowcast_frost_depths(model, daily_df, today="2021-07-01")
+    assert not next_winter.loc[0, "CURRENT_WINTER"]
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from freezetracker.regression import fit_lines, get_line_endpoints
+
+
+def test_fit_lines_per_group():
+    df = pd.DataFrame(
+        {
+            "Winter": ["A"] * 3 + ["B"] * 4 + ["C"] + ["A"],
+            "x": [0, 1, 2, 0, 1, 2, 3, 5, np.nan],
+            "y": [1, 3, 5, 0, 1, 0, 1, 7, 100],
+        }
+    )
+    fits = fit_lines(df, "x", "y", "Winter")
+
+    a = fits.loc["A"]
+    assert a["n"] == 3
+    assert (a["slope"], a["intercept"], a["r2"]) == pytest.approx((2.0, 1.0, 1.0))
+    assert a["residual_std"] == pytest.approx(0.0)
+
+    b = fits.loc["B"]
+    assert (b["slope"], b["intercept"], b["r2"]) == pytest.approx((0.2, 0.2, 0.2))
+    assert b["residual_std"] == pytest.approx(np.sqrt(0.4))
+
+    assert fits.loc["C", "n"] == 1
+    assert np.isnan(fits.loc["C", "slope"])
+
+
+def test_get_line_endpoints():
+    fit = {"slope": 2.0, "intercept": 1.0}
+    assert get_line_endpoints(fit, 0, 10) == [(0, 1.0), (10, 21.0)]
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from freezetracker.common_content import get_days_after_Jul_1_from_date_string
+from freezetracker.season_calendar import (
+    add_season_calendar_columns,
+    get_days_after_Jul_1,
+    get_winter_names,
+    get_winter_start_years,
+)
+
+dates = ["2022-06-30", "2022-07-01", "2022-11-15", "2023-04-15", "2024-02-29"]
+
+
+def test_winters_run_july_through_june():
+    values = pd.to_datetime(pd.Series(dates))
+    assert list(get_winter_start_years(values)) == [2021, 2022, 2022, 2022, 2023]
+    assert list(get_winter_names(values)) == [
+        "2021-2022",
+        "2022-2023",
+        "2022-2023",
+        "2022-2023",
+        "2023-2024",
+    ]
+
+
+def test_days_after_Jul_1_match_the_one_date_version():
+    days = get_days_after_Jul_1(pd.to_datetime(pd.Series(dates)))
+    assert list(days) == [364, 0, 137, 288, 243]
+    assert list(days) == [get_days_after_Jul_1_from_date_string(date) for date in dates]
+
+
+def test_add_season_calendar_columns():
+    df = pd.DataFrame({"Date": pd.to_datetime(["2010-12-25"])})
+    df = add_season_calendar_columns(df)
+    assert df.loc[0, "Winter"] == "2010-2011"
+    assert df.loc[0, "days_after_Jul_1"] == 177